@@ -266,8 +266,10 @@ def get_scanning_analytics(_: User = Depends(require_admin_hybrid)):
         # Get active jobs from Redis/Celery
         r = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
-        # Get Celery queue length
-        queue_length = r.llen("celery")
+        # Get Celery queue length across all task queues
+        from app.tasks.celery_app import TASK_QUEUES
+
+        queue_length = sum(r.llen(q) for q in TASK_QUEUES)
 
         with SessionLocal() as db:
             # Get active scan sessions
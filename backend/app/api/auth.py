@@ -17,6 +17,7 @@ from app.oauth import (
     require_admin_hybrid,
 )
 from app.services.rule_service import rule_service
+from app.tasks import payload_store
 from app.tasks.jobs import process_new_report, process_new_status
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
@@ -388,11 +389,11 @@ async def handle_mastodon_webhook(request: Request, payload: dict[str, Any]):
 
         if event_type == "report.created":
             # Process new report
-            task = process_new_report.delay(payload)
+            task = process_new_report.delay(payload_store.stash(payload))
             return {"message": "Report processing queued", "task_id": task.id}
         elif event_type == "status.created":
             # Process new status for proactive scanning
-            task = process_new_status.delay(payload)
+            task = process_new_status.delay(payload_store.stash(payload))
             return {"message": "Status processing queued", "task_id": task.id}
         else:
             return {"message": f"Ignored event type: {event_type}"}
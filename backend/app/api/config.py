@@ -6,6 +6,7 @@ from app.auth import require_api_key
 from app.config import get_settings
 from app.oauth import User, require_admin_hybrid
 from app.services.config_service import ConfigService, get_config_service
+from app.services.runtime_flags import runtime_flags
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
@@ -62,6 +63,7 @@ def set_panic_stop(
 ):
     """Toggle panic stop flag."""
     service.set_flag("panic_stop", enable, updated_by=user.username)
+    runtime_flags.push("panic_stop", {"enabled": enable})
     return {"panic_stop": enable}
 
 
@@ -73,6 +75,7 @@ def set_dry_run_mode(
 ):
     """Toggle dry run mode."""
     service.set_flag("dry_run", enable, updated_by=user.username)
+    runtime_flags.push("dry_run", {"enabled": enable})
     return {"dry_run": enable}
 
 
@@ -86,6 +89,7 @@ def set_report_threshold(
     if threshold < 0 or threshold > MAX_THRESHOLD:
         raise HTTPException(status_code=400, detail="Threshold must be between 0 and 10")
     service.set_threshold("report_threshold", threshold, updated_by=user.username)
+    runtime_flags.push("report_threshold", {"threshold": threshold})
     return {"report_threshold": threshold}
 
 
@@ -115,9 +119,11 @@ def set_automod_config(
         raise HTTPException(status_code=400, detail="Threshold must be non-negative")
     if settings.default_action is not None and settings.default_action not in allowed_actions:
         raise HTTPException(status_code=400, detail=f"default_action must be one of {sorted(allowed_actions)}")
-    return service.set_automod_config(
+    value = service.set_automod_config(
         dry_run_override=settings.dry_run_override,
         default_action=settings.default_action,
         defederation_threshold=settings.defederation_threshold,
         updated_by=user.username,
     )
+    runtime_flags.push("automod", value)
+    return value
@@ -1,233 +1,423 @@
-"""Contains all the data models used in inputs/outputs"""
+"""Contains all the data models used in inputs/outputs
 
-from .account import Account
-from .account_warning import AccountWarning
-from .account_warning_action import AccountWarningAction
-from .admin_account import AdminAccount
-from .admin_canonical_email_block import AdminCanonicalEmailBlock
-from .admin_cohort import AdminCohort
-from .admin_cohort_frequency import AdminCohortFrequency
-from .admin_dimension import AdminDimension
-from .admin_dimension_data import AdminDimensionData
-from .admin_domain_allow import AdminDomainAllow
-from .admin_domain_block import AdminDomainBlock
-from .admin_domain_block_severity import AdminDomainBlockSeverity
-from .admin_email_domain_block import AdminEmailDomainBlock
-from .admin_email_domain_block_history import AdminEmailDomainBlockHistory
-from .admin_ip import AdminIp
-from .admin_ip_block import AdminIpBlock
-from .admin_ip_block_severity import AdminIpBlockSeverity
-from .admin_measure import AdminMeasure
-from .admin_measure_data import AdminMeasureData
-from .admin_report import AdminReport
-from .admin_tag import AdminTag
-from .announcement import Announcement
-from .announcement_account import AnnouncementAccount
-from .announcement_status import AnnouncementStatus
-from .appeal import Appeal
-from .appeal_state import AppealState
-from .application import Application
-from .base_status import BaseStatus
-from .category_enum import CategoryEnum
-from .cohort_data import CohortData
-from .context import Context
-from .conversation import Conversation
-from .create_account_body import CreateAccountBody
-from .create_app_body import CreateAppBody
-from .create_domain_block_body import CreateDomainBlockBody
-from .create_email_confirmations_body import CreateEmailConfirmationsBody
-from .create_featured_tag_body import CreateFeaturedTagBody
-from .create_filter_body import CreateFilterBody
-from .create_filter_v2_body import CreateFilterV2Body
-from .create_filter_v2_body_keywords_attributes_item import (
-    CreateFilterV2BodyKeywordsAttributesItem,
-)
-from .create_list_body import CreateListBody
-from .create_marker_body import CreateMarkerBody
-from .create_marker_body_home import CreateMarkerBodyHome
-from .create_marker_body_notifications import CreateMarkerBodyNotifications
-from .create_media_body import CreateMediaBody
-from .create_media_v2_body import CreateMediaV2Body
-from .create_push_subscription_body import CreatePushSubscriptionBody
-from .create_push_subscription_body_data import CreatePushSubscriptionBodyData
-from .create_push_subscription_body_data_alerts import (
-    CreatePushSubscriptionBodyDataAlerts,
-)
-from .create_push_subscription_body_subscription import (
-    CreatePushSubscriptionBodySubscription,
-)
-from .create_push_subscription_body_subscription_keys import (
-    CreatePushSubscriptionBodySubscriptionKeys,
-)
-from .create_report_body import CreateReportBody
-from .create_report_body_category import CreateReportBodyCategory
-from .credential_account import CredentialAccount
-from .credential_account_source import CredentialAccountSource
-from .credential_account_source_privacy import CredentialAccountSourcePrivacy
-from .credential_application import CredentialApplication
-from .custom_emoji import CustomEmoji
-from .delete_domain_blocks_body import DeleteDomainBlocksBody
-from .delete_list_accounts_body import DeleteListAccountsBody
-from .discover_oauth_server_configuration_response import (
-    DiscoverOauthServerConfigurationResponse,
-)
-from .domain_block import DomainBlock
-from .domain_block_severity import DomainBlockSeverity
-from .error import Error
-from .extended_description import ExtendedDescription
-from .familiar_followers import FamiliarFollowers
-from .featured_tag import FeaturedTag
-from .field import Field
-from .filter_ import Filter
-from .filter_context import FilterContext
-from .filter_filter_action import FilterFilterAction
-from .filter_keyword import FilterKeyword
-from .filter_result import FilterResult
-from .filter_status import FilterStatus
-from .get_instance_activity_response_200_item import GetInstanceActivityResponse200Item
-from .get_markers_timeline_item import GetMarkersTimelineItem
-from .grouped_notifications_results import GroupedNotificationsResults
-from .identity_proof import IdentityProof
-from .instance import Instance
-from .instance_api_versions import InstanceApiVersions
-from .instance_configuration import InstanceConfiguration
-from .instance_configuration_accounts import InstanceConfigurationAccounts
-from .instance_configuration_media_attachments import (
-    InstanceConfigurationMediaAttachments,
-)
-from .instance_configuration_polls import InstanceConfigurationPolls
-from .instance_configuration_statuses import InstanceConfigurationStatuses
-from .instance_configuration_translation import InstanceConfigurationTranslation
-from .instance_configuration_urls import InstanceConfigurationUrls
-from .instance_contact import InstanceContact
-from .instance_icon import InstanceIcon
-from .instance_registrations import InstanceRegistrations
-from .instance_thumbnail import InstanceThumbnail
-from .instance_thumbnail_versions_type_0 import InstanceThumbnailVersionsType0
-from .instance_usage import InstanceUsage
-from .instance_usage_users import InstanceUsageUsers
-from .list_ import List
-from .marker import Marker
-from .media_attachment import MediaAttachment
-from .media_attachment_meta import MediaAttachmentMeta
-from .media_attachment_meta_focus_type_0 import MediaAttachmentMetaFocusType0
-from .media_attachment_type import MediaAttachmentType
-from .media_status import MediaStatus
-from .muted_account import MutedAccount
-from .notification import Notification
-from .notification_group import NotificationGroup
-from .notification_policy import NotificationPolicy
-from .notification_policy_summary import NotificationPolicySummary
-from .notification_request import NotificationRequest
-from .notification_type_enum import NotificationTypeEnum
-from .o_auth_scope import OAuthScope
-from .o_embed_response import OEmbedResponse
-from .partial_account_with_avatar import PartialAccountWithAvatar
-from .patch_accounts_update_credentials_body import PatchAccountsUpdateCredentialsBody
-from .patch_accounts_update_credentials_body_fields_attributes import (
-    PatchAccountsUpdateCredentialsBodyFieldsAttributes,
-)
-from .patch_accounts_update_credentials_body_source import (
-    PatchAccountsUpdateCredentialsBodySource,
-)
-from .patch_accounts_update_credentials_body_source_privacy import (
-    PatchAccountsUpdateCredentialsBodySourcePrivacy,
-)
-from .policy_enum import PolicyEnum
-from .poll import Poll
-from .poll_option import PollOption
-from .poll_status import PollStatus
-from .poll_status_poll import PollStatusPoll
-from .post_account_follow_body import PostAccountFollowBody
-from .post_account_mute_body import PostAccountMuteBody
-from .post_account_note_body import PostAccountNoteBody
-from .post_filter_keywords_v2_body import PostFilterKeywordsV2Body
-from .post_filter_statuses_v2_body import PostFilterStatusesV2Body
-from .post_list_accounts_body import PostListAccountsBody
-from .post_oauth_revoke_body import PostOauthRevokeBody
-from .post_oauth_token_body import PostOauthTokenBody
-from .post_poll_votes_body import PostPollVotesBody
-from .post_status_reblog_body import PostStatusReblogBody
-from .post_status_translate_body import PostStatusTranslateBody
-from .preferences import Preferences
-from .preferences_readingexpandmedia import PreferencesReadingexpandmedia
-from .preview_card import PreviewCard
-from .preview_card_author import PreviewCardAuthor
-from .preview_type_enum import PreviewTypeEnum
-from .privacy_policy import PrivacyPolicy
-from .put_push_subscription_body import PutPushSubscriptionBody
-from .put_push_subscription_body_data import PutPushSubscriptionBodyData
-from .put_push_subscription_body_data_alerts import PutPushSubscriptionBodyDataAlerts
-from .quote import Quote
-from .reaction import Reaction
-from .relationship import Relationship
-from .relationship_severance_event import RelationshipSeveranceEvent
-from .relationship_severance_event_type import RelationshipSeveranceEventType
-from .report import Report
-from .role import Role
-from .rule import Rule
-from .rule_translations_type_0 import RuleTranslationsType0
-from .scheduled_status import ScheduledStatus
-from .scheduled_status_params import ScheduledStatusParams
-from .scheduled_status_params_poll_type_0 import ScheduledStatusParamsPollType0
-from .scheduled_status_params_visibility import ScheduledStatusParamsVisibility
-from .search import Search
-from .shallow_quote import ShallowQuote
-from .state_enum import StateEnum
-from .status import Status
-from .status_application_type_0 import StatusApplicationType0
-from .status_edit import StatusEdit
-from .status_edit_poll_type_0 import StatusEditPollType0
-from .status_edit_poll_type_0_options_item import StatusEditPollType0OptionsItem
-from .status_mention import StatusMention
-from .status_source import StatusSource
-from .status_tag import StatusTag
-from .suggestion import Suggestion
-from .suggestion_sources_item import SuggestionSourcesItem
-from .tag import Tag
-from .tag_history import TagHistory
-from .terms_of_service import TermsOfService
-from .text_status import TextStatus
-from .token import Token
-from .translation import Translation
-from .translation_attachment import TranslationAttachment
-from .translation_poll import TranslationPoll
-from .translation_poll_option import TranslationPollOption
-from .trends_link import TrendsLink
-from .trends_link_history_item import TrendsLinkHistoryItem
-from .types_enum import TypesEnum
-from .update_filter_body import UpdateFilterBody
-from .update_filter_v2_body import UpdateFilterV2Body
-from .update_filter_v2_body_keywords_attributes_item import (
-    UpdateFilterV2BodyKeywordsAttributesItem,
-)
-from .update_filters_keywords_by_id_v2_body import UpdateFiltersKeywordsByIdV2Body
-from .update_list_body import UpdateListBody
-from .update_media_body import UpdateMediaBody
-from .update_scheduled_status_body import UpdateScheduledStatusBody
-from .update_status_body import UpdateStatusBody
-from .update_status_body_poll import UpdateStatusBodyPoll
-from .v1_filter import V1Filter
-from .v1_instance import V1Instance
-from .v1_instance_configuration import V1InstanceConfiguration
-from .v1_instance_configuration_accounts import V1InstanceConfigurationAccounts
-from .v1_instance_configuration_media_attachments import (
-    V1InstanceConfigurationMediaAttachments,
-)
-from .v1_instance_configuration_polls import V1InstanceConfigurationPolls
-from .v1_instance_configuration_statuses import V1InstanceConfigurationStatuses
-from .v1_instance_stats import V1InstanceStats
-from .v1_instance_urls import V1InstanceUrls
-from .v1_notification_policy import V1NotificationPolicy
-from .v1_notification_policy_summary import V1NotificationPolicySummary
-from .validation_error import ValidationError
-from .validation_error_details import ValidationErrorDetails
-from .validation_error_details_additional_property_item import (
-    ValidationErrorDetailsAdditionalPropertyItem,
-)
-from .visibility_enum import VisibilityEnum
-from .web_push_subscription import WebPushSubscription
-from .web_push_subscription_alerts import WebPushSubscriptionAlerts
+Models are imported on first attribute access; see scripts/lazy_client_models.py.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .account import Account
+    from .account_warning import AccountWarning
+    from .account_warning_action import AccountWarningAction
+    from .admin_account import AdminAccount
+    from .admin_canonical_email_block import AdminCanonicalEmailBlock
+    from .admin_cohort import AdminCohort
+    from .admin_cohort_frequency import AdminCohortFrequency
+    from .admin_dimension import AdminDimension
+    from .admin_dimension_data import AdminDimensionData
+    from .admin_domain_allow import AdminDomainAllow
+    from .admin_domain_block import AdminDomainBlock
+    from .admin_domain_block_severity import AdminDomainBlockSeverity
+    from .admin_email_domain_block import AdminEmailDomainBlock
+    from .admin_email_domain_block_history import AdminEmailDomainBlockHistory
+    from .admin_ip import AdminIp
+    from .admin_ip_block import AdminIpBlock
+    from .admin_ip_block_severity import AdminIpBlockSeverity
+    from .admin_measure import AdminMeasure
+    from .admin_measure_data import AdminMeasureData
+    from .admin_report import AdminReport
+    from .admin_tag import AdminTag
+    from .announcement import Announcement
+    from .announcement_account import AnnouncementAccount
+    from .announcement_status import AnnouncementStatus
+    from .appeal import Appeal
+    from .appeal_state import AppealState
+    from .application import Application
+    from .base_status import BaseStatus
+    from .category_enum import CategoryEnum
+    from .cohort_data import CohortData
+    from .context import Context
+    from .conversation import Conversation
+    from .create_account_body import CreateAccountBody
+    from .create_app_body import CreateAppBody
+    from .create_domain_block_body import CreateDomainBlockBody
+    from .create_email_confirmations_body import CreateEmailConfirmationsBody
+    from .create_featured_tag_body import CreateFeaturedTagBody
+    from .create_filter_body import CreateFilterBody
+    from .create_filter_v2_body import CreateFilterV2Body
+    from .create_filter_v2_body_keywords_attributes_item import CreateFilterV2BodyKeywordsAttributesItem
+    from .create_list_body import CreateListBody
+    from .create_marker_body import CreateMarkerBody
+    from .create_marker_body_home import CreateMarkerBodyHome
+    from .create_marker_body_notifications import CreateMarkerBodyNotifications
+    from .create_media_body import CreateMediaBody
+    from .create_media_v2_body import CreateMediaV2Body
+    from .create_push_subscription_body import CreatePushSubscriptionBody
+    from .create_push_subscription_body_data import CreatePushSubscriptionBodyData
+    from .create_push_subscription_body_data_alerts import CreatePushSubscriptionBodyDataAlerts
+    from .create_push_subscription_body_subscription import CreatePushSubscriptionBodySubscription
+    from .create_push_subscription_body_subscription_keys import CreatePushSubscriptionBodySubscriptionKeys
+    from .create_report_body import CreateReportBody
+    from .create_report_body_category import CreateReportBodyCategory
+    from .credential_account import CredentialAccount
+    from .credential_account_source import CredentialAccountSource
+    from .credential_account_source_privacy import CredentialAccountSourcePrivacy
+    from .credential_application import CredentialApplication
+    from .custom_emoji import CustomEmoji
+    from .delete_domain_blocks_body import DeleteDomainBlocksBody
+    from .delete_list_accounts_body import DeleteListAccountsBody
+    from .discover_oauth_server_configuration_response import DiscoverOauthServerConfigurationResponse
+    from .domain_block import DomainBlock
+    from .domain_block_severity import DomainBlockSeverity
+    from .error import Error
+    from .extended_description import ExtendedDescription
+    from .familiar_followers import FamiliarFollowers
+    from .featured_tag import FeaturedTag
+    from .field import Field
+    from .filter_ import Filter
+    from .filter_context import FilterContext
+    from .filter_filter_action import FilterFilterAction
+    from .filter_keyword import FilterKeyword
+    from .filter_result import FilterResult
+    from .filter_status import FilterStatus
+    from .get_instance_activity_response_200_item import GetInstanceActivityResponse200Item
+    from .get_markers_timeline_item import GetMarkersTimelineItem
+    from .grouped_notifications_results import GroupedNotificationsResults
+    from .identity_proof import IdentityProof
+    from .instance import Instance
+    from .instance_api_versions import InstanceApiVersions
+    from .instance_configuration import InstanceConfiguration
+    from .instance_configuration_accounts import InstanceConfigurationAccounts
+    from .instance_configuration_media_attachments import InstanceConfigurationMediaAttachments
+    from .instance_configuration_polls import InstanceConfigurationPolls
+    from .instance_configuration_statuses import InstanceConfigurationStatuses
+    from .instance_configuration_translation import InstanceConfigurationTranslation
+    from .instance_configuration_urls import InstanceConfigurationUrls
+    from .instance_contact import InstanceContact
+    from .instance_icon import InstanceIcon
+    from .instance_registrations import InstanceRegistrations
+    from .instance_thumbnail import InstanceThumbnail
+    from .instance_thumbnail_versions_type_0 import InstanceThumbnailVersionsType0
+    from .instance_usage import InstanceUsage
+    from .instance_usage_users import InstanceUsageUsers
+    from .list_ import List
+    from .marker import Marker
+    from .media_attachment import MediaAttachment
+    from .media_attachment_meta import MediaAttachmentMeta
+    from .media_attachment_meta_focus_type_0 import MediaAttachmentMetaFocusType0
+    from .media_attachment_type import MediaAttachmentType
+    from .media_status import MediaStatus
+    from .muted_account import MutedAccount
+    from .notification import Notification
+    from .notification_group import NotificationGroup
+    from .notification_policy import NotificationPolicy
+    from .notification_policy_summary import NotificationPolicySummary
+    from .notification_request import NotificationRequest
+    from .notification_type_enum import NotificationTypeEnum
+    from .o_auth_scope import OAuthScope
+    from .o_embed_response import OEmbedResponse
+    from .partial_account_with_avatar import PartialAccountWithAvatar
+    from .patch_accounts_update_credentials_body import PatchAccountsUpdateCredentialsBody
+    from .patch_accounts_update_credentials_body_fields_attributes import PatchAccountsUpdateCredentialsBodyFieldsAttributes
+    from .patch_accounts_update_credentials_body_source import PatchAccountsUpdateCredentialsBodySource
+    from .patch_accounts_update_credentials_body_source_privacy import PatchAccountsUpdateCredentialsBodySourcePrivacy
+    from .policy_enum import PolicyEnum
+    from .poll import Poll
+    from .poll_option import PollOption
+    from .poll_status import PollStatus
+    from .poll_status_poll import PollStatusPoll
+    from .post_account_follow_body import PostAccountFollowBody
+    from .post_account_mute_body import PostAccountMuteBody
+    from .post_account_note_body import PostAccountNoteBody
+    from .post_filter_keywords_v2_body import PostFilterKeywordsV2Body
+    from .post_filter_statuses_v2_body import PostFilterStatusesV2Body
+    from .post_list_accounts_body import PostListAccountsBody
+    from .post_oauth_revoke_body import PostOauthRevokeBody
+    from .post_oauth_token_body import PostOauthTokenBody
+    from .post_poll_votes_body import PostPollVotesBody
+    from .post_status_reblog_body import PostStatusReblogBody
+    from .post_status_translate_body import PostStatusTranslateBody
+    from .preferences import Preferences
+    from .preferences_readingexpandmedia import PreferencesReadingexpandmedia
+    from .preview_card import PreviewCard
+    from .preview_card_author import PreviewCardAuthor
+    from .preview_type_enum import PreviewTypeEnum
+    from .privacy_policy import PrivacyPolicy
+    from .put_push_subscription_body import PutPushSubscriptionBody
+    from .put_push_subscription_body_data import PutPushSubscriptionBodyData
+    from .put_push_subscription_body_data_alerts import PutPushSubscriptionBodyDataAlerts
+    from .quote import Quote
+    from .reaction import Reaction
+    from .relationship import Relationship
+    from .relationship_severance_event import RelationshipSeveranceEvent
+    from .relationship_severance_event_type import RelationshipSeveranceEventType
+    from .report import Report
+    from .role import Role
+    from .rule import Rule
+    from .rule_translations_type_0 import RuleTranslationsType0
+    from .scheduled_status import ScheduledStatus
+    from .scheduled_status_params import ScheduledStatusParams
+    from .scheduled_status_params_poll_type_0 import ScheduledStatusParamsPollType0
+    from .scheduled_status_params_visibility import ScheduledStatusParamsVisibility
+    from .search import Search
+    from .shallow_quote import ShallowQuote
+    from .state_enum import StateEnum
+    from .status import Status
+    from .status_application_type_0 import StatusApplicationType0
+    from .status_edit import StatusEdit
+    from .status_edit_poll_type_0 import StatusEditPollType0
+    from .status_edit_poll_type_0_options_item import StatusEditPollType0OptionsItem
+    from .status_mention import StatusMention
+    from .status_source import StatusSource
+    from .status_tag import StatusTag
+    from .suggestion import Suggestion
+    from .suggestion_sources_item import SuggestionSourcesItem
+    from .tag import Tag
+    from .tag_history import TagHistory
+    from .terms_of_service import TermsOfService
+    from .text_status import TextStatus
+    from .token import Token
+    from .translation import Translation
+    from .translation_attachment import TranslationAttachment
+    from .translation_poll import TranslationPoll
+    from .translation_poll_option import TranslationPollOption
+    from .trends_link import TrendsLink
+    from .trends_link_history_item import TrendsLinkHistoryItem
+    from .types_enum import TypesEnum
+    from .update_filter_body import UpdateFilterBody
+    from .update_filter_v2_body import UpdateFilterV2Body
+    from .update_filter_v2_body_keywords_attributes_item import UpdateFilterV2BodyKeywordsAttributesItem
+    from .update_filters_keywords_by_id_v2_body import UpdateFiltersKeywordsByIdV2Body
+    from .update_list_body import UpdateListBody
+    from .update_media_body import UpdateMediaBody
+    from .update_scheduled_status_body import UpdateScheduledStatusBody
+    from .update_status_body import UpdateStatusBody
+    from .update_status_body_poll import UpdateStatusBodyPoll
+    from .v1_filter import V1Filter
+    from .v1_instance import V1Instance
+    from .v1_instance_configuration import V1InstanceConfiguration
+    from .v1_instance_configuration_accounts import V1InstanceConfigurationAccounts
+    from .v1_instance_configuration_media_attachments import V1InstanceConfigurationMediaAttachments
+    from .v1_instance_configuration_polls import V1InstanceConfigurationPolls
+    from .v1_instance_configuration_statuses import V1InstanceConfigurationStatuses
+    from .v1_instance_stats import V1InstanceStats
+    from .v1_instance_urls import V1InstanceUrls
+    from .v1_notification_policy import V1NotificationPolicy
+    from .v1_notification_policy_summary import V1NotificationPolicySummary
+    from .validation_error import ValidationError
+    from .validation_error_details import ValidationErrorDetails
+    from .validation_error_details_additional_property_item import ValidationErrorDetailsAdditionalPropertyItem
+    from .visibility_enum import VisibilityEnum
+    from .web_push_subscription import WebPushSubscription
+    from .web_push_subscription_alerts import WebPushSubscriptionAlerts
+
+_MODULES = {
+    "Account": "account",
+    "AccountWarning": "account_warning",
+    "AccountWarningAction": "account_warning_action",
+    "AdminAccount": "admin_account",
+    "AdminCanonicalEmailBlock": "admin_canonical_email_block",
+    "AdminCohort": "admin_cohort",
+    "AdminCohortFrequency": "admin_cohort_frequency",
+    "AdminDimension": "admin_dimension",
+    "AdminDimensionData": "admin_dimension_data",
+    "AdminDomainAllow": "admin_domain_allow",
+    "AdminDomainBlock": "admin_domain_block",
+    "AdminDomainBlockSeverity": "admin_domain_block_severity",
+    "AdminEmailDomainBlock": "admin_email_domain_block",
+    "AdminEmailDomainBlockHistory": "admin_email_domain_block_history",
+    "AdminIp": "admin_ip",
+    "AdminIpBlock": "admin_ip_block",
+    "AdminIpBlockSeverity": "admin_ip_block_severity",
+    "AdminMeasure": "admin_measure",
+    "AdminMeasureData": "admin_measure_data",
+    "AdminReport": "admin_report",
+    "AdminTag": "admin_tag",
+    "Announcement": "announcement",
+    "AnnouncementAccount": "announcement_account",
+    "AnnouncementStatus": "announcement_status",
+    "Appeal": "appeal",
+    "AppealState": "appeal_state",
+    "Application": "application",
+    "BaseStatus": "base_status",
+    "CategoryEnum": "category_enum",
+    "CohortData": "cohort_data",
+    "Context": "context",
+    "Conversation": "conversation",
+    "CreateAccountBody": "create_account_body",
+    "CreateAppBody": "create_app_body",
+    "CreateDomainBlockBody": "create_domain_block_body",
+    "CreateEmailConfirmationsBody": "create_email_confirmations_body",
+    "CreateFeaturedTagBody": "create_featured_tag_body",
+    "CreateFilterBody": "create_filter_body",
+    "CreateFilterV2Body": "create_filter_v2_body",
+    "CreateFilterV2BodyKeywordsAttributesItem": "create_filter_v2_body_keywords_attributes_item",
+    "CreateListBody": "create_list_body",
+    "CreateMarkerBody": "create_marker_body",
+    "CreateMarkerBodyHome": "create_marker_body_home",
+    "CreateMarkerBodyNotifications": "create_marker_body_notifications",
+    "CreateMediaBody": "create_media_body",
+    "CreateMediaV2Body": "create_media_v2_body",
+    "CreatePushSubscriptionBody": "create_push_subscription_body",
+    "CreatePushSubscriptionBodyData": "create_push_subscription_body_data",
+    "CreatePushSubscriptionBodyDataAlerts": "create_push_subscription_body_data_alerts",
+    "CreatePushSubscriptionBodySubscription": "create_push_subscription_body_subscription",
+    "CreatePushSubscriptionBodySubscriptionKeys": "create_push_subscription_body_subscription_keys",
+    "CreateReportBody": "create_report_body",
+    "CreateReportBodyCategory": "create_report_body_category",
+    "CredentialAccount": "credential_account",
+    "CredentialAccountSource": "credential_account_source",
+    "CredentialAccountSourcePrivacy": "credential_account_source_privacy",
+    "CredentialApplication": "credential_application",
+    "CustomEmoji": "custom_emoji",
+    "DeleteDomainBlocksBody": "delete_domain_blocks_body",
+    "DeleteListAccountsBody": "delete_list_accounts_body",
+    "DiscoverOauthServerConfigurationResponse": "discover_oauth_server_configuration_response",
+    "DomainBlock": "domain_block",
+    "DomainBlockSeverity": "domain_block_severity",
+    "Error": "error",
+    "ExtendedDescription": "extended_description",
+    "FamiliarFollowers": "familiar_followers",
+    "FeaturedTag": "featured_tag",
+    "Field": "field",
+    "Filter": "filter_",
+    "FilterContext": "filter_context",
+    "FilterFilterAction": "filter_filter_action",
+    "FilterKeyword": "filter_keyword",
+    "FilterResult": "filter_result",
+    "FilterStatus": "filter_status",
+    "GetInstanceActivityResponse200Item": "get_instance_activity_response_200_item",
+    "GetMarkersTimelineItem": "get_markers_timeline_item",
+    "GroupedNotificationsResults": "grouped_notifications_results",
+    "IdentityProof": "identity_proof",
+    "Instance": "instance",
+    "InstanceApiVersions": "instance_api_versions",
+    "InstanceConfiguration": "instance_configuration",
+    "InstanceConfigurationAccounts": "instance_configuration_accounts",
+    "InstanceConfigurationMediaAttachments": "instance_configuration_media_attachments",
+    "InstanceConfigurationPolls": "instance_configuration_polls",
+    "InstanceConfigurationStatuses": "instance_configuration_statuses",
+    "InstanceConfigurationTranslation": "instance_configuration_translation",
+    "InstanceConfigurationUrls": "instance_configuration_urls",
+    "InstanceContact": "instance_contact",
+    "InstanceIcon": "instance_icon",
+    "InstanceRegistrations": "instance_registrations",
+    "InstanceThumbnail": "instance_thumbnail",
+    "InstanceThumbnailVersionsType0": "instance_thumbnail_versions_type_0",
+    "InstanceUsage": "instance_usage",
+    "InstanceUsageUsers": "instance_usage_users",
+    "List": "list_",
+    "Marker": "marker",
+    "MediaAttachment": "media_attachment",
+    "MediaAttachmentMeta": "media_attachment_meta",
+    "MediaAttachmentMetaFocusType0": "media_attachment_meta_focus_type_0",
+    "MediaAttachmentType": "media_attachment_type",
+    "MediaStatus": "media_status",
+    "MutedAccount": "muted_account",
+    "Notification": "notification",
+    "NotificationGroup": "notification_group",
+    "NotificationPolicy": "notification_policy",
+    "NotificationPolicySummary": "notification_policy_summary",
+    "NotificationRequest": "notification_request",
+    "NotificationTypeEnum": "notification_type_enum",
+    "OAuthScope": "o_auth_scope",
+    "OEmbedResponse": "o_embed_response",
+    "PartialAccountWithAvatar": "partial_account_with_avatar",
+    "PatchAccountsUpdateCredentialsBody": "patch_accounts_update_credentials_body",
+    "PatchAccountsUpdateCredentialsBodyFieldsAttributes": "patch_accounts_update_credentials_body_fields_attributes",
+    "PatchAccountsUpdateCredentialsBodySource": "patch_accounts_update_credentials_body_source",
+    "PatchAccountsUpdateCredentialsBodySourcePrivacy": "patch_accounts_update_credentials_body_source_privacy",
+    "PolicyEnum": "policy_enum",
+    "Poll": "poll",
+    "PollOption": "poll_option",
+    "PollStatus": "poll_status",
+    "PollStatusPoll": "poll_status_poll",
+    "PostAccountFollowBody": "post_account_follow_body",
+    "PostAccountMuteBody": "post_account_mute_body",
+    "PostAccountNoteBody": "post_account_note_body",
+    "PostFilterKeywordsV2Body": "post_filter_keywords_v2_body",
+    "PostFilterStatusesV2Body": "post_filter_statuses_v2_body",
+    "PostListAccountsBody": "post_list_accounts_body",
+    "PostOauthRevokeBody": "post_oauth_revoke_body",
+    "PostOauthTokenBody": "post_oauth_token_body",
+    "PostPollVotesBody": "post_poll_votes_body",
+    "PostStatusReblogBody": "post_status_reblog_body",
+    "PostStatusTranslateBody": "post_status_translate_body",
+    "Preferences": "preferences",
+    "PreferencesReadingexpandmedia": "preferences_readingexpandmedia",
+    "PreviewCard": "preview_card",
+    "PreviewCardAuthor": "preview_card_author",
+    "PreviewTypeEnum": "preview_type_enum",
+    "PrivacyPolicy": "privacy_policy",
+    "PutPushSubscriptionBody": "put_push_subscription_body",
+    "PutPushSubscriptionBodyData": "put_push_subscription_body_data",
+    "PutPushSubscriptionBodyDataAlerts": "put_push_subscription_body_data_alerts",
+    "Quote": "quote",
+    "Reaction": "reaction",
+    "Relationship": "relationship",
+    "RelationshipSeveranceEvent": "relationship_severance_event",
+    "RelationshipSeveranceEventType": "relationship_severance_event_type",
+    "Report": "report",
+    "Role": "role",
+    "Rule": "rule",
+    "RuleTranslationsType0": "rule_translations_type_0",
+    "ScheduledStatus": "scheduled_status",
+    "ScheduledStatusParams": "scheduled_status_params",
+    "ScheduledStatusParamsPollType0": "scheduled_status_params_poll_type_0",
+    "ScheduledStatusParamsVisibility": "scheduled_status_params_visibility",
+    "Search": "search",
+    "ShallowQuote": "shallow_quote",
+    "StateEnum": "state_enum",
+    "Status": "status",
+    "StatusApplicationType0": "status_application_type_0",
+    "StatusEdit": "status_edit",
+    "StatusEditPollType0": "status_edit_poll_type_0",
+    "StatusEditPollType0OptionsItem": "status_edit_poll_type_0_options_item",
+    "StatusMention": "status_mention",
+    "StatusSource": "status_source",
+    "StatusTag": "status_tag",
+    "Suggestion": "suggestion",
+    "SuggestionSourcesItem": "suggestion_sources_item",
+    "Tag": "tag",
+    "TagHistory": "tag_history",
+    "TermsOfService": "terms_of_service",
+    "TextStatus": "text_status",
+    "Token": "token",
+    "Translation": "translation",
+    "TranslationAttachment": "translation_attachment",
+    "TranslationPoll": "translation_poll",
+    "TranslationPollOption": "translation_poll_option",
+    "TrendsLink": "trends_link",
+    "TrendsLinkHistoryItem": "trends_link_history_item",
+    "TypesEnum": "types_enum",
+    "UpdateFilterBody": "update_filter_body",
+    "UpdateFilterV2Body": "update_filter_v2_body",
+    "UpdateFilterV2BodyKeywordsAttributesItem": "update_filter_v2_body_keywords_attributes_item",
+    "UpdateFiltersKeywordsByIdV2Body": "update_filters_keywords_by_id_v2_body",
+    "UpdateListBody": "update_list_body",
+    "UpdateMediaBody": "update_media_body",
+    "UpdateScheduledStatusBody": "update_scheduled_status_body",
+    "UpdateStatusBody": "update_status_body",
+    "UpdateStatusBodyPoll": "update_status_body_poll",
+    "V1Filter": "v1_filter",
+    "V1Instance": "v1_instance",
+    "V1InstanceConfiguration": "v1_instance_configuration",
+    "V1InstanceConfigurationAccounts": "v1_instance_configuration_accounts",
+    "V1InstanceConfigurationMediaAttachments": "v1_instance_configuration_media_attachments",
+    "V1InstanceConfigurationPolls": "v1_instance_configuration_polls",
+    "V1InstanceConfigurationStatuses": "v1_instance_configuration_statuses",
+    "V1InstanceStats": "v1_instance_stats",
+    "V1InstanceUrls": "v1_instance_urls",
+    "V1NotificationPolicy": "v1_notification_policy",
+    "V1NotificationPolicySummary": "v1_notification_policy_summary",
+    "ValidationError": "validation_error",
+    "ValidationErrorDetails": "validation_error_details",
+    "ValidationErrorDetailsAdditionalPropertyItem": "validation_error_details_additional_property_item",
+    "VisibilityEnum": "visibility_enum",
+    "WebPushSubscription": "web_push_subscription",
+    "WebPushSubscriptionAlerts": "web_push_subscription_alerts",
+}
 
 __all__ = (
     "Account",
@@ -409,9 +599,9 @@ __all__ = (
     "TrendsLinkHistoryItem",
     "TypesEnum",
     "UpdateFilterBody",
-    "UpdateFiltersKeywordsByIdV2Body",
     "UpdateFilterV2Body",
     "UpdateFilterV2BodyKeywordsAttributesItem",
+    "UpdateFiltersKeywordsByIdV2Body",
     "UpdateListBody",
     "UpdateMediaBody",
     "UpdateScheduledStatusBody",
@@ -435,3 +625,17 @@ __all__ = (
     "WebPushSubscription",
     "WebPushSubscriptionAlerts",
 )
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -23,8 +23,20 @@ class Settings(BaseSettings):
     HTTP_TIMEOUT: float = 30.0
     MAX_STATUSES_TO_FETCH: int = 5
     BATCH_SIZE: int = 20
+    SCAN_CONCURRENCY: int = 4
     HTTP_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+    RATE_LIMIT_BURST: int = 10
+    RATE_LIMIT_WINDOW: int = 300
+    RATE_LIMIT_SHARE_REALTIME: float = 0.4
+    RATE_LIMIT_SHARE_ENFORCEMENT: float = 0.2
+    RATE_LIMIT_SHARE_BACKFILL: float = 0.1
     RULE_CACHE_TTL: int = 60
+    STATUS_CACHE_TTL: int = 30  # seconds; 0 disables the shared status cache
+    TASK_PAYLOAD_MIN_BYTES: int = 0  # payloads this large are passed to tasks by reference; 0 keeps them inline
+    TASK_PAYLOAD_TTL: int = 86400  # seconds
 
     # Reporting behavior
     REPORT_CATEGORY_DEFAULT: str = "spam"  # spam | violation | legal | other
@@ -38,6 +50,12 @@ class Settings(BaseSettings):
     # Webhooks
     WEBHOOK_SECRET: str | None = None
     WEBHOOK_SIG_HEADER: str = "X-Hub-Signature-256"  # sha256=<hexdigest>
+    WEBHOOK_INGEST_MODE: str = "celery"  # celery | stream
+    WEBHOOK_STREAM_MAXLEN: int = 100000
+    WEBHOOK_STREAM_BATCH_SIZE: int = 200
+    WEBHOOK_STREAM_MAX_ATTEMPTS: int = 5
+    STATUS_COALESCE_WINDOW: float = 0.0  # seconds; 0 (off) evaluates every status on arrival
+    STATUS_COALESCE_MAX_DELAY: float = 30.0
 
     # Slack notifications
     SLACK_WEBHOOKS: dict[str, str] = Field(default_factory=dict)
@@ -0,0 +1,127 @@
+"""Process-wide pooled HTTP client for outbound Mastodon API calls.
+
+Each worker process owns one ``httpx.AsyncClient`` with keep-alive and an
+optional HTTP/2 transport, so connections and TLS sessions are reused across
+Celery tasks. The client lives on a private event loop running in a daemon
+thread; synchronous code (Celery tasks, the scan thread pool) submits
+coroutines to it with ``run``.
+
+Celery's prefork pool forks after the parent may already have touched the
+pool. Sockets and threads do not survive ``fork`` safely, so the pool is keyed
+by PID and rebuilt lazily in every child, and ``celery_app`` closes it on
+worker process shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pool:
+    pid: int
+    loop: asyncio.AbstractEventLoop
+    thread: threading.Thread
+    client: httpx.AsyncClient
+
+
+_pool: _Pool | None = None
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    http2 = settings.HTTP2_ENABLED
+    if http2 and not _http2_available():
+        logger.warning("HTTP2_ENABLED is set but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        headers={"User-Agent": settings.USER_AGENT},
+    )
+
+
+def _start() -> _Pool:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="http-pool", daemon=True)
+    thread.start()
+    # The client must be created on the loop that will drive it.
+    client = asyncio.run_coroutine_threadsafe(_async_build_client(), loop).result()
+    logger.debug(f"Started HTTP pool in process {os.getpid()}")
+    return _Pool(pid=os.getpid(), loop=loop, thread=thread, client=client)
+
+
+async def _async_build_client() -> httpx.AsyncClient:
+    return _build_client()
+
+
+def _get_pool() -> _Pool:
+    global _pool
+    pool = _pool
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _lock:
+        if _pool is None or _pool.pid != os.getpid():
+            # A pool inherited through fork belongs to the parent: drop it without closing its sockets.
+            _pool = _start()
+        return _pool
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return this process's pooled AsyncClient; await it only through ``run`` or on its loop."""
+    return _get_pool().client
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on the pool's event loop and wait for its result.
+
+    Safe to call from any thread that is not itself running the pool loop.
+    """
+    pool = _get_pool()
+    return asyncio.run_coroutine_threadsafe(coro, pool.loop).result()
+
+
+def reset() -> None:
+    """Forget the pool without closing it; called in freshly forked worker processes."""
+    global _pool
+    with _lock:
+        _pool = None
+
+
+def close() -> None:
+    """Close pooled connections and stop the loop thread of this process, if any."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is None or pool.pid != os.getpid():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(pool.client.aclose(), pool.loop).result(timeout=5)
+    except Exception as e:
+        logger.warning(f"Error closing HTTP pool: {e}")
+    pool.loop.call_soon_threadsafe(pool.loop.stop)
+    pool.thread.join(timeout=5)
+    pool.loop.close()
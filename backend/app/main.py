@@ -5,6 +5,7 @@ import time
 from datetime import datetime
 
 import redis
+from app import status_cache
 
 # Import API routers
 from app.api.analytics import router as analytics_router
@@ -18,6 +19,7 @@ from app.db import SessionLocal
 from app.logging_conf import setup_logging
 from app.services.rule_service import rule_service
 from app.startup_validation import run_all_startup_validations
+from app.tasks import payload_store, webhook_stream
 from app.tasks.jobs import process_new_report, process_new_status
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -298,26 +300,31 @@ async def webhook_mastodon_events(request: Request):
                 },
             )
 
-        # Route events to appropriate Celery tasks
-        task_id = None
-        # Deduplication using Redis SETNX
-        r = redis.from_url(settings.REDIS_URL)
-        event_dedupe_key = f"webhook_dedupe:{event_type}:{payload.get('id', hashlib.sha256(body).hexdigest())}"
-        if r.setnx(event_dedupe_key, "1"):
-            r.expire(event_dedupe_key, 60)  # Deduplicate for 60 seconds
-        else:
+        # Deduplicate redeliveries for 60 seconds
+        event_id = payload.get("id", hashlib.sha256(body).hexdigest())
+        if not webhook_stream.claim_event(event_type, event_id):
             logger.info(f"Duplicate webhook event received: {event_type}", extra={"request_id": request_id})
             return {"ok": True, "message": f"Duplicate event: {event_type}", "request_id": request_id}
 
-        if event_type == "report.created":
+        # A status event makes the cached status pages of its account stale
+        status_account_id = (payload.get("status") or {}).get("account", {}).get("id")
+        if status_account_id:
+            status_cache.invalidate(status_account_id)
+
+        task_id = None
+        stream_id = None
+        if settings.WEBHOOK_INGEST_MODE == "stream" and event_type in webhook_stream.STREAM_EVENTS:
+            # The stream consumers batch the events per account; only append here.
+            stream_id = webhook_stream.append_event(event_type, body)
+        elif event_type == "report.created":
             report_id = payload.get("report", {}).get("id")
             logger.info(f"Enqueuing report.created event for report ID: {report_id}", extra={"request_id": request_id})
-            task = process_new_report.delay(payload)
+            task = process_new_report.delay(payload_store.stash(payload))
             task_id = task.id
         elif event_type == "status.created":
             status_id = payload.get("status", {}).get("id")
             logger.info(f"Enqueuing status.created event for status ID: {status_id}", extra={"request_id": request_id})
-            task = process_new_status.delay(payload)
+            task = process_new_status.delay(payload_store.stash(payload))
             task_id = task.id
         else:
             logger.info(f"Received unhandled Mastodon event type: {event_type}", extra={"request_id": request_id})
@@ -331,6 +338,7 @@ async def webhook_mastodon_events(request: Request):
                 "event_type": event_type,
                 "content_length": content_length,
                 "task_id": task_id,
+                "stream_id": stream_id,
                 "processing_time_ms": round(processing_time * 1000, 1),
             },
         )
@@ -339,6 +347,7 @@ async def webhook_mastodon_events(request: Request):
             "ok": True,
             "enqueued": True,
             "task_id": task_id,
+            "stream_id": stream_id,
             "event_type": event_type,
             "processing_time_ms": round(processing_time * 1000, 1),
             "request_id": request_id,
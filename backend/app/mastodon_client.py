@@ -1,19 +1,22 @@
 """Type-safe Mastodon client using generated OpenAPI client with fallback to raw HTTP calls.
 
 This provides the best type safety where available, flexibility where needed.
+The hot read endpoints (account, account statuses, admin accounts) decode the
+response body straight into dicts, since every caller wants plain dicts and
+building the generated attrs models only to call ``to_dict`` on them dominates
+the cost of a page.
 """
 
+import asyncio
 import hashlib
+import json
 import logging
 import re
 from typing import Any
 
 import httpx
+from app import http_pool, status_cache
 from app.clients.mastodon import AuthenticatedClient
-from app.clients.mastodon.api.accounts.get_account import sync as get_account_sync
-from app.clients.mastodon.api.accounts.get_account_statuses import (
-    sync as get_account_statuses_sync,
-)
 from app.clients.mastodon.api.accounts.get_accounts_verify_credentials import (
     asyncio as get_accounts_verify_credentials_async,
 )
@@ -27,10 +30,22 @@ from app.config import get_settings
 from app.metrics import api_call_seconds, http_errors
 from app.rate_limit import throttle_if_needed, update_from_headers
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+def decode_json(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 class MastoClient:
     """Enhanced Mastodon client with type safety and fallback support.
 
@@ -51,8 +66,10 @@ class MastoClient:
             headers={"User-Agent": self._ua},
             timeout=settings.HTTP_TIMEOUT,
         )
+        self._pooled = AsyncMastoClient(token)
 
-    def _parse_next_cursor(self, link_header: str | None) -> str | None:
+    @staticmethod
+    def _parse_next_cursor(link_header: str | None) -> str | None:
         """Parse the Link header to extract the next_max_id for pagination."""
         if not link_header:
             return None
@@ -65,26 +82,8 @@ class MastoClient:
         return None
 
     def _make_request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
-        throttle_if_needed(self._bucket_key)
-        headers = {"Authorization": f"Bearer {self._token}", "User-Agent": self._ua}
-        if "headers" in kwargs:
-            headers.update(kwargs.pop("headers"))
-
-        url = f"{self._base_url}{path}"
-        with api_call_seconds.labels(endpoint=path).time():
-            response = httpx.request(
-                method,
-                url,
-                headers=headers,
-                timeout=settings.HTTP_TIMEOUT,
-                **kwargs,
-            )
-
-        update_from_headers(self._bucket_key, response.headers)
-        if response.status_code >= 400:
-            http_errors.labels(endpoint=path, code=str(response.status_code)).inc()
-        response.raise_for_status()
-        return response
+        # Raw calls reuse this process's pooled connections instead of opening one per request.
+        return http_pool.run(self._pooled._make_request(method, path, **kwargs))
 
     async def verify_credentials(self) -> dict[str, Any]:
         """Verify the current token and return the associated account."""
@@ -96,9 +95,7 @@ class MastoClient:
         return self._to_dict(result)
 
     @classmethod
-    async def exchange_code_for_token(
-        cls, code: str, redirect_uri: str
-    ) -> dict[str, Any]:
+    async def exchange_code_for_token(cls, code: str, redirect_uri: str) -> dict[str, Any]:
         """Exchange an OAuth code for an access token."""
         settings_local = get_settings()
 
@@ -133,34 +130,22 @@ class MastoClient:
         }
 
         # Debug logging to help troubleshoot OAuth issues
-        client_id_preview = (
-            settings_local.OAUTH_CLIENT_ID[:10]
-            if settings_local.OAUTH_CLIENT_ID
-            else "None"
-        )
-        logger.info(
-            f"OAuth token exchange attempt - redirect_uri: {redirect_uri}, client_id: {client_id_preview}..."
-        )
+        client_id_preview = settings_local.OAUTH_CLIENT_ID[:10] if settings_local.OAUTH_CLIENT_ID else "None"
+        logger.info(f"OAuth token exchange attempt - redirect_uri: {redirect_uri}, client_id: {client_id_preview}...")
 
         async with httpx.AsyncClient(timeout=30.0) as client:
             with api_call_seconds.labels(endpoint="/oauth/token").time():
-                response = await client.post(
-                    f"{base}/oauth/token", data=data, headers=headers
-                )
+                response = await client.post(f"{base}/oauth/token", data=data, headers=headers)
         update_from_headers(bucket, response.headers)
         if response.status_code >= 400:
-            http_errors.labels(
-                endpoint="/oauth/token", code=str(response.status_code)
-            ).inc()
+            http_errors.labels(endpoint="/oauth/token", code=str(response.status_code)).inc()
             # Handle potential encoding issues in error response
             try:
                 error_text = response.text
             except (UnicodeDecodeError, Exception):
                 # Fallback for compressed or binary responses
                 error_text = str(response.content)
-            logger.error(
-                f"OAuth token exchange failed: {response.status_code} - {error_text}"
-            )
+            logger.error(f"OAuth token exchange failed: {response.status_code} - {error_text}")
             logger.error(
                 f"Request data: client_id={client_id_preview}, redirect_uri={redirect_uri}, "
                 f"grant_type=authorization_code"
@@ -170,30 +155,14 @@ class MastoClient:
             return response.json()
         except Exception as e:
             logger.error(f"Failed to parse OAuth response as JSON: {e}")
-            logger.error(
-                f"Response content type: {response.headers.get('content-type')}"
-            )
+            logger.error(f"Response content type: {response.headers.get('content-type')}")
             logger.error(f"Response encoding: {response.encoding}")
-            raise ValueError(
-                "Authentication failed due to server response encoding issue"
-            ) from e
+            raise ValueError("Authentication failed due to server response encoding issue") from e
 
     def get_account(self, account_id: str) -> dict[str, Any]:
-        """Get account information using generated OpenAPI client."""
-        throttle_if_needed(self._bucket_key)
-
-        with api_call_seconds.labels(endpoint=f"/api/v1/accounts/{account_id}").time():
-            result = get_account_sync(id=account_id, client=self._api_client)
-
-        if result is None:
-            raise httpx.HTTPStatusError(
-                "Account not found", request=None, response=None
-            )
-
-        if hasattr(result, "to_dict"):
-            return result.to_dict()
-        else:
-            return result.__dict__
+        """Get account information as the raw JSON dict."""
+        response = self._make_request("GET", f"/api/v1/accounts/{account_id}")
+        return decode_json(response.content)
 
     def get_account_statuses(
         self,
@@ -204,34 +173,19 @@ class MastoClient:
         exclude_replies: bool = False,
         only_media: bool = False,
         pinned: bool = False,
+        since_id: str | None = None,
     ) -> list[dict[str, Any]]:
-        """Get account statuses using generated OpenAPI client."""
-        throttle_if_needed(self._bucket_key)
-
-        with api_call_seconds.labels(
-            endpoint=f"/api/v1/accounts/{account_id}/statuses"
-        ).time():
-            result = get_account_statuses_sync(
-                id=account_id,
-                client=self._api_client,
-                limit=limit,
-                max_id=max_id if max_id else None,
-                exclude_reblogs=exclude_reblogs,
-                exclude_replies=exclude_replies,
-                only_media=only_media,
-                pinned=pinned,
-            )
-
-        if result is None:
-            return []
-
-        statuses = []
-        for status in result:
-            if hasattr(status, "to_dict"):
-                statuses.append(status.to_dict())
-            else:
-                statuses.append(status.__dict__)
-        return statuses
+        """Get account statuses as raw JSON dicts, only those newer than ``since_id`` if given.
+
+        Pages are shared between workers through ``status_cache`` for a few seconds.
+        """
+        params = _status_params(limit, max_id, exclude_reblogs, exclude_replies, only_media, pinned, since_id)
+        body = status_cache.get_or_fetch(
+            account_id,
+            status_cache.signature(self._bucket_key, sorted(params.items())),
+            lambda: self._make_request("GET", f"/api/v1/accounts/{account_id}/statuses", params=params).content,
+        )
+        return decode_json(body) or []
 
     def create_report(
         self,
@@ -282,7 +236,7 @@ class MastoClient:
             params["max_id"] = max_id
 
         response = self._make_request("GET", "/api/v1/admin/accounts", params=params)
-        accounts = response.json()
+        accounts = decode_json(response.content)
         next_max_id = self._parse_next_cursor(response.headers.get("Link"))
         return accounts, next_max_id
 
@@ -307,3 +261,136 @@ class MastoClient:
             else:
                 rules.append(self._to_dict(rule))
         return rules
+
+
+def _status_params(
+    limit: int,
+    max_id: str | None,
+    exclude_reblogs: bool,
+    exclude_replies: bool,
+    only_media: bool,
+    pinned: bool,
+    since_id: str | None = None,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {
+        "limit": limit,
+        "exclude_reblogs": str(exclude_reblogs).lower(),
+        "exclude_replies": str(exclude_replies).lower(),
+        "only_media": str(only_media).lower(),
+        "pinned": str(pinned).lower(),
+    }
+    if max_id:
+        params["max_id"] = max_id
+    if since_id:
+        params["since_id"] = since_id
+    return params
+
+
+class AsyncMastoClient:
+    """Async Mastodon client that sends every request through the pooled HTTP client.
+
+    Mirrors the REST surface of ``MastoClient`` that workers use, with raw JSON
+    calls instead of the generated client; ``MastoClient`` sends its raw calls
+    through one of these. Requests go through the
+    process-wide ``httpx.AsyncClient`` from ``app.http_pool`` by default, so
+    the coroutines must run on the pool loop, e.g.
+    ``http_pool.run(client.get_admin_accounts(...))``. Pass ``client`` to use
+    an ``AsyncClient`` owned by another event loop instead.
+    """
+
+    def __init__(self, token: str, client: httpx.AsyncClient | None = None):
+        self._token = token
+        self._base_url = str(settings.INSTANCE_BASE).rstrip("/")
+        tok = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        self._bucket_key = f"{self._base_url}:{tok}"
+        self._client = client
+
+    async def _make_request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        # The shared limiter may sleep; keep that off the event loop.
+        await asyncio.to_thread(throttle_if_needed, self._bucket_key)
+        headers = {"Authorization": f"Bearer {self._token}"}
+        if "headers" in kwargs:
+            headers.update(kwargs.pop("headers"))
+
+        client = self._client or http_pool.get_client()
+        with api_call_seconds.labels(endpoint=path).time():
+            response = await client.request(method, f"{self._base_url}{path}", headers=headers, **kwargs)
+
+        update_from_headers(self._bucket_key, response.headers)
+        if response.status_code >= 400:
+            http_errors.labels(endpoint=path, code=str(response.status_code)).inc()
+        response.raise_for_status()
+        return response
+
+    async def get_account(self, account_id: str) -> dict[str, Any]:
+        """Get account information."""
+        response = await self._make_request("GET", f"/api/v1/accounts/{account_id}")
+        return decode_json(response.content)
+
+    async def get_account_statuses(
+        self,
+        account_id: str,
+        limit: int = 20,
+        max_id: str | None = None,
+        exclude_reblogs: bool = False,
+        exclude_replies: bool = False,
+        only_media: bool = False,
+        pinned: bool = False,
+        since_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get account statuses, only those newer than ``since_id`` if given."""
+        params = _status_params(limit, max_id, exclude_reblogs, exclude_replies, only_media, pinned, since_id)
+        response = await self._make_request("GET", f"/api/v1/accounts/{account_id}/statuses", params=params)
+        return decode_json(response.content) or []
+
+    async def get_admin_accounts(
+        self,
+        origin: str | None = None,
+        status: str | None = None,
+        limit: int = 50,
+        max_id: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Get admin accounts and the next pagination cursor."""
+        params: dict[str, Any] = {"limit": limit}
+        if origin:
+            params["origin"] = origin
+        if status:
+            params["status"] = status
+        if max_id:
+            params["max_id"] = max_id
+
+        response = await self._make_request("GET", "/api/v1/admin/accounts", params=params)
+        return decode_json(response.content), MastoClient._parse_next_cursor(response.headers.get("Link"))
+
+    async def create_report(
+        self,
+        account_id: str,
+        comment: str,
+        status_ids: list[str] | None = None,
+        category: str = "other",
+        forward: bool = False,
+        rule_ids: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Create a report."""
+        body = {
+            "account_id": account_id,
+            "comment": comment,
+            "category": category,
+            "forward": forward,
+            "status_ids": status_ids or [],
+            "rule_ids": rule_ids or [],
+        }
+        response = await self._make_request("POST", "/api/v1/reports", json=body)
+        return response.json()
+
+    async def admin_account_action(self, account_id: str, payload: dict[str, Any]) -> httpx.Response:
+        """Apply a moderation action (warn, silence, suspend, ...) to an account."""
+        return await self._make_request("POST", f"/api/v1/admin/accounts/{account_id}/action", json=payload)
+
+    async def unsilence_account(self, account_id: str) -> httpx.Response:
+        """Lift a silence from an account."""
+        return await self._make_request("POST", f"/api/v1/admin/accounts/{account_id}/unsilence")
+
+    async def unsuspend_account(self, account_id: str) -> httpx.Response:
+        """Lift a suspension from an account."""
+        return await self._make_request("POST", f"/api/v1/admin/accounts/{account_id}/unsuspend")
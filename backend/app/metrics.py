@@ -9,5 +9,38 @@ report_latency = Histogram("sidecar_report_latency_seconds", "Latency from analy
 api_call_seconds = Histogram("sidecar_api_call_seconds", "API call duration seconds", ["endpoint"])
 redis_degraded = Counter("sidecar_redis_degraded_total", "Redis unavailable fallbacks")
 rate_limit_sleeps = Counter("sidecar_rate_limit_sleeps_total", "Times the rate limiter caused a sleep")
+rate_limit_permits = Counter(
+    "sidecar_rate_limit_permits_total", "Rate-limit permits granted per traffic class", ["traffic_class"]
+)
+rate_limit_wait_seconds = Histogram(
+    "sidecar_rate_limit_wait_seconds",
+    "Time spent waiting on the rate limiter per traffic class",
+    ["traffic_class"],
+    buckets=(0, 0.1, 0.5, 1, 2, 5, 15, 30, 60, 120, 300),
+)
+rate_limit_deferrals = Counter(
+    "sidecar_rate_limit_deferrals_total", "Tasks rescheduled instead of waiting on the rate limiter", ["task"]
+)
+webhook_stream_events = Counter(
+    "sidecar_webhook_stream_events_total", "Webhook stream entries handled by outcome", ["outcome"]
+)
+webhook_stream_batch_size = Histogram(
+    "sidecar_webhook_stream_batch_size",
+    "Entries per webhook stream batch",
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500, 1000),
+)
+status_burst_size = Histogram(
+    "sidecar_status_burst_size",
+    "New statuses evaluated together per coalesced account burst",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+status_cache_requests = Counter(
+    "sidecar_status_cache_requests_total", "Account status page lookups by outcome", ["outcome"]
+)
+task_payloads = Counter(
+    "sidecar_task_payloads_total",
+    "Webhook task payloads sent inline, stored by reference or found expired",
+    ["outcome"],
+)
 cursor_lag_pages = Gauge("sidecar_cursor_lag_pages", "Admin accounts pagination pages remaining", ["cursor"])
 analysis_latency = Histogram("sidecar_analysis_latency_seconds", "Latency from account fetch to analysis")
@@ -1,4 +1,5 @@
-from sqlalchemy import JSON, TIMESTAMP, BigInteger, Boolean, Column, Numeric, Text, Integer, ForeignKey, Enum as sa_Enum
+from sqlalchemy import JSON, TIMESTAMP, BigInteger, Boolean, Column, Numeric, Text, Integer, ForeignKey, Index
+from sqlalchemy import Enum as sa_Enum
 from sqlalchemy.sql import func
 
 from app.db import Base
@@ -136,6 +137,9 @@ class ContentScan(Base):
     """Track individual content scans to prevent re-processing"""
 
     __tablename__ = "content_scans"
+    __table_args__ = (
+        Index("ix_content_scans_account_hash_rules", "mastodon_account_id", "content_hash", "rules_version"),
+    )
     id = Column(BigInteger, primary_key=True)
     content_hash = Column(Text, nullable=False, unique=True)  # Hash of content being scanned
     mastodon_account_id = Column(Text, nullable=False)
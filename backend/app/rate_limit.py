@@ -1,44 +1,319 @@
+"""Redis token bucket shared by every worker that calls the Mastodon API with one token.
+
+Mastodon reports a fixed window per token: ``X-RateLimit-Limit`` requests,
+``X-RateLimit-Remaining`` of them left until ``X-RateLimit-Reset``. Each
+bucket (keyed by ``MastoClient._bucket_key``) mirrors that window in one Redis
+hash, seeded from the response headers. A Lua script atomically takes a permit
+and decrements the remaining budget, so concurrent workers never spend the same
+budget twice.
+
+Within a window, permits refill evenly over the time left until the reset
+(at most ``RATE_LIMIT_BURST`` at once), so workers are spread out instead of
+stalling together. A permit may be reserved ahead of time: the caller is told
+how long to wait before sending, and every waiter gets its own slot. Once
+the window's budget is spent, no permit is granted and the caller retries at
+the reset.
+
+Calls are tagged with a traffic class (``traffic_class()``): realtime webhook
+work, enforcement actions and backfill polling. Each class has a reserved
+minimum share of every window (``RATE_LIMIT_SHARE_*``). A class may borrow
+the rest, plus the shares of classes that have not asked for a permit within
+``CLASS_IDLE_AFTER`` seconds, but never the unused share of an active class.
+A backfill sweep therefore cannot starve realtime moderation, and leaves the
+budget to it only while there is realtime work.
+
+Inside ``nonblocking()`` (used by Celery tasks) any wait longer than
+``MAX_INLINE_WAIT`` raises ``RateLimited`` instead of sleeping, so the task can
+be rescheduled and the worker process stays free for other buckets.
+"""
+
+import logging
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
 
 import redis
 
 from app.config import get_settings
-from app.metrics import rate_limit_sleeps, redis_degraded
+from app.metrics import rate_limit_permits, rate_limit_sleeps, rate_limit_wait_seconds, redis_degraded
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 rcli = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+# Permits of each window never handed out, as headroom for requests made outside the bucket.
+RESERVE = 1
+# Longest sleep before asking again for a permit of a spent window.
+MAX_SLEEP = 60.0
+BUCKET_TTL = 3600
+# Longest wait slept through inside ``nonblocking()``; anything longer raises ``RateLimited``.
+MAX_INLINE_WAIT = 2.0
+
+REALTIME = "realtime"
+ENFORCEMENT = "enforcement"
+BACKFILL = "backfill"
+TRAFFIC_CLASSES = (REALTIME, ENFORCEMENT, BACKFILL)
+# A class that has not asked for a permit for this long lends its reserved share to the others.
+CLASS_IDLE_AFTER = 30.0
+
+# KEYS[1] bucket hash; ARGV: now, burst, window, reserve, ttl, class, idle, then class/share pairs.
+# Returns {granted (0/1), wait seconds as a string}: Lua numbers become integers in replies.
+_ACQUIRE = """
+local b = redis.call('HMGET', KEYS[1], 'limit', 'remaining', 'reset', 'tokens', 'ts')
+local limit, remaining, reset = tonumber(b[1]), tonumber(b[2]), tonumber(b[3])
+local now, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local window, reserve = tonumber(ARGV[3]), tonumber(ARGV[4])
+local cls, idle = ARGV[6], tonumber(ARGV[7])
+if remaining == nil or reset == nil then
+  return {1, '0'}
+end
+local tokens, ts = tonumber(b[4]) or burst, tonumber(b[5]) or now
+if now >= reset then
+  remaining = limit or remaining
+  reset = now + window
+  for i = 8, #ARGV, 2 do
+    redis.call('HDEL', KEYS[1], 'used:' .. ARGV[i])
+  end
+end
+-- Hold back the unused share of every other class that asked within the last idle seconds;
+-- shares of idle classes may be borrowed.
+local held, free_at = 0, reset
+for i = 8, #ARGV, 2 do
+  local other = ARGV[i]
+  if other ~= cls then
+    local seen = tonumber(redis.call('HGET', KEYS[1], 'seen:' .. other))
+    if seen and now - seen < idle then
+      local used = tonumber(redis.call('HGET', KEYS[1], 'used:' .. other)) or 0
+      local unused = math.floor(tonumber(ARGV[i + 1]) * (limit or remaining)) - used
+      if unused > 0 then
+        held = held + unused
+        free_at = math.min(free_at, seen + idle)
+      end
+    end
+  end
+end
+redis.call('HSET', KEYS[1], 'remaining', remaining, 'reset', reset, 'seen:' .. cls, now)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+if remaining - reserve < 1 then
+  return {0, tostring(reset - now)}
+end
+local spendable = remaining - reserve - held
+if spendable < 1 then
+  return {0, tostring(free_at - now)}
+end
+local rate = spendable / math.max(reset - now, 0.001)
+tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate) - 1
+redis.call('HSET', KEYS[1], 'remaining', remaining - 1, 'tokens', tokens, 'ts', now)
+redis.call('HINCRBY', KEYS[1], 'used:' .. cls, 1)
+if tokens >= 0 then
+  return {1, '0'}
+end
+return {1, tostring(-tokens / rate)}
+"""
+
+# KEYS[1] bucket hash; ARGV: limit, remaining, reset, ttl.
+# Keeps the lower remaining count while the window is unchanged, since permits
+# reserved here may not have reached the server yet. A new window starts every
+# class's usage over.
+_SEED = """
+local reset, remaining = tonumber(ARGV[3]), tonumber(ARGV[2])
+local b = redis.call('HMGET', KEYS[1], 'remaining', 'reset')
+if tonumber(b[1]) and tonumber(b[2]) and math.abs(tonumber(b[2]) - reset) < 1 then
+  remaining = math.min(remaining, tonumber(b[1]))
+else
+  for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    if string.sub(field, 1, 5) == 'used:' then
+      redis.call('HDEL', KEYS[1], field)
+    end
+  end
+end
+redis.call('HSET', KEYS[1], 'limit', ARGV[1], 'remaining', remaining, 'reset', reset)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return remaining
+"""
+
+# KEYS[1] bucket hash; ARGV: class. Hands back a reserved permit that will not be used.
+_RELEASE = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  redis.call('HINCRBYFLOAT', KEYS[1], 'remaining', 1)
+  redis.call('HINCRBYFLOAT', KEYS[1], 'tokens', 1)
+  if tonumber(redis.call('HGET', KEYS[1], 'used:' .. ARGV[1]) or 0) > 0 then
+    redis.call('HINCRBY', KEYS[1], 'used:' .. ARGV[1], -1)
+  end
+end
+return 0
+"""
+
+_acquire_script = rcli.register_script(_ACQUIRE)
+_seed_script = rcli.register_script(_SEED)
+_release_script = rcli.register_script(_RELEASE)
+
+_nonblocking: ContextVar[bool] = ContextVar("rate_limit_nonblocking", default=False)
+# Calls made outside any traffic_class() block (e.g. from the API) count as realtime.
+_traffic_class: ContextVar[str] = ContextVar("rate_limit_traffic_class", default=REALTIME)
+
+
+@dataclass(frozen=True)
+class Permit:
+    """Outcome of one attempt to take a permit.
+
+    A granted permit may be used after ``wait`` seconds. When not granted, the
+    window's budget is spent and the caller should try again after ``wait``.
+    """
+
+    granted: bool
+    wait: float
+
+
+class RateLimited(Exception):
+    """Raised inside ``nonblocking()`` instead of sleeping for ``retry_after`` seconds.
+
+    A task stopped after it already changed something records that under
+    ``resume``: keyword arguments its deferred run is sent with, so the run
+    does not repeat it.
+    """
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Rate limited on {key}; retry after {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+        self.resume: dict = {}
+
+
+def _bucket(key: str) -> str:
+    return f"rl:{key}"
+
 
-def _keys(key):
-    return f"rl:{key}:limit", f"rl:{key}:remaining", f"rl:{key}:reset"
+def _parse_reset(value: str) -> float | None:
+    """Parse ``X-RateLimit-Reset``: ISO 8601 from Mastodon, epoch seconds from some proxies."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        logger.debug(f"Unparseable X-RateLimit-Reset header: {value!r}")
+        return None
 
 
 def update_from_headers(key, headers):
+    """Seed the bucket of ``key`` from the rate-limit headers of a response."""
     lim = headers.get("X-RateLimit-Limit")
     rem = headers.get("X-RateLimit-Remaining")
     rst = headers.get("X-RateLimit-Reset")
-    if lim and rem and rst:
-        k1, k2, k3 = _keys(key)
-        pipe = rcli.pipeline()
-        pipe.setex(k1, 3600, lim)
-        pipe.setex(k2, 3600, rem)
-        pipe.setex(k3, 3600, rst)
-        pipe.execute()
+    if not (lim and rem and rst):
+        return
+    reset = _parse_reset(rst)
+    if reset is None or not (lim.isdigit() and rem.isdigit()):
+        return
+    try:
+        _seed_script(keys=[_bucket(key)], args=[int(lim), int(rem), reset, BUCKET_TTL])
+    except redis.RedisError:
+        redis_degraded.inc()
+
+
+def _shares() -> list:
+    return [
+        REALTIME,
+        settings.RATE_LIMIT_SHARE_REALTIME,
+        ENFORCEMENT,
+        settings.RATE_LIMIT_SHARE_ENFORCEMENT,
+        BACKFILL,
+        settings.RATE_LIMIT_SHARE_BACKFILL,
+    ]
+
+
+@contextmanager
+def traffic_class(name: str) -> Iterator[None]:
+    """Charge the API calls made inside the block to the traffic class ``name``.
+
+    Like ``nonblocking()``, this does not carry over into executor threads
+    started inside the block.
+    """
+    if name not in TRAFFIC_CLASSES:
+        raise ValueError(f"Unknown traffic class {name!r}; expected one of {TRAFFIC_CLASSES}")
+    token = _traffic_class.set(name)
+    try:
+        yield
+    finally:
+        _traffic_class.reset(token)
+
+
+def acquire(key: str) -> Permit:
+    """Atomically take a permit of the current traffic class from the bucket of ``key``.
+
+    Unseeded buckets grant immediately; the first response seeds them.
+    """
+    granted, wait = _acquire_script(
+        keys=[_bucket(key)],
+        args=[
+            time.time(),
+            settings.RATE_LIMIT_BURST,
+            settings.RATE_LIMIT_WINDOW,
+            RESERVE,
+            BUCKET_TTL,
+            _traffic_class.get(),
+            CLASS_IDLE_AFTER,
+            *_shares(),
+        ],
+    )
+    return Permit(granted=bool(int(granted)), wait=max(0.0, float(wait)))
+
+
+def release(key: str) -> None:
+    """Return a granted but unused permit of the current traffic class to the bucket of ``key``."""
+    try:
+        _release_script(keys=[_bucket(key)], args=[_traffic_class.get()])
+    except redis.RedisError:
+        redis_degraded.inc()
+
+
+@contextmanager
+def nonblocking() -> Iterator[None]:
+    """Raise ``RateLimited`` from ``throttle_if_needed`` instead of sleeping through long waits.
+
+    The flag lives in a context variable: it covers the current thread (and
+    ``asyncio.to_thread`` calls), not threads of an executor started inside.
+    """
+    token = _nonblocking.set(True)
+    try:
+        yield
+    finally:
+        _nonblocking.reset(token)
 
 
 def throttle_if_needed(key):
-    """If Redis is missing, fail-open slowly at ~1 rps per worker."""
+    """Block until a permit for ``key`` is granted and its slot has come.
+
+    Inside ``nonblocking()``, raise ``RateLimited`` when that is more than
+    ``MAX_INLINE_WAIT`` away. If Redis is missing, fail-open slowly at ~1 rps
+    per worker.
+    """
+    cls = _traffic_class.get()
+    waited = 0.0
     try:
-        k1, k2, k3 = _keys(key)
-        rem = rcli.get(k2)
-        rst = rcli.get(k3)
-        now = int(time.time())
-        if rem is not None and rst is not None:
-            if int(rem) <= 1 and now < int(rst):
-                sleep_for = max(0, int(rst) - now) + 1
-                time.sleep(min(sleep_for, 60))
+        while True:
+            permit = acquire(key)
+            if permit.wait > MAX_INLINE_WAIT and _nonblocking.get():
+                if permit.granted:
+                    release(key)
+                rate_limit_wait_seconds.labels(traffic_class=cls).observe(waited)
+                raise RateLimited(key, permit.wait)
+            if permit.wait > 0:
                 rate_limit_sleeps.inc()
+                pause = permit.wait if permit.granted else min(permit.wait, MAX_SLEEP)
+                time.sleep(pause)
+                waited += pause
+            if permit.granted:
+                rate_limit_permits.labels(traffic_class=cls).inc()
+                rate_limit_wait_seconds.labels(traffic_class=cls).observe(waited)
                 return
+    except RateLimited:
+        raise
     except Exception:
         redis_degraded.inc()
         time.sleep(1.0)
@@ -9,13 +9,17 @@ from app.config import get_settings
 from app.db import SessionLocal
 from app.mastodon_client import MastoClient
 from app.models import Account, ContentScan, DomainAlert, ScanSession
+from app.services.detectors.behavioral_detector import BehavioralDetector
 from app.services.rule_service import rule_service
-from sqlalchemy import and_, desc, func
+from sqlalchemy import and_, desc, func, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Most pages of statuses fetched to catch up with an account since its last scan.
+MAX_CATCH_UP_PAGES = 5
+
 
 @dataclass
 class ScanProgress:
@@ -30,6 +34,62 @@ class ScanProgress:
     estimated_completion: datetime | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ScanPlan:
+    """How to scan one account: in full, or only its statuses newer than ``since_id``.
+
+    An incremental plan carries the cached result of the last scan, which the
+    hits of the new statuses are merged into.
+    """
+
+    content_hash: str
+    cached_result: dict | None = None
+    since_id: str | None = None
+
+    @property
+    def incremental(self) -> bool:
+        """Whether only statuses newer than ``since_id`` need evaluating."""
+        return self.cached_result is not None and self.since_id is not None
+
+
+def _newest_status_id(statuses: list[dict]) -> str | None:
+    """Return the highest status id; Mastodon ids are numeric strings that grow over time."""
+    ids = [str(s["id"]) for s in statuses if s.get("id")]
+    return max(ids, key=lambda i: (len(i), i), default=None)
+
+
+def _hit_status_ids(hit: dict) -> tuple[str, ...]:
+    evidence = hit.get("evidence") or {}
+    ids = evidence.get("matched_status_ids") if isinstance(evidence, dict) else evidence.matched_status_ids
+    return tuple(ids or ())
+
+
+def _unseen_hits(cached: dict, new: dict) -> list[dict]:
+    """Return the hits of ``new`` that the cached scan result does not already hold."""
+    seen = {(h["rule"], _hit_status_ids(h)) for h in cached.get("rule_hits", [])}
+    return [h for h in new["rule_hits"] if (h["rule"], _hit_status_ids(h)) not in seen]
+
+
+def _merge_scan_results(cached: dict, new: dict) -> dict:
+    """Merge the scan result of newly fetched statuses into a cached scan result.
+
+    Hits on statuses accumulate, deduplicated by rule and status ids. Hits
+    without status ids (profile matches, behavioral metrics) are replaced by
+    the newest evaluation of the same rule.
+    """
+    renewed = {h["rule"] for h in new["rule_hits"] if not _hit_status_ids(h)}
+    rule_hits = [h for h in cached.get("rule_hits", []) if _hit_status_ids(h) or h["rule"] not in renewed]
+    seen = {(h["rule"], _hit_status_ids(h)) for h in rule_hits}
+    rule_hits += [h for h in new["rule_hits"] if (h["rule"], _hit_status_ids(h)) not in seen]
+    return {
+        **new,
+        "score": sum(h["weight"] for h in rule_hits),
+        "hits": len(rule_hits),
+        "rule_hits": rule_hits,
+        "status_count": cached.get("status_count", 0) + new["status_count"],
+    }
+
+
 class EnhancedScanningSystem:
     """Enhanced scanning system with improved efficiency and federated tracking"""
 
@@ -91,54 +151,118 @@ class EnhancedScanningSystem:
                 started_at=scan_session.started_at,
             )
 
-    def should_scan_account(self, account_id: str, account_data: dict) -> bool:
-        """Determine if an account needs scanning based on content changes"""
-        content_hash = self._calculate_content_hash(account_data)
-
+    def should_scan_account(self, account_id: str, account_data: dict, content_hash: str | None = None) -> bool:
+        """Determine if an account needs a full scan based on content changes"""
+        content_hash = content_hash or self._calculate_content_hash(account_data)
+        if account_id in self._fresh_scans({account_id: content_hash}):
+            logger.debug(f"Skipping scan for {account_id} - content unchanged")
+            return False
+        return True
+
+    def accounts_needing_scan(self, accounts: list[dict]) -> dict[str, ScanPlan]:
+        """Plan the scans of a page of accounts.
+
+        Accounts whose profile or the ruleset changed, or whose last full scan
+        is older than a day, get a full scan. The others get an incremental
+        scan of the statuses posted since the newest one seen, merged into the
+        cached result. Each account is hashed once and all fresh ``ContentScan``
+        rows for the page are fetched with a single ``IN`` query.
+
+        Args:
+            accounts: Mastodon account dicts
+
+        Returns:
+            Scan plan by account id for every account that needs scanning
+
+        """
+        hashes = {a["id"]: self._calculate_content_hash(a) for a in accounts if a.get("id")}
+        fresh = self._fresh_scans(hashes)
+
+        plans = {}
+        for account_id, content_hash in hashes.items():
+            if account_id not in fresh:
+                plans[account_id] = ScanPlan(content_hash)
+                continue
+            cached_result, since_id = fresh[account_id]
+            if cached_result is None or since_id is None:
+                logger.debug(f"Skipping scan for {account_id} - content unchanged")
+                continue
+            plans[account_id] = ScanPlan(content_hash, cached_result=cached_result, since_id=since_id)
+        return plans
+
+    def _fresh_scans(self, hashes: dict[str, str]) -> dict[str, tuple[dict | None, str | None]]:
+        """Return cached result and last seen status id of each account fully scanned in the last day."""
+        if not hashes:
+            return {}
+        _, _, ruleset_sha = self.rule_service.get_active_rules()
         with SessionLocal() as session:
-            _, _, ruleset_sha = self.rule_service.get_active_rules()
-            recent_scan = (
-                session.query(ContentScan)
+            rows = (
+                session.query(
+                    ContentScan.mastodon_account_id,
+                    ContentScan.content_hash,
+                    ContentScan.scan_result,
+                    Account.last_status_seen_id,
+                )
+                .outerjoin(Account, Account.mastodon_account_id == ContentScan.mastodon_account_id)
                 .filter(
                     and_(
-                        ContentScan.mastodon_account_id == account_id,
-                        ContentScan.content_hash == content_hash,
+                        ContentScan.mastodon_account_id.in_(list(hashes)),
+                        ContentScan.content_hash.in_(set(hashes.values())),
                         ContentScan.last_scanned_at > datetime.utcnow() - timedelta(hours=24),
                         ContentScan.rules_version == ruleset_sha,
+                        ContentScan.needs_rescan.is_(False),
                     )
                 )
-                .first()
+                .all()
             )
 
-            if recent_scan and not recent_scan.needs_rescan:
-                logger.debug(f"Skipping scan for {account_id} - content unchanged")
-                return False
-
-            return True
+        return {
+            account_id: (scan_result, last_status_seen_id)
+            for account_id, content_hash, scan_result, last_status_seen_id in rows
+            if hashes.get(account_id) == content_hash
+        }
 
-    def scan_account_efficiently(self, account_data: dict, session_id: int) -> dict | None:
-        """Efficiently scan an account with deduplication and caching"""
+    def scan_account_efficiently(
+        self,
+        account_data: dict,
+        session_id: int,
+        account_pk: int | None = None,
+        plan: ScanPlan | None = None,
+    ) -> dict | None:
+        """Efficiently scan an account with deduplication and caching.
+
+        ``account_pk`` is the ``accounts.id`` returned by the page upsert, used to
+        update the row by primary key. Passing the ``plan`` returned by
+        ``accounts_needing_scan`` skips the per-account freshness check; an
+        incremental plan fetches and evaluates only statuses newer than its
+        ``since_id`` and returns None when there are none.
+
+        An incremental scan stores the merged result in ``content_scans`` but
+        returns only the hits the cached result did not have, with the merged
+        score, so callers never analyze the same hit twice. When automation or
+        link spam rules are active, the latest statuses are evaluated in full
+        whenever there are new ones, since those rules judge them together.
+        """
         account_id = account_data.get("id")
         if not account_id:
             return None
 
-        if not self.should_scan_account(account_id, account_data):
-            return None
-
-        content_hash = self._calculate_content_hash(account_data)
+        if plan is None:
+            content_hash = self._calculate_content_hash(account_data)
+            if not self.should_scan_account(account_id, account_data, content_hash):
+                return None
+            plan = ScanPlan(content_hash)
+        content_hash = plan.content_hash
 
         try:
             admin_client = MastoClient(self.settings.ADMIN_TOKEN)
-            statuses = admin_client.get_account_statuses(
-                account_id=account_id, limit=self.settings.MAX_STATUSES_TO_FETCH
-            )
-            media_statuses = admin_client.get_account_statuses(
-                account_id=account_id,
-                limit=self.settings.MAX_STATUSES_TO_FETCH,
-                only_media=True,
-            )
-            seen = {s["id"] for s in statuses if "id" in s}
-            statuses.extend([s for s in media_statuses if ("id" not in s) or (s["id"] not in seen)])
+            statuses = self._fetch_statuses(admin_client, account_id, since_id=plan.since_id)
+            if plan.incremental and not statuses:
+                logger.debug(f"No new statuses for {account_id} since {plan.since_id}")
+                return None
+            new_status_count = len(statuses)
+            if plan.incremental and self._uses_status_window():
+                statuses = self._fetch_statuses(admin_client, account_id)
 
             violations = self.rule_service.evaluate_account(account_data, statuses)
             score = sum(v.score for v in violations)
@@ -149,56 +273,124 @@ class EnhancedScanningSystem:
                 "hits": len(hits),
                 "rule_hits": [{"rule": h[0], "weight": h[1], "evidence": h[2]} for h in hits],
                 "scanned_at": datetime.utcnow().isoformat(),
-                "status_count": len(statuses),
+                "status_count": new_status_count,
             }
+            if plan.incremental:
+                unseen_hits = _unseen_hits(plan.cached_result, scan_result)
+                scan_result = _merge_scan_results(plan.cached_result, scan_result)
+                score = scan_result["score"]
 
             _, config, ruleset_sha = self.rule_service.get_active_rules()
 
             with SessionLocal() as db_session:
-                stmt = pg_insert(ContentScan).values(
-                    content_hash=content_hash,
-                    mastodon_account_id=account_id,
-                    scan_type="account",
-                    scan_result=scan_result,
-                    rules_version=ruleset_sha,
-                    needs_rescan=False,
-                    last_scanned_at=func.now(),
-                )
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["content_hash"],
-                    set_=dict(
-                        scan_result=stmt.excluded.scan_result,
-                        rules_version=stmt.excluded.rules_version,
-                        last_scanned_at=func.now(),
+                if plan.incremental:
+                    # last_scanned_at stays at the last full scan, so cached hits still expire after a day.
+                    db_session.execute(
+                        update(ContentScan)
+                        .where(ContentScan.content_hash == content_hash)
+                        .values(scan_result=scan_result)
+                    )
+                else:
+                    stmt = pg_insert(ContentScan).values(
+                        content_hash=content_hash,
+                        mastodon_account_id=account_id,
+                        scan_type="account",
+                        scan_result=scan_result,
+                        rules_version=ruleset_sha,
                         needs_rescan=False,
-                    ),
-                )
-                db_session.execute(stmt)
+                        last_scanned_at=func.now(),
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["content_hash"],
+                        set_=dict(
+                            scan_result=stmt.excluded.scan_result,
+                            rules_version=stmt.excluded.rules_version,
+                            last_scanned_at=func.now(),
+                            needs_rescan=False,
+                        ),
+                    )
+                    db_session.execute(stmt)
 
-                scan_session = db_session.query(ScanSession).filter(ScanSession.id == session_id).first()
-                if scan_session:
-                    scan_session.accounts_processed += 1
-                    scan_session.last_account_id = account_id
+                # Accounts of one page are scanned concurrently, so increment in SQL.
+                db_session.execute(
+                    update(ScanSession)
+                    .where(ScanSession.id == session_id)
+                    .values(accounts_processed=ScanSession.accounts_processed + 1, last_account_id=account_id)
+                )
 
-                account_record = db_session.query(Account).filter(Account.mastodon_account_id == account_id).first()
-                if account_record:
-                    account_record.content_hash = content_hash
-                    account_record.last_full_scan_at = datetime.utcnow()
+                account_values = {}
+                if not plan.incremental:
+                    account_values.update(content_hash=content_hash, last_full_scan_at=datetime.utcnow())
+                newest_id = _newest_status_id(statuses)
+                if newest_id:
+                    account_values["last_status_seen_id"] = newest_id
+                if account_values:
+                    account_row = Account.id == account_pk if account_pk else Account.mastodon_account_id == account_id
+                    db_session.execute(update(Account).where(account_row).values(**account_values))
 
                 db_session.commit()
 
             threshold = float(config.get("report_threshold", 1.0))
-            if score >= threshold:
+            previous_score = plan.cached_result.get("score", 0) if plan.incremental else 0
+            if score >= threshold > previous_score:
                 domain = self._extract_domain(account_data)
                 if domain and domain != "local":
                     self._track_domain_violation(domain)
 
+            if plan.incremental:
+                return {**scan_result, "hits": len(unseen_hits), "rule_hits": unseen_hits}
             return scan_result
 
         except Exception as e:
             logger.error(f"Error scanning account {account_id}: {e}")
             return None
 
+    def _uses_status_window(self) -> bool:
+        """Whether an active rule judges an account's latest statuses together, not one by one."""
+        rules, _, _ = self.rule_service.get_active_rules()
+        return any(
+            rule.detector_type == "behavioral"
+            and (rule.pattern or "").lower().strip() in BehavioralDetector.WINDOWED_BEHAVIORS
+            for rule in rules
+        )
+
+    def _fetch_statuses(self, admin_client: MastoClient, account_id: str, since_id: str | None = None) -> list[dict]:
+        """Fetch the recent statuses of an account, plus older media statuses only when they can matter.
+
+        With ``since_id`` only newer statuses are fetched, paging back with
+        ``max_id`` while pages come back full, up to ``MAX_CATCH_UP_PAGES``, so
+        that statuses older than the newest page are not skipped. The ``only_media``
+        request is skipped when no media rule is enabled, when the first page
+        already holds the whole timeline, or when it already holds as many
+        media statuses as the second request could return.
+        """
+        limit = self.settings.MAX_STATUSES_TO_FETCH
+        newer = {"since_id": since_id} if since_id else {}
+        statuses = admin_client.get_account_statuses(account_id=account_id, limit=limit, **newer)
+        if since_id:
+            page = statuses
+            for _ in range(MAX_CATCH_UP_PAGES - 1):
+                if len(page) < limit or not page[-1].get("id"):
+                    break
+                page = admin_client.get_account_statuses(
+                    account_id=account_id, limit=limit, since_id=since_id, max_id=page[-1]["id"]
+                )
+                statuses.extend(page)
+            if len(page) < limit:
+                # Every status since since_id is in hand; the only_media request could not add any.
+                return statuses
+
+        rules, _, _ = self.rule_service.get_active_rules()
+        if not any(rule.detector_type == "media" for rule in rules):
+            return statuses
+        if len(statuses) < limit or sum(1 for s in statuses if s.get("media_attachments")) >= limit:
+            return statuses
+
+        media_statuses = admin_client.get_account_statuses(account_id=account_id, limit=limit, only_media=True, **newer)
+        seen = {s["id"] for s in statuses if "id" in s}
+        statuses.extend([s for s in media_statuses if ("id" not in s) or (s["id"] not in seen)])
+        return statuses
+
     def get_next_accounts_to_scan(
         self, session_type: str, limit: int = 50, cursor: str | None = None
     ) -> tuple[list[dict], str | None]:
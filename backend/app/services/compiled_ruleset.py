@@ -0,0 +1,105 @@
+"""Pre-compiled rule matchers keyed by ruleset version."""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.models import Rule
+from app.services.detectors.base import BaseDetector
+from app.services.detectors.prepared import PreparedAccount
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Detector matchers for one rule's primary and secondary patterns."""
+
+    rule_id: int
+    detector_type: str
+    primary: Any
+    secondary: Any | None = None
+
+
+@dataclass
+class CompiledRuleset:
+    """Matchers for every enabled rule, valid for exactly one ``ruleset_sha256``.
+
+    The ruleset hash covers every field a matcher is derived from (id, detector
+    type, patterns and boolean operator), so matchers are looked up by rule id
+    and paired with the freshest ``Rule`` rows for names, weights and actions.
+    Detectors that support it also get a shared index over all their matchers,
+    which lets them answer every rule in one pass per account.
+    """
+
+    ruleset_sha256: str
+    rules: dict[int, CompiledRule] = field(default_factory=dict)
+    indexes: dict[str, Any] = field(default_factory=dict)
+    compiled_at: datetime = field(default_factory=datetime.utcnow)
+
+    def get(self, rule: Rule) -> CompiledRule | None:
+        """Return the compiled matchers for a rule, if it compiled successfully."""
+        return self.rules.get(rule.id)
+
+    def scan(
+        self,
+        detectors: dict[str, BaseDetector],
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        prepared: PreparedAccount | None = None,
+    ) -> dict[str, Any]:
+        """Run every detector index over one account, returning scan results by detector type."""
+        return self.scan_many(detectors, [(account_data, statuses, prepared)])[0]
+
+    def scan_many(
+        self,
+        detectors: dict[str, BaseDetector],
+        accounts: list[tuple[dict[str, Any], list[dict[str, Any]], PreparedAccount | None]],
+    ) -> list[dict[str, Any]]:
+        """Run every detector index over a page of accounts, returning scan results by detector type per account."""
+        results: list[dict[str, Any]] = [{} for _ in accounts]
+        for detector_type, index in self.indexes.items():
+            for result, scan in zip(results, detectors[detector_type].scan_many(index, accounts), strict=True):
+                result[detector_type] = scan
+        return results
+
+
+def compile_ruleset(rules: list[Rule], ruleset_sha256: str, detectors: dict[str, BaseDetector]) -> CompiledRuleset:
+    """Build matchers for all rules using their detectors.
+
+    Rules with an unknown detector type are left out. Rules whose pattern fails
+    to compile are logged and left out instead of failing every evaluation.
+    """
+    compiled = CompiledRuleset(ruleset_sha256=ruleset_sha256)
+    for rule in rules:
+        detector = detectors.get(rule.detector_type)
+        if not detector:
+            continue
+        try:
+            primary = detector.compile(rule.pattern)
+            secondary = None
+            if rule.boolean_operator and rule.secondary_pattern:
+                secondary = detector.compile(rule.secondary_pattern)
+        except re.error as e:
+            logger.warning(f"Skipping rule {rule.name} ({rule.id}): invalid pattern: {e}")
+            continue
+        compiled.rules[rule.id] = CompiledRule(
+            rule_id=rule.id, detector_type=rule.detector_type, primary=primary, secondary=secondary
+        )
+
+    for detector_type, detector in detectors.items():
+        matchers = [
+            matcher
+            for entry in compiled.rules.values()
+            if entry.detector_type == detector_type
+            for matcher in (entry.primary, entry.secondary)
+            if matcher is not None
+        ]
+        index = detector.build_index(matchers)
+        if index is not None:
+            compiled.indexes[detector_type] = index
+
+    logger.debug(f"Compiled {len(compiled.rules)}/{len(rules)} rules, SHA: {ruleset_sha256[:8]}")
+    return compiled
@@ -1,5 +1,6 @@
 """Database-backed configuration helpers."""
 
+from collections.abc import Iterable
 from typing import Any
 
 from app.db import SessionLocal
@@ -15,9 +16,13 @@ class ConfigService:
             row = session.get(Config, key)
             return row.value if row else None
 
-    def set_flag(
-        self, key: str, enabled: bool, updated_by: str | None = None
-    ) -> dict[str, bool]:
+    def get_configs(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Return the values of the given keys that are set, in one query."""
+        with SessionLocal() as session:
+            rows = session.query(Config).filter(Config.key.in_(list(keys))).all()
+            return {row.key: row.value for row in rows}
+
+    def set_flag(self, key: str, enabled: bool, updated_by: str | None = None) -> dict[str, bool]:
         """Store boolean flag in configuration."""
         with SessionLocal() as session:
             config = session.get(Config, key)
@@ -25,15 +30,11 @@ class ConfigService:
                 config.value = {"enabled": enabled}
                 config.updated_by = updated_by
             else:
-                session.add(
-                    Config(key=key, value={"enabled": enabled}, updated_by=updated_by)
-                )
+                session.add(Config(key=key, value={"enabled": enabled}, updated_by=updated_by))
             session.commit()
             return {"enabled": enabled}
 
-    def set_threshold(
-        self, key: str, threshold: float, updated_by: str | None = None
-    ) -> dict[str, float]:
+    def set_threshold(self, key: str, threshold: float, updated_by: str | None = None) -> dict[str, float]:
         """Store numeric threshold in configuration."""
         with SessionLocal() as session:
             config = session.get(Config, key)
@@ -41,11 +42,7 @@ class ConfigService:
                 config.value = {"threshold": threshold}
                 config.updated_by = updated_by
             else:
-                session.add(
-                    Config(
-                        key=key, value={"threshold": threshold}, updated_by=updated_by
-                    )
-                )
+                session.add(Config(key=key, value={"threshold": threshold}, updated_by=updated_by))
             session.commit()
             return {"threshold": threshold}
 
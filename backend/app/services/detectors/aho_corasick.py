@@ -0,0 +1,63 @@
+"""Aho-Corasick multi-pattern substring matcher."""
+
+from collections import deque
+from collections.abc import Hashable, Iterable
+
+
+class AhoCorasick:
+    """Find every needle contained in a text with a single left-to-right pass.
+
+    Needles are added with an opaque payload; ``search`` returns the payloads of
+    all needles that occur anywhere in the text, including overlapping ones. The
+    automaton is compiled to a full transition table so scanning is one dict
+    lookup per character. An empty needle matches every text, like ``"" in s``.
+    """
+
+    def __init__(self, needles: Iterable[tuple[str, Hashable]]):
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[Hashable]] = [[]]
+        self._always: list[Hashable] = []
+
+        for needle, payload in needles:
+            if not needle:
+                self._always.append(payload)
+                continue
+            state = 0
+            for ch in needle:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(payload)
+
+        # Breadth-first pass: resolve failure links into a complete transition
+        # table and merge each state's output with that of its failure state.
+        delta: list[dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def search(self, text: str) -> set[Hashable]:
+        """Return the payloads of all needles found in ``text``."""
+        found: set[Hashable] = set(self._always)
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
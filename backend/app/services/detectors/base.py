@@ -1,22 +1,117 @@
 """Base detector class for content analysis."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
 
 from app.models import Rule
 from app.schemas import Violation
+from app.services.detectors.prepared import PreparedAccount, prepare_account
+
+
+@dataclass
+class TextScan:
+    """Hits per matcher for the username, display name and each status of one account."""
+
+    username: dict[Any, Any] = field(default_factory=dict)
+    display_name: dict[Any, Any] = field(default_factory=dict)
+    statuses: list[dict[Any, Any]] = field(default_factory=list)
 
 
 class BaseDetector(ABC):
     """Abstract base class for content detectors."""
 
+    @staticmethod
+    def prepare(account_data: dict, statuses: list[dict], prepared: PreparedAccount | None = None) -> PreparedAccount:
+        """Return ``prepared`` if the caller already normalized the account, else normalize it now."""
+        return prepared if prepared is not None else prepare_account(account_data, statuses)
+
+    def compile(self, pattern: str) -> Any:
+        """Pre-process a rule pattern into a reusable matcher.
+
+        Detectors override this to move pattern parsing out of the per-account
+        evaluation path. The result is passed back to ``evaluate`` as ``matcher``.
+
+        Args:
+            pattern: Raw pattern string from the rule
+
+        Returns:
+            Detector-specific matcher object
+
+        """
+        return pattern
+
+    def build_index(self, matchers: list[Any]) -> Any:
+        """Combine all compiled matchers of this detector into a shared index.
+
+        Detectors that can answer every rule in one pass over the account text
+        return an index here; the default of ``None`` means rules are evaluated
+        one by one.
+
+        Args:
+            matchers: Every matcher returned by ``compile`` for the active ruleset
+
+        Returns:
+            Detector-specific index, or None
+
+        """
+        return None
+
+    def scan(
+        self, index: Any, account_data: dict, statuses: list[dict], prepared: PreparedAccount | None = None
+    ) -> Any:
+        """Run one pass over an account with the index from ``build_index``.
+
+        The result is passed to ``evaluate`` as ``scan`` for every rule of this
+        detector during the same account evaluation.
+
+        Args:
+            index: Index returned by ``build_index``
+            account_data: Dictionary containing account information
+            statuses: List of status dictionaries
+            prepared: Normalized account text; built from the other arguments when omitted
+
+        Returns:
+            Detector-specific scan result, or None
+
+        """
+        return None
+
+    def scan_many(self, index: Any, accounts: list[tuple[dict, list[dict], PreparedAccount | None]]) -> list[Any]:
+        """Run ``scan`` for a page of accounts.
+
+        Detectors whose scans hit the database override this to batch the page
+        into a single query.
+
+        Args:
+            index: Index returned by ``build_index``
+            accounts: (account_data, statuses, prepared) for each account
+
+        Returns:
+            One scan result per account, in order
+
+        """
+        return [self.scan(index, a, s, prepared=p) for a, s, p in accounts]
+
     @abstractmethod
-    def evaluate(self, rule: Rule, account_data: dict, statuses: list[dict]) -> list[Violation]:
+    def evaluate(
+        self,
+        rule: Rule,
+        account_data: dict,
+        statuses: list[dict],
+        matcher: Any = None,
+        scan: Any = None,
+        prepared: PreparedAccount | None = None,
+    ) -> list[Violation]:
         """Evaluate account and statuses against a rule.
 
         Args:
             rule: The rule to evaluate against
             account_data: Dictionary containing account information
             statuses: List of status dictionaries
+            matcher: Pre-compiled matcher from ``compile``; built from ``rule.pattern`` when omitted
+            scan: Result of ``scan`` for this account, when the detector built an index
+            prepared: Normalized account text shared by all detectors; built when omitted
 
         Returns:
             List of violations found
@@ -1,16 +1,27 @@
 """Behavioral detector for account behavior analysis."""
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-import re
-from urllib.parse import urlparse
 from typing import Any
 
-from sqlalchemy.orm import Session
-
 from app.db import engine
 from app.models import AccountBehaviorMetrics, InteractionHistory, Rule
 from app.schemas import Evidence, Violation
 from app.services.detectors.base import BaseDetector
+from app.services.detectors.prepared import PreparedAccount, PreparedStatus
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class BehaviorCounts:
+    """Interaction counts for one account, shared by every behavioral rule."""
+
+    posts_last_1h: int = 0
+    posts_last_24h: int = 0
+    unique_targets: int = 0
+    recent_interactions_count: int = 0
 
 
 class BehavioralDetector(BaseDetector):
@@ -18,151 +29,213 @@ class BehavioralDetector(BaseDetector):
 
     AUTOMATION_WINDOW = 20
     LINK_SPAM_WINDOW = 20
+    RECENT_INTERACTIONS = 100
+    # Behaviors judged over an account's latest statuses together rather than status by status.
+    WINDOWED_BEHAVIORS = frozenset({"automation_disclosure", "link_spam"})
+
+    def compile(self, pattern: str) -> str:
+        """Normalize the behavior name stored in the rule pattern."""
+        return pattern.lower().strip()
+
+    def build_index(self, matchers: list[str]) -> frozenset[str] | None:
+        """Return the behavior types in use so their counts are loaded once per account."""
+        return frozenset(matchers) if matchers else None
+
+    def scan(
+        self,
+        index: frozenset[str],
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        prepared: PreparedAccount | None = None,
+    ) -> BehaviorCounts | None:
+        """Load the interaction counts of one account for every behavioral rule."""
+        return self.scan_many(index, [(account_data, statuses, prepared)])[0]
+
+    def scan_many(
+        self,
+        index: frozenset[str],
+        accounts: list[tuple[dict[str, Any], list[dict[str, Any]], PreparedAccount | None]],
+    ) -> list[BehaviorCounts | None]:
+        """Load interaction counts for a page of accounts with one query and one metrics upsert.
+
+        The upsert runs even when only status-based behaviors are in use, so
+        AccountBehaviorMetrics is refreshed on every behavioral evaluation.
+        """
+        account_ids = [a.get("mastodon_account_id") for a, _, _ in accounts]
+        counts = self.collect([i for i in account_ids if i])
+        return [counts.get(i) if i else None for i in account_ids]
+
+    def collect(self, account_ids: list[str]) -> dict[str, BehaviorCounts]:
+        """Compute windowed counts for the given accounts and record them in AccountBehaviorMetrics.
+
+        Args:
+            account_ids: Mastodon account ids to load
+
+        Returns:
+            Counts by account id; accounts without interactions get zero counts
 
-    def evaluate(self, rule: Rule, account_data: dict[str, Any], statuses: list[dict[str, Any]]) -> list[Violation]:
+        """
+        account_ids = list(dict.fromkeys(account_ids))
+        if not account_ids:
+            return {}
+        with Session(engine) as session:
+            counts = self._load_counts(session, account_ids)
+            self._record_metrics(session, counts)
+            session.commit()
+        return counts
+
+    def _load_counts(self, session: Session, account_ids: list[str]) -> dict[str, BehaviorCounts]:
+        now = datetime.utcnow()
+        one_hour_ago = now - timedelta(hours=1)
+        twenty_four_hours_ago = now - timedelta(hours=24)
+        ranked = (
+            select(
+                InteractionHistory.source_account_id,
+                InteractionHistory.target_account_id,
+                InteractionHistory.created_at,
+                func.row_number()
+                .over(
+                    partition_by=InteractionHistory.source_account_id,
+                    order_by=InteractionHistory.created_at.desc(),
+                )
+                .label("recency"),
+            )
+            .where(InteractionHistory.source_account_id.in_(account_ids))
+            .subquery()
+        )
+        recent = ranked.c.recency <= self.RECENT_INTERACTIONS
+        stmt = select(
+            ranked.c.source_account_id,
+            func.count(case((ranked.c.created_at >= one_hour_ago, 1))),
+            func.count(case((ranked.c.created_at >= twenty_four_hours_ago, 1))),
+            func.count(distinct(case((recent, ranked.c.target_account_id)))),
+            func.count(case((recent, 1))),
+        ).group_by(ranked.c.source_account_id)
+
+        counts = dict.fromkeys(account_ids, BehaviorCounts())
+        for account_id, last_1h, last_24h, unique_targets, recent_count in session.execute(stmt):
+            counts[account_id] = BehaviorCounts(
+                posts_last_1h=last_1h,
+                posts_last_24h=last_24h,
+                unique_targets=unique_targets,
+                recent_interactions_count=recent_count,
+            )
+        return counts
+
+    @staticmethod
+    def _record_metrics(session: Session, counts: dict[str, BehaviorCounts]) -> None:
+        stmt = pg_insert(AccountBehaviorMetrics).values(
+            [
+                {
+                    "mastodon_account_id": account_id,
+                    "posts_last_1h": c.posts_last_1h,
+                    "posts_last_24h": c.posts_last_24h,
+                    "last_calculated_at": func.now(),
+                }
+                for account_id, c in counts.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["mastodon_account_id"],
+            set_=dict(
+                posts_last_1h=stmt.excluded.posts_last_1h,
+                posts_last_24h=stmt.excluded.posts_last_24h,
+                last_calculated_at=func.now(),
+            ),
+        )
+        session.execute(stmt)
+
+    def evaluate(
+        self,
+        rule: Rule,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        matcher: str | None = None,
+        scan: BehaviorCounts | None = None,
+        prepared: PreparedAccount | None = None,
+    ) -> list[Violation]:
+        """Evaluate one behavioral rule, loading the account's counts unless ``scan`` has them."""
         violations: list[Violation] = []
         mastodon_account_id = account_data.get("mastodon_account_id")
         if not mastodon_account_id:
             return violations
-        with Session(engine) as session:
-            behavior_type = rule.pattern.lower().strip()
-            if behavior_type == "rapid_posting":
-                one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-                posts_last_1h = (
-                    session.query(InteractionHistory)
-                    .filter(
-                        InteractionHistory.source_account_id == mastodon_account_id,
-                        InteractionHistory.created_at >= one_hour_ago,
-                    )
-                    .count()
-                )
-                if posts_last_1h >= rule.trigger_threshold:
-                    violations.append(
-                        Violation(
-                            rule_name=rule.name,
-                            score=rule.weight,
-                            evidence=Evidence(
-                                matched_terms=[],
-                                matched_status_ids=[],
-                                metrics={"posts_last_1h": posts_last_1h, "threshold": rule.trigger_threshold},
-                            ),
-                        )
+        behavior_type = matcher if matcher is not None else self.compile(rule.pattern)
+        counts = scan
+        if counts is None:
+            counts = self.collect([mastodon_account_id])[mastodon_account_id]
+        if behavior_type == "rapid_posting":
+            if counts.posts_last_1h >= rule.trigger_threshold:
+                violations.append(
+                    Violation(
+                        rule_name=rule.name,
+                        score=rule.weight,
+                        evidence=Evidence(
+                            matched_terms=[],
+                            matched_status_ids=[],
+                            metrics={"posts_last_1h": counts.posts_last_1h, "threshold": rule.trigger_threshold},
+                        ),
                     )
-            elif behavior_type == "interaction_spam":
-                recent_interactions = (
-                    session.query(InteractionHistory)
-                    .filter(InteractionHistory.source_account_id == mastodon_account_id)
-                    .order_by(InteractionHistory.created_at.desc())
-                    .limit(100)
-                    .all()
                 )
-                unique_targets = {i.target_account_id for i in recent_interactions}
-                if len(unique_targets) >= rule.trigger_threshold:
-                    violations.append(
-                        Violation(
-                            rule_name=rule.name,
-                            score=rule.weight,
-                            evidence=Evidence(
-                                matched_terms=[],
-                                matched_status_ids=[],
-                                metrics={
-                                    "unique_targets": len(unique_targets),
-                                    "recent_interactions_count": len(recent_interactions),
-                                    "threshold": rule.trigger_threshold,
-                                },
-                            ),
-                        )
-                    )
-            elif behavior_type == "daily_posting":
-                twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-                posts_last_24h = (
-                    session.query(InteractionHistory)
-                    .filter(
-                        InteractionHistory.source_account_id == mastodon_account_id,
-                        InteractionHistory.created_at >= twenty_four_hours_ago,
+        elif behavior_type == "interaction_spam":
+            if counts.unique_targets >= rule.trigger_threshold:
+                violations.append(
+                    Violation(
+                        rule_name=rule.name,
+                        score=rule.weight,
+                        evidence=Evidence(
+                            matched_terms=[],
+                            matched_status_ids=[],
+                            metrics={
+                                "unique_targets": counts.unique_targets,
+                                "recent_interactions_count": counts.recent_interactions_count,
+                                "threshold": rule.trigger_threshold,
+                            },
+                        ),
                     )
-                    .count()
                 )
-                if posts_last_24h >= rule.trigger_threshold:
-                    violations.append(
-                        Violation(
-                            rule_name=rule.name,
-                            score=rule.weight,
-                            evidence=Evidence(
-                                matched_terms=[],
-                                matched_status_ids=[],
-                                metrics={"posts_last_24h": posts_last_24h, "threshold": rule.trigger_threshold},
-                            ),
-                        )
+        elif behavior_type == "daily_posting":
+            if counts.posts_last_24h >= rule.trigger_threshold:
+                violations.append(
+                    Violation(
+                        rule_name=rule.name,
+                        score=rule.weight,
+                        evidence=Evidence(
+                            matched_terms=[],
+                            matched_status_ids=[],
+                            metrics={"posts_last_24h": counts.posts_last_24h, "threshold": rule.trigger_threshold},
+                        ),
                     )
-            elif behavior_type == "automation_disclosure":
-                violations.extend(self._check_automation(rule, account_data, statuses))
-            elif behavior_type == "link_spam":
-                violations.extend(self._check_link_spam(rule, statuses))
-            one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-            twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-            posts_last_1h = (
-                session.query(InteractionHistory)
-                .filter(
-                    InteractionHistory.source_account_id == mastodon_account_id,
-                    InteractionHistory.created_at >= one_hour_ago,
-                )
-                .count()
-            )
-            posts_last_24h = (
-                session.query(InteractionHistory)
-                .filter(
-                    InteractionHistory.source_account_id == mastodon_account_id,
-                    InteractionHistory.created_at >= twenty_four_hours_ago,
-                )
-                .count()
-            )
-            metrics = (
-                session.query(AccountBehaviorMetrics)
-                .filter(AccountBehaviorMetrics.mastodon_account_id == mastodon_account_id)
-                .first()
-            )
-            if not metrics:
-                metrics = AccountBehaviorMetrics(
-                    mastodon_account_id=mastodon_account_id,
-                    posts_last_1h=posts_last_1h,
-                    posts_last_24h=posts_last_24h,
-                    last_calculated_at=datetime.utcnow(),
                 )
-                session.add(metrics)
-            else:
-                metrics.posts_last_1h = posts_last_1h
-                metrics.posts_last_24h = posts_last_24h
-                metrics.last_calculated_at = datetime.utcnow()
-            session.commit()
+        elif behavior_type == "automation_disclosure":
+            prepared = self.prepare(account_data, statuses, prepared)
+            violations.extend(self._check_automation(rule, account_data, prepared.statuses))
+        elif behavior_type == "link_spam":
+            prepared = self.prepare(account_data, statuses, prepared)
+            violations.extend(self._check_link_spam(rule, prepared.statuses))
         return violations
 
     @staticmethod
-    def _parse_time(value: Any) -> datetime:
-        if isinstance(value, datetime):
-            return value
-        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    def _latest(statuses: tuple[PreparedStatus, ...], window: int) -> list[PreparedStatus]:
+        dated = [s for s in statuses if s.created_at is not None]
+        return sorted(dated, key=lambda s: s.created_at, reverse=True)[:window]
 
     def _check_automation(
-        self, rule: Rule, account_data: dict[str, Any], statuses: list[dict[str, Any]]
+        self, rule: Rule, account_data: dict[str, Any], statuses: tuple[PreparedStatus, ...]
     ) -> list[Violation]:
-        items = sorted(statuses, key=lambda s: self._parse_time(s["created_at"]), reverse=True)[
-            : self.AUTOMATION_WINDOW
-        ]
+        items = self._latest(statuses, self.AUTOMATION_WINDOW)
         if not items:
             return []
-        texts = [re.sub(r"\d+", "", s.get("content", "")).strip().lower() for s in items]
         counts: dict[str, list[int]] = {}
-        for i, text in enumerate(texts):
-            counts.setdefault(text, []).append(i)
+        for i, s in enumerate(items):
+            counts.setdefault(s.digitless, []).append(i)
         duplicates = {i for idxs in counts.values() for i in idxs if len(idxs) > 1}
         automation_percentage = len(duplicates) / len(items)
-        times = [self._parse_time(s["created_at"]) for s in items]
+        times = [s.created_at for s in items]
         intervals = [abs((times[i] - times[i + 1]).total_seconds()) for i in range(len(times) - 1)]
         avg_interval = sum(intervals) / len(intervals) if intervals else 0
         results: list[Violation] = []
         if not account_data.get("bot") and automation_percentage > 0.5:
-            matched_ids = [items[i]["id"] for i in sorted(duplicates) if items[i].get("id")]
+            matched_ids = [items[i].id for i in sorted(duplicates) if items[i].id]
             results.append(
                 Violation(
                     rule_name=rule.name,
@@ -176,15 +249,11 @@ class BehavioralDetector(BaseDetector):
             )
         if account_data.get("bot"):
             now = datetime.utcnow()
-            public_items = [s for s in items if s.get("visibility") not in ("unlisted", "private", "direct")]
-            posts_last_hour = sum(
-                1 for s in public_items if self._parse_time(s["created_at"]) >= now - timedelta(hours=1)
-            )
-            posts_last_day = sum(
-                1 for s in public_items if self._parse_time(s["created_at"]) >= now - timedelta(days=1)
-            )
+            public_items = [s for s in items if s.status.get("visibility") not in ("unlisted", "private", "direct")]
+            posts_last_hour = sum(1 for s in public_items if s.created_at >= now - timedelta(hours=1))
+            posts_last_day = sum(1 for s in public_items if s.created_at >= now - timedelta(days=1))
             if posts_last_hour > 1 or posts_last_day > 24:
-                matched_ids = [s["id"] for s in public_items if s.get("id")]
+                matched_ids = [s.id for s in public_items if s.id]
                 results.append(
                     Violation(
                         rule_name=rule.name,
@@ -198,29 +267,25 @@ class BehavioralDetector(BaseDetector):
                 )
         return results
 
-    def _check_link_spam(self, rule: Rule, statuses: list[dict[str, Any]]) -> list[Violation]:
-        items = sorted(statuses, key=lambda s: self._parse_time(s["created_at"]), reverse=True)[: self.LINK_SPAM_WINDOW]
+    def _check_link_spam(self, rule: Rule, statuses: tuple[PreparedStatus, ...]) -> list[Violation]:
+        items = self._latest(statuses, self.LINK_SPAM_WINDOW)
         if len(items) != self.LINK_SPAM_WINDOW:
             return []
         total = len(items)
         domain_counts: dict[str, int] = {}
         content_map: dict[str, list[int]] = {}
-        links: list[tuple[int, list[str]]] = []
+        links: list[tuple[int, tuple[str, ...]]] = []
         for i, status in enumerate(items):
-            content = status.get("content", "")
-            norm = re.sub(r"\s+", " ", content).strip().lower()
-            content_map.setdefault(norm, []).append(i)
-            found = re.findall(r"https?://[^\s]+", content)
-            if found:
-                links.append((i, found))
-                for link in found:
-                    domain = urlparse(link).netloc
+            content_map.setdefault(status.squashed, []).append(i)
+            if status.urls:
+                links.append((i, status.urls))
+                for domain in status.domains:
                     domain_counts[domain] = domain_counts.get(domain, 0) + 1
         link_ratio = len(links) / total if total else 0
         repetitive = any(len(idxs) > total / 2 for idxs in content_map.values())
         single_domain = len(domain_counts) == 1
         if link_ratio == 1 and (repetitive or single_domain):
-            matched_ids = [items[i]["id"] for i, _ in links if items[i].get("id")]
+            matched_ids = [items[i].id for i, _ in links if items[i].id]
             return [
                 Violation(
                     rule_name=rule.name,
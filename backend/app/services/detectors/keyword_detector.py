@@ -1,27 +1,100 @@
 """Keyword detector for content analysis."""
 
+from dataclasses import dataclass
+from typing import Any
+
 from app.models import Rule
 from app.schemas import Evidence, Violation
-from app.services.detectors.base import BaseDetector
+from app.services.detectors.aho_corasick import AhoCorasick
+from app.services.detectors.base import BaseDetector, TextScan
+from app.services.detectors.prepared import PreparedAccount
+
+
+@dataclass(frozen=True, eq=False)
+class KeywordMatcher:
+    """Comma-separated keyword terms paired with their lowercased needles."""
+
+    terms: tuple[tuple[str, str], ...]
+
+    def find(self, *texts_lower: str) -> list[str]:
+        """Return the terms contained in any of the already-lowercased texts, in rule order."""
+        return [term for term, needle in self.terms if any(needle in text for text in texts_lower)]
+
+
+class KeywordIndex:
+    """Aho-Corasick automaton over the terms of every keyword matcher."""
+
+    def __init__(self, matchers: list[KeywordMatcher]):
+        self._automaton = AhoCorasick(
+            (needle, (matcher, position)) for matcher in matchers for position, (_, needle) in enumerate(matcher.terms)
+        )
+
+    def find_all(self, *texts_lower: str) -> dict[KeywordMatcher, list[str]]:
+        """Return the matched terms of every matcher that hits any of the already-lowercased texts."""
+        positions: dict[KeywordMatcher, set[int]] = {}
+        for text_lower in texts_lower:
+            for matcher, position in self._automaton.search(text_lower):
+                positions.setdefault(matcher, set()).add(position)
+        return {matcher: [matcher.terms[p][0] for p in sorted(found)] for matcher, found in positions.items()}
 
 
 class KeywordDetector(BaseDetector):
     """Detector for keyword patterns in account and status text."""
 
-    def evaluate(self, rule: Rule, account_data: dict[str, any], statuses: list[dict[str, any]]) -> list[Violation]:
-        """Evaluate account and statuses for keyword matches."""
+    def compile(self, pattern: str) -> KeywordMatcher:
+        """Split the comma-separated pattern into terms and lowercase them once."""
+        return KeywordMatcher(terms=tuple((term, term.lower()) for term in (t.strip() for t in pattern.split(","))))
+
+    def build_index(self, matchers: list[KeywordMatcher]) -> KeywordIndex | None:
+        """Merge the terms of all keyword rules into a single automaton."""
+        return KeywordIndex(matchers) if matchers else None
+
+    def scan(
+        self,
+        index: KeywordIndex,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        prepared: PreparedAccount | None = None,
+    ) -> TextScan:
+        """Scan username, display name and each status once for all keyword rules.
+
+        Hits map each matcher to its matched terms.
+        """
+        prepared = self.prepare(account_data, statuses, prepared)
+        return TextScan(
+            username=index.find_all(prepared.username_lower),
+            display_name=index.find_all(prepared.display_name_lower),
+            statuses=[index.find_all(*p.lowers) for p in prepared.statuses],
+        )
+
+    def evaluate(
+        self,
+        rule: Rule,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        matcher: KeywordMatcher | None = None,
+        scan: TextScan | None = None,
+        prepared: PreparedAccount | None = None,
+    ) -> list[Violation]:
+        """Evaluate account and statuses for keyword matches.
+
+        Status keywords are matched against the visible text and the raw HTML.
+        """
         violations: list[Violation] = []
 
-        terms = [term.strip() for term in rule.pattern.split(",")]
-        u = account_data.get("username") or (account_data.get("acct", "").split("@")[0]) or ""
-        dn = account_data.get("display_name") or ""
+        keywords = matcher if matcher is not None else self.compile(rule.pattern)
+        prepared = self.prepare(account_data, statuses, prepared)
+        u, dn = prepared.username, prepared.display_name
+        if scan is not None:
+            matched_terms_username = scan.username.get(keywords)
+            matched_terms_display = scan.display_name.get(keywords)
+            status_hits = [hits.get(keywords) for hits in scan.statuses]
+        else:
+            matched_terms_username = keywords.find(prepared.username_lower)
+            matched_terms_display = keywords.find(prepared.display_name_lower)
+            status_hits = [keywords.find(*p.lowers) for p in prepared.statuses]
 
         # Check username for keywords
-        matched_terms_username = []
-        for term in terms:
-            if term.lower() in u.lower():
-                matched_terms_username.append(term)
-
         if matched_terms_username:
             violations.append(
                 Violation(
@@ -34,11 +107,6 @@ class KeywordDetector(BaseDetector):
             )
 
         # Check display name for keywords
-        matched_terms_display = []
-        for term in terms:
-            if term.lower() in dn.lower():
-                matched_terms_display.append(term)
-
         if matched_terms_display:
             violations.append(
                 Violation(
@@ -51,13 +119,7 @@ class KeywordDetector(BaseDetector):
             )
 
         # Check content for keywords
-        for s in statuses or []:
-            content = s.get("content", "")
-            matched_terms_content = []
-            for term in terms:
-                if term.lower() in content.lower():
-                    matched_terms_content.append(term)
-
+        for p, matched_terms_content in zip(prepared.statuses, status_hits, strict=True):
             if matched_terms_content:
                 violations.append(
                     Violation(
@@ -65,8 +127,8 @@ class KeywordDetector(BaseDetector):
                         score=rule.weight,
                         evidence=Evidence(
                             matched_terms=matched_terms_content,
-                            matched_status_ids=[s.get("id")],
-                            metrics={"content": content},
+                            matched_status_ids=[p.id],
+                            metrics={"content": p.content},
                         ),
                     )
                 )
@@ -1,29 +1,55 @@
 """Detector for media attachments."""
 
-from hashlib import sha256
+import re
+from dataclasses import dataclass
 from typing import Any
 
 from app.models import Rule
 from app.schemas import Evidence, Violation
 from app.services.detectors.base import BaseDetector
+from app.services.detectors.prepared import PreparedAccount
+
+_SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class MediaMatcher:
+    """Normalized media pattern and whether it is a URL hash."""
+
+    pattern: str
+    is_hash: bool
 
 
 class MediaDetector(BaseDetector):
     """Evaluate alt text, MIME types, and URL hashes of attachments."""
 
-    def evaluate(self, rule: Rule, account_data: dict[str, Any], statuses: list[dict[str, Any]]) -> list[Violation]:
+    def compile(self, pattern: str) -> MediaMatcher:
+        """Lowercase the pattern and classify it as a SHA-256 URL hash or a substring."""
+        normalized = pattern.lower()
+        return MediaMatcher(pattern=normalized, is_hash=bool(_SHA256_HEX.fullmatch(normalized)))
+
+    def evaluate(
+        self,
+        rule: Rule,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        matcher: MediaMatcher | None = None,
+        scan: Any = None,
+        prepared: PreparedAccount | None = None,
+    ) -> list[Violation]:
         """Find violations in media attachments."""
         violations: list[Violation] = []
-        pattern = rule.pattern.lower()
-        for status in statuses or []:
-            for attachment in status.get("media_attachments", []):
-                alt_text = (attachment.get("description") or "").lower()
-                mime = (attachment.get("mime_type") or "").lower()
-                url = attachment.get("url") or attachment.get("remote_url") or ""
-                hash_value = sha256(url.encode()).hexdigest() if url else ""
+        compiled = matcher if matcher is not None else self.compile(rule.pattern)
+        pattern = compiled.pattern
+        prepared = self.prepare(account_data, statuses, prepared)
+        for status in prepared.statuses:
+            for attachment in status.attachments:
+                alt_text = attachment.alt_text
+                mime = attachment.mime_type
+                hash_value = attachment.url_hash
                 matched_terms: list[str] = []
                 metrics: dict[str, Any] = {}
-                if not is_hash_pattern:
+                if not compiled.is_hash:
                     if pattern in alt_text:
                         matched_terms.append(alt_text)
                         metrics["alt_text"] = alt_text
@@ -41,7 +67,7 @@ class MediaDetector(BaseDetector):
                             score=rule.weight,
                             evidence=Evidence(
                                 matched_terms=matched_terms,
-                                matched_status_ids=[status.get("id")],
+                                matched_status_ids=[status.id],
                                 metrics=metrics,
                             ),
                         )
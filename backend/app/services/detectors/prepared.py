@@ -0,0 +1,147 @@
+"""Normalized account and status text shared by all detectors."""
+
+import html
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+from typing import Any
+from urllib.parse import urlparse
+
+_BREAK = re.compile(r"<br\s*/?>|</p>", re.I)
+_TAG = re.compile(r"<[^>]*>")
+_DIGITS = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+_URL = re.compile(r"https?://[^\s]+")
+
+
+def strip_html(content: str) -> str:
+    """Return the visible text of Mastodon status HTML, one line per paragraph."""
+    if "<" not in content and "&" not in content:
+        return content
+    return html.unescape(_TAG.sub("", _BREAK.sub("\n", content))).strip()
+
+
+def parse_time(value: Any) -> datetime | None:
+    """Parse a status timestamp, accepting datetimes and ISO 8601 strings."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedAttachment:
+    """Lowercased alt text and MIME type plus URL hash of one media attachment."""
+
+    alt_text: str
+    mime_type: str
+    url_hash: str
+
+    @classmethod
+    def from_attachment(cls, attachment: dict[str, Any]) -> "PreparedAttachment":
+        """Normalize a media attachment dict."""
+        url = attachment.get("url") or attachment.get("remote_url") or ""
+        return cls(
+            alt_text=(attachment.get("description") or "").lower(),
+            mime_type=(attachment.get("mime_type") or "").lower(),
+            url_hash=sha256(url.encode()).hexdigest() if url else "",
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedStatus:
+    """One status with every normalization the detectors need, computed once.
+
+    ``status`` is the raw dict, which is still what evidence reports.
+    ``texts`` and ``lowers`` are what keyword and regex rules search: the
+    visible text and, when the status has markup, the raw HTML as well, so
+    rules written against links or markup keep matching.
+    """
+
+    status: dict[str, Any]
+    text: str
+    lower: str
+    texts: tuple[str, ...]
+    lowers: tuple[str, ...]
+    digitless: str
+    squashed: str
+    urls: tuple[str, ...]
+    domains: tuple[str, ...]
+    created_at: datetime | None
+    attachments: tuple[PreparedAttachment, ...]
+
+    @property
+    def id(self) -> Any:
+        """Status id from the raw dict."""
+        return self.status.get("id")
+
+    @property
+    def content(self) -> str:
+        """Raw status HTML."""
+        return self.status.get("content", "")
+
+    @classmethod
+    def from_status(cls, status: dict[str, Any]) -> "PreparedStatus":
+        """Normalize a status dict.
+
+        Args:
+            status: Status dictionary as returned by the Mastodon API
+
+        Returns:
+            PreparedStatus for the status
+
+        """
+        content = status.get("content") or ""
+        text = strip_html(content)
+        lower = text.lower()
+        urls = tuple(_URL.findall(text))
+        return cls(
+            status=status,
+            text=text,
+            lower=lower,
+            texts=(text,) if text == content else (text, content),
+            lowers=(lower,) if text == content else (lower, content.lower()),
+            digitless=_DIGITS.sub("", lower).strip(),
+            squashed=_WHITESPACE.sub(" ", lower).strip(),
+            urls=urls,
+            domains=tuple(urlparse(url).netloc for url in urls),
+            created_at=parse_time(status.get("created_at")),
+            attachments=tuple(PreparedAttachment.from_attachment(a) for a in status.get("media_attachments") or []),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedAccount:
+    """Account names and prepared statuses for one evaluation."""
+
+    username: str
+    display_name: str
+    statuses: tuple[PreparedStatus, ...]
+
+    @property
+    def username_lower(self) -> str:
+        """Lowercased username."""
+        return self.username.lower()
+
+    @property
+    def display_name_lower(self) -> str:
+        """Lowercased display name."""
+        return self.display_name.lower()
+
+
+def prepare_account(account_data: dict[str, Any], statuses: list[dict[str, Any]] | None) -> PreparedAccount:
+    """Normalize an account and its statuses once for every detector.
+
+    Args:
+        account_data: Dictionary containing account information
+        statuses: List of status dictionaries
+
+    Returns:
+        PreparedAccount shared by all detectors during one evaluation
+
+    """
+    return PreparedAccount(
+        username=account_data.get("username") or (account_data.get("acct", "").split("@")[0]) or "",
+        display_name=account_data.get("display_name") or "",
+        statuses=tuple(PreparedStatus.from_status(s) for s in statuses or []),
+    )
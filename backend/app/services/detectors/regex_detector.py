@@ -1,24 +1,73 @@
 """Regex detector for pattern matching in content."""
 
 import re
+from typing import Any
 
 from app.models import Rule
 from app.schemas import Evidence, Violation
-from app.services.detectors.base import BaseDetector
+from app.services.detectors.base import BaseDetector, TextScan
+from app.services.detectors.prepared import PreparedAccount
+from app.services.detectors.regex_set import RegexSet
 
 
 class RegexDetector(BaseDetector):
     """Detector for regex patterns in account and status text."""
 
-    def evaluate(self, rule: Rule, account_data: dict[str, any], statuses: list[dict[str, any]]) -> list[Violation]:
-        """Evaluate account and statuses for regex pattern matches."""
+    def compile(self, pattern: str) -> re.Pattern[str]:
+        """Compile the rule pattern once, case-insensitively."""
+        return re.compile(pattern, re.I)
+
+    def build_index(self, matchers: list[re.Pattern[str]]) -> RegexSet | None:
+        """Index all regex rules behind a shared literal prefilter."""
+        return RegexSet(matchers) if matchers else None
+
+    def scan(
+        self,
+        index: RegexSet,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        prepared: PreparedAccount | None = None,
+    ) -> TextScan:
+        """Find the matching patterns for username, display name and each status.
+
+        Hits map each matching pattern to True.
+        """
+        prepared = self.prepare(account_data, statuses, prepared)
+        return TextScan(
+            username=dict.fromkeys(index.matching(prepared.username), True),
+            display_name=dict.fromkeys(index.matching(prepared.display_name), True),
+            statuses=[dict.fromkeys(set().union(*map(index.matching, p.texts)), True) for p in prepared.statuses],
+        )
+
+    def evaluate(
+        self,
+        rule: Rule,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        matcher: re.Pattern[str] | None = None,
+        scan: TextScan | None = None,
+        prepared: PreparedAccount | None = None,
+    ) -> list[Violation]:
+        """Evaluate account and statuses for regex pattern matches.
+
+        Status patterns are matched against the visible text and the raw HTML.
+        """
         violations: list[Violation] = []
+        regex = matcher if matcher is not None else self.compile(rule.pattern)
 
-        u = account_data.get("username") or (account_data.get("acct", "").split("@")[0]) or ""
-        dn = account_data.get("display_name") or ""
+        prepared = self.prepare(account_data, statuses, prepared)
+        u, dn = prepared.username, prepared.display_name
+        if scan is not None:
+            username_hit = regex in scan.username
+            display_name_hit = regex in scan.display_name
+            status_hits = [regex in hits for hits in scan.statuses]
+        else:
+            username_hit = regex.search(u) is not None
+            display_name_hit = regex.search(dn) is not None
+            status_hits = [any(regex.search(t) for t in p.texts) for p in prepared.statuses]
 
         # Apply regex to username
-        if re.search(rule.pattern, u, re.I):
+        if username_hit:
             violations.append(
                 Violation(
                     rule_name=rule.name,
@@ -28,7 +77,7 @@ class RegexDetector(BaseDetector):
             )
 
         # Apply regex to display name
-        if re.search(rule.pattern, dn, re.I):
+        if display_name_hit:
             violations.append(
                 Violation(
                     rule_name=rule.name,
@@ -38,15 +87,15 @@ class RegexDetector(BaseDetector):
             )
 
         # Apply regex to status content
-        for s in statuses or []:
-            content = s.get("content", "")
-            if re.search(rule.pattern, content, re.I):
+        for p, content_hit in zip(prepared.statuses, status_hits, strict=True):
+            if content_hit:
+                content = p.content
                 violations.append(
                     Violation(
                         rule_name=rule.name,
                         score=rule.weight,
                         evidence=Evidence(
-                            matched_terms=[content], matched_status_ids=[s.get("id")], metrics={"content": content}
+                            matched_terms=[content], matched_status_ids=[p.id], metrics={"content": content}
                         ),
                     )
                 )
@@ -0,0 +1,113 @@
+"""Match many compiled regexes against one text with a literal prefilter."""
+
+import logging
+import re
+import re._parser as sre_parse
+from collections.abc import Iterable
+
+from app.services.detectors.aho_corasick import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
+# Factors shorter than this pass too many texts to be worth prefiltering on.
+MIN_FACTOR_LENGTH = 3
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None))
+_GROUPS = (sre_parse.SUBPATTERN, getattr(sre_parse, "ATOMIC_GROUP", None))
+
+# Dotted and dotless i are the only characters that match an ASCII letter under
+# re.I without case-folding to it, so they are folded by hand.
+_FOLD_FIXES = str.maketrans({"İ": "i", "ı": "i"})
+
+
+def fold(text: str) -> str:
+    """Case-fold text so that it contains every ASCII factor of a pattern that matches it."""
+    return text.translate(_FOLD_FIXES).casefold()
+
+
+def _better(a: frozenset[str] | None, b: frozenset[str] | None) -> frozenset[str] | None:
+    """Pick the factor set whose shortest member is longest (and which has fewer members)."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b, key=lambda s: (min(map(len, s)), -len(s)))
+
+
+def _factors(items: Iterable) -> frozenset[str] | None:
+    """Return folded literals of which every match of the parsed sequence contains at least one."""
+    best: frozenset[str] | None = None
+    run: list[str] = []
+
+    def flush() -> None:
+        nonlocal best
+        if run:
+            best = _better(best, frozenset({fold("".join(run))}))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_parse.BRANCH:
+            branches = [_factors(branch) for branch in av[1]]
+            if all(branches):
+                best = _better(best, frozenset().union(*branches))
+        elif op in _GROUPS:
+            best = _better(best, _factors(av[-1]))
+        elif op in _REPEATS and av[0] >= 1:
+            best = _better(best, _factors(av[2]))
+    flush()
+    return best
+
+
+def required_factors(pattern: re.Pattern[str]) -> frozenset[str] | None:
+    """Return literals one of which must occur (after ``fold``) wherever ``pattern`` matches.
+
+    Returns None if no usable factor set could be derived.
+    """
+    try:
+        factors = _factors(sre_parse.parse(pattern.pattern, pattern.flags))
+    except Exception as e:  # pragma: no cover - the pattern already compiled once
+        logger.debug(f"Could not parse regex {pattern.pattern!r} for prefiltering: {e}")
+        return None
+    if not factors or min(map(len, factors)) < MIN_FACTOR_LENGTH:
+        return None
+    return factors
+
+
+class RegexSet:
+    """Find every matching pattern in a set of regexes.
+
+    Python's ``re`` tries each branch of an alternation at every position, so
+    merging patterns does not save work. Instead each pattern is reduced to
+    literal factors that any match must contain, e.g. ``buy\\s+now`` needs
+    "buy" or "now" and ``crypto|nft`` needs "crypto" or "nft". One Aho-Corasick
+    pass over the case-folded text finds the candidates and only those are
+    searched. Patterns without a usable factor are searched on every text.
+    Results are the same as searching every pattern on its own.
+    """
+
+    def __init__(self, patterns: list[re.Pattern[str]]):
+        self._always: list[re.Pattern[str]] = []
+        needles: list[tuple[str, re.Pattern[str]]] = []
+        for pattern in dict.fromkeys(patterns):
+            factors = required_factors(pattern)
+            if factors is None:
+                self._always.append(pattern)
+            else:
+                needles.extend((factor, pattern) for factor in factors)
+        self._automaton = AhoCorasick(needles) if needles else None
+
+    @property
+    def unfiltered_count(self) -> int:
+        """Number of patterns that are searched on every text."""
+        return len(self._always)
+
+    def matching(self, text: str) -> set[re.Pattern[str]]:
+        """Return every pattern that matches somewhere in ``text``."""
+        found = {pattern for pattern in self._always if pattern.search(text)}
+        if self._automaton is not None and text:
+            found.update(pattern for pattern in self._automaton.search(fold(text)) if pattern.search(text))
+        return found
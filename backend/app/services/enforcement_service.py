@@ -3,13 +3,13 @@
 import logging
 from typing import Any
 
-from app.config import get_settings
+from app import rate_limit
 from app.db import SessionLocal
 from app.mastodon_client import MastoClient
 from app.models import AuditLog
+from app.services.runtime_flags import runtime_flags
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 
 class EnforcementService:
@@ -39,6 +39,11 @@ class EnforcementService:
             )
             session.commit()
 
+    def _request(self, method: str, path: str, **kwargs: Any):
+        """Send an admin API request, charged to the enforcement share of the rate limit."""
+        with rate_limit.traffic_class(rate_limit.ENFORCEMENT):
+            return self.mastodon_client._make_request(method, path, **kwargs)
+
     def _post_action(
         self,
         account_id: str,
@@ -47,7 +52,7 @@ class EnforcementService:
         rule_id: int | None = None,
         evidence: dict[str, Any] | None = None,
     ) -> None:
-        if settings.DRY_RUN:
+        if runtime_flags.dry_run():
             logger.info("DRY RUN: %s %s", account_id, payload.get("type"))
             self._log_action(
                 action_type=payload.get("type", ""),
@@ -58,7 +63,7 @@ class EnforcementService:
             )
             return
         path = f"/api/v1/admin/accounts/{account_id}/action"
-        resp = self.mastodon_client._make_request("POST", path, json=payload)
+        resp = self._request("POST", path, json=payload)
         try:
             api_response = resp.json()
         except Exception as e:
@@ -131,7 +136,7 @@ class EnforcementService:
         evidence: dict[str, Any] | None = None,
     ) -> None:
         """Lift a previously applied silence."""
-        if settings.DRY_RUN:
+        if runtime_flags.dry_run():
             logger.info("DRY RUN: unsilence %s", account_id)
             self._log_action(
                 action_type="unsilence",
@@ -142,7 +147,7 @@ class EnforcementService:
             )
             return
         path = f"/api/v1/admin/accounts/{account_id}/unsilence"
-        resp = self.mastodon_client._make_request("POST", path)
+        resp = self._request("POST", path)
         try:
             api_response = resp.json()
         except (ValueError, json.decoder.JSONDecodeError) as e:
@@ -164,7 +169,7 @@ class EnforcementService:
         evidence: dict[str, Any] | None = None,
     ) -> None:
         """Lift a previously applied suspension."""
-        if settings.DRY_RUN:
+        if runtime_flags.dry_run():
             logger.info("DRY RUN: unsuspend %s", account_id)
             self._log_action(
                 action_type="unsuspend",
@@ -175,7 +180,7 @@ class EnforcementService:
             )
             return
         path = f"/api/v1/admin/accounts/{account_id}/unsuspend"
-        resp = self.mastodon_client._make_request("POST", path)
+        resp = self._request("POST", path)
         try:
             api_response = resp.json()
         except ValueError as e:
@@ -2,33 +2,48 @@
 
 import hashlib
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+import redis
 from app.config import get_settings
 from app.db import SessionLocal
+from app.metrics import redis_degraded
 from app.models import Rule
 from app.schemas import Evidence, Violation
+from app.services.compiled_ruleset import CompiledRuleset, compile_ruleset
 from app.services.detectors.behavioral_detector import BehavioralDetector
 from app.services.detectors.keyword_detector import KeywordDetector
 from app.services.detectors.media_detector import MediaDetector
+from app.services.detectors.prepared import PreparedAccount, prepare_account
 from app.services.detectors.regex_detector import RegexDetector
-from sqlalchemy import text
+from app.services.runtime_flags import runtime_flags
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
+rcli = redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Version of the active ruleset (its SHA-256), set by whichever process changes a rule.
+RULESET_VERSION_KEY = "rules:version"
+# Seconds between checks of RULESET_VERSION_KEY in each process.
+VERSION_CHECK_INTERVAL = 0.5
 
 
 @dataclass
 class RuleCache:
-    """In-memory cache for rules to avoid frequent database hits"""
+    """In-memory cache for rules to avoid frequent database hits.
+
+    A cache loaded while ``RULESET_VERSION_KEY`` was readable is kept until
+    that version changes; ``ttl_seconds`` only applies without one.
+    """
 
     rules: list[Rule]
-    config: dict[str, Any]
     ruleset_sha256: str
     cached_at: datetime
     ttl_seconds: int = settings.RULE_CACHE_TTL
+    version: str | None = None
 
     def is_expired(self) -> bool:
         """Check if the cache has expired"""
@@ -40,14 +55,18 @@ class RuleService:
 
     This service provides:
     - Database-only rule loading (no file dependencies)
-    - Caching to reduce database load during scanning
+    - Caching to reduce database load during scanning, invalidated in every
+      process through a ruleset version key in Redis
+    - Pre-compiled matchers rebuilt only when the ruleset version changes
     - CRUD operations for rule management
     - Rule statistics and metadata tracking
     """
 
     def __init__(self, cache_ttl_seconds: int | None = None):
         self._cache: RuleCache | None = None
+        self._compiled: CompiledRuleset | None = None
         self._cache_ttl = cache_ttl_seconds or settings.RULE_CACHE_TTL
+        self._version_checked_at = 0.0
         self.detectors = {
             "regex": RegexDetector(),
             "keyword": KeywordDetector(),
@@ -59,19 +78,72 @@ class RuleService:
         """Get active rules from database with caching.
 
         Args:
-            force_refresh: If True, bypass cache and reload from database
+            force_refresh: If True, bypass cache, reload from database and make
+                every other process reload as well
 
         Returns:
             Tuple of (rules_list, config_dict, ruleset_sha256)
 
         """
-        if not force_refresh and self._cache and not self._cache.is_expired():
-            return self._cache.rules, self._cache.config, self._cache.ruleset_sha256
+        if force_refresh:
+            return self._publish_ruleset()
+        if self._cache and self._cache_is_current():
+            return self._cache.rules, self._runtime_config(), self._cache.ruleset_sha256
 
         return self._load_rules_from_database()
 
+    def _cache_is_current(self) -> bool:
+        """Check the cache against the published ruleset version, at most every VERSION_CHECK_INTERVAL."""
+        if self._cache.version is None:
+            return not self._cache.is_expired()
+        now = time.monotonic()
+        if now - self._version_checked_at < VERSION_CHECK_INTERVAL:
+            return True
+        try:
+            version = rcli.get(RULESET_VERSION_KEY)
+        except redis.RedisError:
+            redis_degraded.inc()
+            return not self._cache.is_expired()
+        self._version_checked_at = now
+        return version == self._cache.version
+
+    def _read_version(self) -> str | None:
+        try:
+            return rcli.get(RULESET_VERSION_KEY)
+        except redis.RedisError:
+            redis_degraded.inc()
+            return None
+
+    def _publish_ruleset(self) -> tuple[list[Rule], dict[str, Any], str]:
+        """Reload rules after a change and publish their version so every process reloads them."""
+        rules, config, ruleset_sha256 = self._load_rules_from_database()
+        try:
+            rcli.set(RULESET_VERSION_KEY, ruleset_sha256)
+            self._cache.version = ruleset_sha256
+        except redis.RedisError as e:
+            redis_degraded.inc()
+            logger.warning(f"Could not publish ruleset version; other processes reload within their TTL: {e}")
+        return rules, config, ruleset_sha256
+
+    def get_compiled_ruleset(self) -> tuple[list[Rule], CompiledRuleset]:
+        """Get active rules together with their pre-compiled matchers.
+
+        Matchers are rebuilt only when the ruleset SHA changes, so cache refreshes
+        that reload identical rules from the database reuse the compiled set.
+
+        Returns:
+            Tuple of (rules_list, compiled_ruleset)
+
+        """
+        rules, _, ruleset_sha256 = self.get_active_rules()
+        if self._compiled is None or self._compiled.ruleset_sha256 != ruleset_sha256:
+            self._compiled = compile_ruleset(rules, ruleset_sha256, self.detectors)
+        return rules, self._compiled
+
     def _load_rules_from_database(self) -> tuple[list[Rule], dict[str, Any], str]:
         """Load rules from database and update cache"""
+        # Read before loading: a change published meanwhile then triggers another reload.
+        version = self._read_version()
         with SessionLocal() as session:
             # Get all enabled rules
             db_rules = session.query(Rule).filter(Rule.enabled.is_(True)).all()
@@ -81,6 +153,7 @@ class RuleService:
             for rule in db_rules:
                 rule_components = [
                     str(rule.id),
+                    rule.name,
                     rule.pattern,
                     rule.secondary_pattern or "",
                     rule.boolean_operator or "",
@@ -89,34 +162,43 @@ class RuleService:
                     rule.detector_type,
                     rule.action_type,
                     str(rule.trigger_threshold),
+                    str(rule.action_duration_seconds),
+                    rule.action_warning_text or "",
+                    rule.warning_preset_id or "",
                 ]
                 rule_data.append(":".join(rule_components))
 
             ruleset_content = "|".join(sorted(rule_data))
             ruleset_sha256 = hashlib.sha256(ruleset_content.encode()).hexdigest()
 
-            # Get report threshold from database config or use default
-            config_row = session.execute(text("SELECT value FROM config WHERE key='report_threshold'")).scalar()
-
-            if config_row and isinstance(config_row, dict):
-                report_threshold = config_row.get("threshold", 1.0)
-            else:
-                report_threshold = 1.0
-
-            config = {"report_threshold": report_threshold}
+            if version is None:
+                # First load since Redis lost the key (or ever); seed it unless another process just did.
+                version = self._seed_version(ruleset_sha256)
 
             # Update cache
             self._cache = RuleCache(
                 rules=db_rules,
-                config=config,
                 ruleset_sha256=ruleset_sha256,
                 cached_at=datetime.utcnow(),
                 ttl_seconds=self._cache_ttl,
+                version=version,
             )
+            self._version_checked_at = time.monotonic()
 
             logger.debug(f"Loaded {len(db_rules)} rules from database, SHA: {ruleset_sha256[:8]}")
 
-            return db_rules, config, ruleset_sha256
+            return db_rules, self._runtime_config(), ruleset_sha256
+
+    @staticmethod
+    def _runtime_config() -> dict[str, Any]:
+        # Read on every call: runtime flags change independently of the rules.
+        return {"report_threshold": runtime_flags.report_threshold()}
+
+    def _seed_version(self, ruleset_sha256: str) -> str | None:
+        try:
+            return ruleset_sha256 if rcli.set(RULESET_VERSION_KEY, ruleset_sha256, nx=True) else None
+        except redis.RedisError:
+            return None
 
     def create_rule(
         self,
@@ -180,8 +262,8 @@ class RuleService:
             session.commit()
             session.refresh(rule)
 
-            # Invalidate cache since rules changed
-            self._invalidate_cache()
+            # Reload rules here and in every other process
+            self._publish_ruleset()
 
             logger.info(f"Created new rule: {name} (type: {detector_type}, weight: {weight})")
             return rule
@@ -211,8 +293,8 @@ class RuleService:
             session.commit()
             session.refresh(rule)
 
-            # Invalidate cache since rules changed
-            self._invalidate_cache()
+            # Reload rules here and in every other process
+            self._publish_ruleset()
 
             logger.info(f"Updated rule {rule_id}: {list(updates.keys())}")
             return rule
@@ -235,8 +317,8 @@ class RuleService:
             session.delete(rule)
             session.commit()
 
-            # Invalidate cache since rules changed
-            self._invalidate_cache()
+            # Reload rules here and in every other process
+            self._publish_ruleset()
 
             logger.info(f"Deleted rule {rule_id}: {rule.name}")
             return True
@@ -276,8 +358,8 @@ class RuleService:
 
             session.commit()
 
-            # Invalidate cache since rules changed
-            self._invalidate_cache()
+            # Reload rules here and in every other process
+            self._publish_ruleset()
 
             logger.info(f"Bulk toggled {len(updated_rules)} rules to enabled={enabled}")
             return updated_rules
@@ -345,14 +427,55 @@ class RuleService:
             }
 
     def evaluate_account(self, account_data: dict[str, Any], statuses: list[dict[str, Any]]) -> list[Violation]:
-        """Evaluates an account and its statuses against all active rules."""
+        """Evaluates an account and its statuses against all active rules.
+
+        Account and status text is normalized once here and shared by every detector.
+        """
+        return self.evaluate_accounts([(account_data, statuses)])[0]
+
+    def evaluate_accounts(self, accounts: list[tuple[dict[str, Any], list[dict[str, Any]]]]) -> list[list[Violation]]:
+        """Evaluate a page of accounts against all active rules.
+
+        Detector scans run once for the whole page, so detectors backed by the
+        database (behavioral counts) issue one query per page instead of one
+        per account and rule.
+
+        Args:
+            accounts: (account_data, statuses) pairs
+
+        Returns:
+            Violations for each account, in order
+
+        """
+        rules, compiled = self.get_compiled_ruleset()
+        batch = [
+            (account_data, statuses, prepare_account(account_data, statuses)) for account_data, statuses in accounts
+        ]
+        scans = compiled.scan_many(self.detectors, batch)
+        return [
+            self._evaluate_prepared(rules, compiled, account_data, statuses, prepared, account_scans)
+            for (account_data, statuses, prepared), account_scans in zip(batch, scans, strict=True)
+        ]
+
+    def _evaluate_prepared(
+        self,
+        rules: list[Rule],
+        compiled: CompiledRuleset,
+        account_data: dict[str, Any],
+        statuses: list[dict[str, Any]],
+        prepared: PreparedAccount,
+        scans: dict[str, Any],
+    ) -> list[Violation]:
         violations: list[Violation] = []
-        rules, _, _ = self.get_active_rules()
         for rule in rules:
             detector = self.detectors.get(rule.detector_type)
-            if not detector:
+            matchers = compiled.get(rule)
+            if not detector or not matchers:
                 continue
-            primary = detector.evaluate(rule, account_data, statuses)
+            scan = scans.get(rule.detector_type)
+            primary = detector.evaluate(
+                rule, account_data, statuses, matcher=matchers.primary, scan=scan, prepared=prepared
+            )
             actions = [
                 {
                     "type": rule.action_type,
@@ -361,14 +484,10 @@ class RuleService:
                     "warning_preset_id": rule.warning_preset_id,
                 }
             ]
-            if rule.boolean_operator and rule.secondary_pattern:
-                temp_rule = Rule(
-                    name=rule.name,
-                    detector_type=rule.detector_type,
-                    pattern=rule.secondary_pattern,
-                    weight=rule.weight,
+            if matchers.secondary is not None:
+                secondary = detector.evaluate(
+                    rule, account_data, statuses, matcher=matchers.secondary, scan=scan, prepared=prepared
                 )
-                secondary = detector.evaluate(temp_rule, account_data, statuses)
                 if rule.boolean_operator == "AND":
                     if primary and secondary and rule.weight >= rule.trigger_threshold:
                         evidence = Evidence(
@@ -394,7 +513,7 @@ class RuleService:
         return violations
 
     def invalidate_cache(self):
-        """Force cache invalidation to refresh rules on next access"""
+        """Force cache invalidation to refresh rules on next access in this process"""
         self._invalidate_cache()
 
     def _invalidate_cache(self):
@@ -425,6 +544,8 @@ class RuleService:
             "ttl_seconds": self._cache_ttl,
             "rules_count": len(self._cache.rules),
             "ruleset_sha256": self._cache.ruleset_sha256[:8],
+            "versioned": self._cache.version is not None,
+            "compiled_rules_count": len(self._compiled.rules) if self._compiled else 0,
         }
 
 
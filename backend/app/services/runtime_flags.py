@@ -0,0 +1,123 @@
+"""Runtime flags kept in process memory and refreshed over Redis.
+
+Tasks check ``panic_stop`` on every run and analysis needs ``report_threshold``
+for every account; reading them from the ``config`` table each time costs one
+query per task. ``RuntimeFlags`` keeps the flags in memory instead. The
+``/config/*`` endpoints write a flag to the database through ``ConfigService``
+and then push its new value into the ``FLAGS_KEY`` Redis hash. Each process
+reads that hash at most every ``CHECK_INTERVAL`` seconds, so a panic stop
+reaches every worker within about a second without touching the database.
+
+Flags missing from the hash, after a Redis restart or flush for example, are
+seeded from the database by the first process that notices; a flag pushed
+since then is kept. While Redis is unreachable, flags are read from the database at most
+every ``FALLBACK_TTL`` seconds.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+import redis
+from app.config import get_settings
+from app.metrics import redis_degraded
+from app.services.config_service import ConfigService, config_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+rcli = redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+FLAGS_KEY = "config:runtime_flags"
+FLAG_KEYS = ("panic_stop", "dry_run", "report_threshold", "automod")
+CHECK_INTERVAL = 0.5
+FALLBACK_TTL = 5.0
+DEFAULT_REPORT_THRESHOLD = 1.0
+
+
+class RuntimeFlags:
+    """In-memory view of the runtime flags stored by ``ConfigService``."""
+
+    def __init__(self, service: ConfigService):
+        self._service = service
+        self._values: dict[str, Any] | None = None
+        self._raw: dict[str, str] | None = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        # Scans evaluate accounts from a thread pool.
+        self._lock = threading.Lock()
+
+    def _load_from_database(self) -> dict[str, Any]:
+        values = self._service.get_configs(FLAG_KEYS)
+        self._loaded_at = time.monotonic()
+        return {key: values.get(key) for key in FLAG_KEYS}
+
+    def _seed(self, raw: dict[str, str]) -> dict[str, str]:
+        """Fill the flags missing from ``raw``, the current hash, with their database values."""
+        values = self._load_from_database()
+        missing = {key: json.dumps(values[key]) for key in FLAG_KEYS if key not in raw}
+        # HSETNX per flag: a value pushed meanwhile wins over the database read.
+        with rcli.pipeline() as pipe:
+            for key, value in missing.items():
+                pipe.hsetnx(FLAGS_KEY, key, value)
+            pipe.execute()
+        return {**raw, **missing}
+
+    def _current(self) -> dict[str, Any]:
+        now = time.monotonic()
+        if self._values is not None and now - self._checked_at < CHECK_INTERVAL:
+            return self._values
+        with self._lock:
+            if self._values is not None and now - self._checked_at < CHECK_INTERVAL:
+                return self._values
+            try:
+                raw = rcli.hgetall(FLAGS_KEY)
+                if not raw.keys() >= set(FLAG_KEYS):
+                    raw = self._seed(raw)
+                if raw != self._raw:
+                    self._values = {key: json.loads(raw[key]) if key in raw else None for key in FLAG_KEYS}
+                    self._raw = raw
+            except redis.RedisError as e:
+                redis_degraded.inc()
+                if self._values is None or now - self._loaded_at >= FALLBACK_TTL:
+                    logger.warning("Runtime flags unavailable in Redis, reading them from the database: %s", e)
+                    self._values, self._raw = self._load_from_database(), None
+            self._checked_at = now
+            return self._values
+
+    def push(self, key: str, value: Any) -> None:
+        """Publish the new value of a flag already stored through ``ConfigService``."""
+        try:
+            rcli.hset(FLAGS_KEY, key, json.dumps(value))
+        except redis.RedisError as e:
+            redis_degraded.inc()
+            logger.warning("Could not push runtime flag %s; workers pick it up within %ss: %s", key, FALLBACK_TTL, e)
+        # The next read in this process goes back to Redis.
+        self._checked_at = 0.0
+
+    def _enabled(self, key: str) -> bool:
+        value = self._current().get(key)
+        return bool(value.get("enabled", False)) if isinstance(value, dict) else False
+
+    def panic_stop(self) -> bool:
+        """Return True when PANIC_STOP is set in the environment or the database."""
+        return settings.PANIC_STOP or self._enabled("panic_stop")
+
+    def dry_run(self) -> bool:
+        """Return True when DRY_RUN is set in the environment or the database."""
+        return settings.DRY_RUN or self._enabled("dry_run")
+
+    def report_threshold(self) -> float:
+        """Return the score an account needs before it is reported."""
+        value = self._current().get("report_threshold")
+        if isinstance(value, dict):
+            return float(value.get("threshold", DEFAULT_REPORT_THRESHOLD))
+        return DEFAULT_REPORT_THRESHOLD
+
+    def automod(self) -> dict[str, Any]:
+        """Return the AutoMod settings."""
+        return self._current().get("automod") or {}
+
+
+runtime_flags = RuntimeFlags(config_service)
@@ -62,6 +62,50 @@ def validate_startup_configuration() -> None:
         if settings.BATCH_SIZE < 1:
             errors.append("BATCH_SIZE must be >= 1")
 
+        if settings.SCAN_CONCURRENCY < 1:
+            errors.append("SCAN_CONCURRENCY must be >= 1")
+
+        if settings.HTTP_MAX_CONNECTIONS < 1:
+            errors.append("HTTP_MAX_CONNECTIONS must be >= 1")
+
+        if settings.RATE_LIMIT_BURST < 1:
+            errors.append("RATE_LIMIT_BURST must be >= 1")
+
+        if settings.RATE_LIMIT_WINDOW < 1:
+            errors.append("RATE_LIMIT_WINDOW must be >= 1")
+
+        shares = {
+            "RATE_LIMIT_SHARE_REALTIME": settings.RATE_LIMIT_SHARE_REALTIME,
+            "RATE_LIMIT_SHARE_ENFORCEMENT": settings.RATE_LIMIT_SHARE_ENFORCEMENT,
+            "RATE_LIMIT_SHARE_BACKFILL": settings.RATE_LIMIT_SHARE_BACKFILL,
+        }
+        for name, share in shares.items():
+            if not 0 <= share <= 1:
+                errors.append(f"{name} must be between 0 and 1")
+        if sum(shares.values()) > 1:
+            errors.append("RATE_LIMIT_SHARE_* must add up to at most 1")
+
+        if settings.WEBHOOK_INGEST_MODE not in {"celery", "stream"}:
+            errors.append("WEBHOOK_INGEST_MODE must be 'celery' or 'stream'")
+
+        for name in ("WEBHOOK_STREAM_MAXLEN", "WEBHOOK_STREAM_BATCH_SIZE", "WEBHOOK_STREAM_MAX_ATTEMPTS"):
+            if getattr(settings, name) < 1:
+                errors.append(f"{name} must be >= 1")
+
+        if settings.STATUS_CACHE_TTL < 0:
+            errors.append("STATUS_CACHE_TTL must be >= 0")
+
+        if settings.TASK_PAYLOAD_MIN_BYTES < 0:
+            errors.append("TASK_PAYLOAD_MIN_BYTES must be >= 0")
+        if settings.TASK_PAYLOAD_TTL < 3600:
+            errors.append("TASK_PAYLOAD_TTL must be >= 3600 so stored payloads outlive task redelivery")
+
+        if settings.STATUS_COALESCE_WINDOW < 0:
+            errors.append("STATUS_COALESCE_WINDOW must be >= 0")
+
+        if settings.STATUS_COALESCE_MAX_DELAY < settings.STATUS_COALESCE_WINDOW:
+            errors.append("STATUS_COALESCE_MAX_DELAY must be >= STATUS_COALESCE_WINDOW")
+
         # Validate report category
         valid_categories = {"spam", "violation", "legal", "other"}
         if settings.REPORT_CATEGORY_DEFAULT not in valid_categories:
@@ -0,0 +1,154 @@
+"""Short-lived Redis cache of account status pages shared by every worker.
+
+The same account's statuses are fetched by the account scan, by analysis,
+by report and status webhooks, often within seconds of each other.
+``MastoClient.get_account_statuses`` keeps each response body here for
+``STATUS_CACHE_TTL`` seconds, zlib-compressed as received, in one hash per
+account (``status_cache:<account id>``, one field per token and query). A
+webhook about the account drops the hash, so no reader sees statuses older
+than the newest event. It also bumps the account's generation counter, and a
+page is only stored if the generation is unchanged since its fetch started, so
+a fetch in flight during the webhook cannot write its stale page back.
+
+Fetches are single-flight: the first worker to miss takes a short lock and
+fetches; others that miss meanwhile wait up to ``FLIGHT_WAIT`` seconds for its
+result instead of spending rate-limit budget on the same page.
+
+Redis failures never fail a fetch, and an unreadable cached page counts as a
+miss; the client just goes to the API.
+"""
+
+import hashlib
+import logging
+import secrets
+import time
+import zlib
+from collections.abc import Callable
+
+import redis
+from app.config import get_settings
+from app.metrics import redis_degraded, status_cache_requests
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+rcli = redis.from_url(settings.REDIS_URL)
+
+# Longest wait for another worker's fetch of the same page before fetching anyway.
+FLIGHT_WAIT = 2.0
+FLIGHT_POLL = 0.05
+# A fetch lock outlives a crashed holder by at most this long.
+FLIGHT_LOCK_TTL = 10
+# Generation counters outlive any fetch that could still be in flight.
+GENERATION_TTL = 3600
+
+_UNLOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+_unlock_script = rcli.register_script(_UNLOCK)
+
+# KEYS[1] account hash, KEYS[2] generation; ARGV: generation read before the fetch, field, value, ttl.
+# Stores the page only if the account was not invalidated since.
+_WRITE = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+_write_script = rcli.register_script(_WRITE)
+
+
+def _key(account_id: str) -> str:
+    return f"status_cache:{account_id}"
+
+
+def _generation_key(account_id: str) -> str:
+    return f"status_cache:{account_id}:gen"
+
+
+def signature(*parts) -> str:
+    """Field name of one query of an account's statuses."""
+    return hashlib.sha1(repr(parts).encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
+
+
+def _read(account_id: str, field: str) -> bytes | None:
+    value = rcli.hget(_key(account_id), field)
+    if value is None:
+        return None
+    fetched_at, _, body = value.partition(b"|")
+    try:
+        if time.time() - float(fetched_at) > settings.STATUS_CACHE_TTL:
+            return None
+        return zlib.decompress(body)
+    except (ValueError, zlib.error) as e:
+        logger.warning("Ignoring unreadable cached statuses of account %s: %s", account_id, e)
+        return None
+
+
+def _write(account_id: str, field: str, body: bytes, generation: bytes) -> None:
+    value = f"{time.time():.3f}|".encode() + zlib.compress(body)
+    _write_script(
+        keys=[_key(account_id), _generation_key(account_id)],
+        args=[generation, field, value, settings.STATUS_CACHE_TTL],
+    )
+
+
+def get_or_fetch(account_id: str, field: str, fetch: Callable[[], bytes]) -> bytes:
+    """Return the cached body of ``field`` or fetch it once for every waiting worker."""
+    if settings.STATUS_CACHE_TTL <= 0:
+        return fetch()
+    try:
+        body = _read(account_id, field)
+        if body is not None:
+            status_cache_requests.labels(outcome="hit").inc()
+            return body
+
+        lock = f"{_key(account_id)}:lock:{field}"
+        token = secrets.token_hex(8)
+        if not rcli.set(lock, token, nx=True, ex=FLIGHT_LOCK_TTL):
+            deadline = time.monotonic() + FLIGHT_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(FLIGHT_POLL)
+                body = _read(account_id, field)
+                if body is not None:
+                    status_cache_requests.labels(outcome="shared").inc()
+                    return body
+            token = None
+        generation = rcli.get(_generation_key(account_id)) or b""
+    except redis.RedisError as e:
+        redis_degraded.inc()
+        logger.warning("Status cache unavailable: %s", e)
+        return fetch()
+
+    status_cache_requests.labels(outcome="miss").inc()
+    try:
+        body = fetch()
+        _write(account_id, field, body, generation)
+        return body
+    except redis.RedisError as e:
+        redis_degraded.inc()
+        logger.warning("Could not store statuses of account %s: %s", account_id, e)
+        return body
+    finally:
+        if token:
+            try:
+                _unlock_script(keys=[lock], args=[token])
+            except redis.RedisError:
+                pass
+
+
+def invalidate(account_id: str) -> None:
+    """Drop every cached status page of ``account_id``, including pages still being fetched."""
+    try:
+        with rcli.pipeline(transaction=False) as pipe:
+            pipe.delete(_key(account_id))
+            pipe.incr(_generation_key(account_id))
+            pipe.expire(_generation_key(account_id), GENERATION_TTL)
+            pipe.execute()
+    except redis.RedisError as e:
+        redis_degraded.inc()
+        logger.warning("Could not invalidate statuses of account %s: %s", account_id, e)
@@ -3,14 +3,42 @@
 This module configures the Celery application with:
 - Database-backed beat scheduler for production reliability
 - Task execution settings optimized for moderation workloads
+- Dedicated queues, so backfill and maintenance never delay webhook-driven work
 - Scheduled tasks for polling and monitoring
 """
 
+from app import http_pool
 from app.config import get_settings
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+from kombu import Queue
 
 settings = get_settings()
 
+# Webhook handlers: seconds matter.
+REALTIME_QUEUE = "realtime"
+# Per-account analysis and enforcement fed by webhooks and polls.
+ANALYSIS_QUEUE = "analysis"
+# Long account polls and federated scans.
+BACKFILL_QUEUE = "backfill"
+# Periodic housekeeping.
+MAINTENANCE_QUEUE = "maintenance"
+TASK_QUEUES = (REALTIME_QUEUE, ANALYSIS_QUEUE, BACKFILL_QUEUE, MAINTENANCE_QUEUE)
+
+TASK_ROUTES = {
+    "app.tasks.jobs.process_new_status": {"queue": REALTIME_QUEUE},
+    "app.tasks.jobs.flush_status_burst": {"queue": REALTIME_QUEUE},
+    "app.tasks.jobs.process_new_report": {"queue": REALTIME_QUEUE},
+    "app.tasks.jobs.analyze_and_maybe_report": {"queue": ANALYSIS_QUEUE},
+    "app.tasks.jobs.analyze_and_maybe_report_batch": {"queue": ANALYSIS_QUEUE},
+    "app.tasks.jobs.poll_admin_accounts": {"queue": BACKFILL_QUEUE},
+    "app.tasks.jobs.poll_admin_accounts_local": {"queue": BACKFILL_QUEUE},
+    "app.tasks.jobs.scan_federated_content": {"queue": BACKFILL_QUEUE},
+    "app.tasks.jobs.check_domain_violations": {"queue": MAINTENANCE_QUEUE},
+    "app.tasks.jobs.process_expired_actions": {"queue": MAINTENANCE_QUEUE},
+    "app.tasks.jobs.record_queue_stats": {"queue": MAINTENANCE_QUEUE},
+}
+
 celery_app = Celery("mastowatch", broker=settings.REDIS_URL, backend=settings.REDIS_URL, include=["app.tasks.jobs"])
 
 # Configure celery for production use with database-backed beat scheduler
@@ -19,6 +47,11 @@ celery_app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=4,
+    # Queue routing; each worker deployment picks its queues with -Q and sets its
+    # own --concurrency and --prefetch-multiplier (see docker-compose.yml).
+    task_queues=[Queue(name) for name in TASK_QUEUES],
+    task_routes=TASK_ROUTES,
+    task_default_queue=MAINTENANCE_QUEUE,
     # Broker settings for reliability
     broker_transport_options={"visibility_timeout": 3600},
     # Use default PersistentScheduler with a writable schedule file location
@@ -47,3 +80,15 @@ celery_app.conf.update(
         },
     },
 )
+
+
+@worker_process_init.connect
+def _reset_http_pool(**_):
+    """Drop any HTTP pool inherited from the prefork parent; the child builds its own on first use."""
+    http_pool.reset()
+
+
+@worker_process_shutdown.connect
+def _close_http_pool(**_):
+    """Close pooled connections when a worker process exits."""
+    http_pool.close()
@@ -1,9 +1,14 @@
 import logging
+import random
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial, wraps
 from typing import Any
 
 import redis
+from app import rate_limit
 from app.config import get_settings
 from app.db import SessionLocal
 from app.mastodon_client import MastoClient
@@ -13,16 +18,25 @@ from app.metrics import (
     analysis_latency,
     cursor_lag_pages,
     queue_backlog,
+    rate_limit_deferrals,
+    redis_degraded,
     report_latency,
     reports_submitted,
+    status_burst_size,
 )
-from app.models import Account, Analysis, Cursor, Report, ScheduledAction
-from app.scanning import EnhancedScanningSystem
+from app.models import Account, Analysis, Cursor, DomainAlert, Report, ScheduledAction
+from app.rate_limit import RateLimited
+from app.scanning import EnhancedScanningSystem, ScanPlan
 from app.services.enforcement_service import EnforcementService
 from app.services.rule_service import rule_service
+from app.services.runtime_flags import runtime_flags
+from app.tasks import payload_store, status_bursts
+from app.tasks.celery_app import TASK_QUEUES
 from app.util import make_dedupe_key
 from celery import shared_task
-from sqlalchemy import insert, text
+from celery.exceptions import Ignore
+from celery.utils.time import get_exponential_backoff_interval
+from sqlalchemy import bindparam, insert, select, text, tuple_, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import func
 
@@ -35,6 +49,8 @@ CURSOR_NAME = "admin_accounts"
 CURSOR_NAME_LOCAL = "admin_accounts_local"
 
 MAX_HISTORY_STATUSES = 20
+# Status visibilities considered when analyzing an account's recent history.
+ANALYZABLE_VISIBILITY_TYPES = {"public", "unlisted"}
 
 
 def _get_admin_client():
@@ -47,37 +63,118 @@ def _get_bot_client():
     return MastoClient(settings.BOT_TOKEN)
 
 
+def _defer_when_rate_limited(fn):
+    """Run a bound task with a non-blocking rate limiter and re-enqueue it when limited.
+
+    Instead of sleeping in the worker until the bucket has room, the task is
+    sent again with a countdown and this run is dropped, so the worker process
+    can go on with tasks that use other buckets. Re-enqueueing, rather than
+    ``self.retry``, leaves the task's error retry budget untouched. The task is
+    sent with the keyword arguments it set on ``RateLimited.resume``, so work it
+    committed before it was limited is not done again.
+    """
+
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with rate_limit.nonblocking():
+            try:
+                return fn(self, *args, **kwargs)
+            except RateLimited as e:
+                _defer(self, e, args, {**kwargs, **e.resume})
+
+    return wrapper
+
+
+def _defer(self, e: RateLimited, args, kwargs):
+    """Send a bound task again once the rate-limit bucket has room, and drop this run."""
+    if self.request.called_directly:
+        raise e
+    # Spread the deferred tasks out so they do not all come back at the reset.
+    countdown = e.retry_after + random.uniform(0, min(e.retry_after, 10.0))
+    self.apply_async(args=args, kwargs=kwargs, countdown=countdown)
+    rate_limit_deferrals.labels(task=self.name).inc()
+    logging.info("%s deferred %.1fs: %s", self.name, countdown, e)
+    raise Ignore() from e
+
+
+def _retry(self, e: Exception, args, kwargs):
+    """Retry a bound task with new arguments, backing off like its ``autoretry_for`` retries."""
+    countdown = get_exponential_backoff_interval(
+        factor=int(max(1.0, self.retry_backoff)),
+        retries=self.request.retries,
+        maximum=self.retry_backoff_max,
+        full_jitter=self.retry_jitter,
+    )
+    raise self.retry(args=args, kwargs=kwargs, exc=e, countdown=countdown)
+
+
 def _should_pause():
-    # Honor PANIC_STOP from DB or env
-    if settings.PANIC_STOP:
-        return True
-    with SessionLocal() as db:
-        row = db.execute(text("SELECT value FROM config WHERE key='panic_stop'")).scalar()
-        if isinstance(row, dict):
-            return bool(row.get("enabled", False))
-    return False
+    # Honor PANIC_STOP from DB or env, without a query per task
+    return runtime_flags.panic_stop()
 
 
-def _persist_account(a: dict):
-    acct_obj = a.get("account") or {}
-    if not acct_obj:
-        return
-    acct = acct_obj.get("acct") or ""
-    domain = acct.split("@")[-1] if "@" in acct else "local"
+def _dry_run():
+    # Honor DRY_RUN from DB or env, without a query per task
+    return runtime_flags.dry_run()
+
+
+def _persist_accounts(admin_accounts: list[dict]) -> dict[str, int]:
+    """Upsert a page of admin accounts in one statement and transaction.
+
+    Returns:
+        Account primary keys by Mastodon account id
+
+    """
+    rows: dict[str, dict[str, Any]] = {}
+    for a in admin_accounts:
+        acct_obj = a.get("account") or {}
+        if not acct_obj.get("id"):
+            continue
+        acct = acct_obj.get("acct") or ""
+        domain = acct.split("@")[-1] if "@" in acct else "local"
+        # One row per account: ON CONFLICT cannot touch the same row twice in a statement.
+        rows[acct_obj["id"]] = dict(mastodon_account_id=acct_obj["id"], acct=acct, domain=domain)
+    if not rows:
+        return {}
     with SessionLocal() as db:
-        stmt = (
-            pg_insert(Account)
-            .values(mastodon_account_id=acct_obj.get("id"), acct=acct, domain=domain)
-            .on_conflict_do_update(
-                index_elements=["mastodon_account_id"],
-                set_=dict(acct=acct, domain=domain, last_checked_at=func.now()),
-            )
-        )
-        db.execute(stmt)
+        stmt = pg_insert(Account).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["mastodon_account_id"],
+            set_=dict(acct=stmt.excluded.acct, domain=stmt.excluded.domain, last_checked_at=func.now()),
+        ).returning(Account.mastodon_account_id, Account.id)
+        ids = dict(db.execute(stmt).all())
         db.commit()
+    return ids
+
+
+def _scan_polled_account(
+    enhanced_scanner: EnhancedScanningSystem,
+    account_data: dict,
+    session_id: int,
+    account_ids: dict[str, int],
+    plans: dict[str, ScanPlan],
+) -> dict | None:
+    """Scan one persisted admin account; returns its scan result, or None if it was not scanned."""
+    try:
+        account = account_data.get("account", {})
+        account_id = account.get("id")
+        # Runs in a pool thread, which does not inherit the poll's traffic class.
+        with rate_limit.traffic_class(rate_limit.BACKFILL):
+            return enhanced_scanner.scan_account_efficiently(
+                account, session_id, account_pk=account_ids.get(account_id), plan=plans[account_id]
+            )
+
+    except Exception as e:
+        logging.error(f"Error processing account: {e}")
+        return None
 
 
 def _poll_accounts(origin: str, cursor_name: str):
+    with rate_limit.traffic_class(rate_limit.BACKFILL):
+        _poll_account_pages(origin, cursor_name)
+
+
+def _poll_account_pages(origin: str, cursor_name: str):
     if _should_pause():
         logging.warning(f"PANIC_STOP enabled; skipping {origin} account poll")
         return
@@ -92,52 +189,69 @@ def _poll_accounts(origin: str, cursor_name: str):
         pages = 0
         next_max = pos
         accounts_processed = 0
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.SCAN_CONCURRENCY), thread_name_prefix=f"poll-{origin}"
+        ) as pool:
+            while pages < settings.MAX_PAGES_PER_POLL:
+                accounts, new_next = enhanced_scanner.get_next_accounts_to_scan(
+                    origin, limit=settings.BATCH_SIZE, cursor=next_max
+                )
 
-        while pages < settings.MAX_PAGES_PER_POLL:
-            accounts, new_next = enhanced_scanner.get_next_accounts_to_scan(
-                origin, limit=settings.BATCH_SIZE, cursor=next_max
-            )
-
-            next_max = new_next
+                next_max = new_next
 
-            if not accounts:
-                break
+                if not accounts:
+                    break
 
-            for account_data in accounts:
                 try:
-                    _persist_account(account_data)
-
-                    scan_result = enhanced_scanner.scan_account_efficiently(account_data.get("account", {}), session_id)
-
-                    if scan_result:
-                        accounts_processed += 1
-                        if scan_result.get("score", 0) > 0:
-                            analyze_and_maybe_report.delay(
-                                {
-                                    "account": account_data.get("account"),
-                                    "admin_obj": account_data,
-                                    "scan_result": scan_result,
-                                }
-                            )
-
+                    account_ids = _persist_accounts(accounts)
                 except Exception as e:
-                    logging.error(f"Error processing account: {e}")
-
-            with SessionLocal() as db:
-                stmt = pg_insert(Cursor).values(name=cursor_name, position=new_next)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["name"],
-                    set_=dict(position=new_next, updated_at=func.now()),
+                    logging.error(f"Error persisting {origin} account page: {e}")
+                    account_ids = {}
+
+                # One freshness query for the whole page instead of one per account.
+                plans = enhanced_scanner.accounts_needing_scan([a.get("account", {}) for a in accounts])
+                to_scan = [a for a in accounts if a.get("account", {}).get("id") in plans]
+
+                # Every MastoClient call still goes through the shared Redis rate-limit bucket.
+                # Wait for the whole page before moving the cursor past it.
+                scan = partial(
+                    _scan_polled_account,
+                    enhanced_scanner,
+                    session_id=session_id,
+                    account_ids=account_ids,
+                    plans=plans,
                 )
-                db.execute(stmt)
-                db.commit()
+                results = list(pool.map(scan, to_scan))
+                accounts_processed += sum(1 for r in results if r)
+
+                # One analysis task per page, carrying only what analysis reads. Incremental
+                # scans return only hits not analyzed before, so accounts without any are left out.
+                flagged = [
+                    {
+                        "account": {"id": a["account"]["id"], "acct": a["account"].get("acct", "")},
+                        "scan_result": {"score": r["score"], "rule_hits": r.get("rule_hits", [])},
+                    }
+                    for a, r in zip(to_scan, results, strict=True)
+                    if r and r.get("score", 0) > 0 and r.get("rule_hits")
+                ]
+                if flagged:
+                    analyze_and_maybe_report_batch.delay(flagged)
+
+                with SessionLocal() as db:
+                    stmt = pg_insert(Cursor).values(name=cursor_name, position=new_next)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["name"],
+                        set_=dict(position=new_next, updated_at=func.now()),
+                    )
+                    db.execute(stmt)
+                    db.commit()
 
-            cursor_lag_pages.labels(cursor=cursor_name).set(1.0 if new_next else 0.0)
+                cursor_lag_pages.labels(cursor=cursor_name).set(1.0 if new_next else 0.0)
 
-            if not new_next:
-                break
+                if not new_next:
+                    break
 
-            pages += 1
+                pages += 1
 
         enhanced_scanner.complete_scan_session(session_id)
         logging.info(
@@ -176,11 +290,14 @@ def poll_admin_accounts_local():
 @shared_task(name="app.tasks.jobs.record_queue_stats")
 def record_queue_stats():
     try:
-        q = "celery"
         r = redis.from_url(settings.REDIS_URL, decode_responses=False)
-        # Celery default redis backend uses 'celery' list for queue
-        backlog = r.llen(q)
-        queue_backlog.labels(queue=q).set(float(backlog))
+        # The Redis broker keeps each queue in a list named after it
+        with r.pipeline(transaction=False) as pipe:
+            for q in TASK_QUEUES:
+                pipe.llen(q)
+            backlogs = pipe.execute()
+        for q, backlog in zip(TASK_QUEUES, backlogs, strict=True):
+            queue_backlog.labels(queue=q).set(float(backlog))
     except Exception as e:
         logging.warning("record_queue_stats: %s", e)
 
@@ -201,7 +318,8 @@ def scan_federated_content(target_domains=None):
     enhanced_scanner = EnhancedScanningSystem()
 
     try:
-        results = enhanced_scanner.scan_federated_content(target_domains)
+        with rate_limit.traffic_class(rate_limit.BACKFILL):
+            results = enhanced_scanner.scan_federated_content(target_domains)
         logging.info(f"Federated scan completed: {results}")
         return results
     except Exception as e:
@@ -243,19 +361,186 @@ def check_domain_violations():
         raise
 
 
+def _rule_name(rule_key: str) -> str:
+    return rule_key.split("/", 1)[1] if "/" in rule_key else rule_key
+
+
+def _account_domain(acct: dict) -> str:
+    return acct.get("acct", "").split("@")[-1] if "@" in acct.get("acct", "") else "local"
+
+
+def _analysis_rows(acct_id: str, hits: list[tuple]) -> list[dict[str, Any]]:
+    return [
+        dict(mastodon_account_id=acct_id, status_id=ev.get("status_id"), rule_key=rk, score=w, evidence=ev)
+        for rk, w, ev in hits
+    ]
+
+
+def _record_analyses(db, rows: list[dict[str, Any]]) -> None:
+    """Insert analysis rows in one executemany and count them per rule.
+
+    The statement is compiled once for all rows, and psycopg pipelines the
+    executemany, so a page of hits costs one round trip instead of one per hit.
+    """
+    if rows:
+        db.execute(insert(Analysis), rows)
+    for rule_key, count in Counter(row["rule_key"] for row in rows).items():
+        analyses_flagged.labels(rule=rule_key).inc(count)
+
+
+def _schedule_reversals(db, reversals: dict[tuple[str, str], datetime]) -> None:
+    """Upsert the reversals of timed actions, keeping the later expiry per account and action."""
+    pair = tuple_(ScheduledAction.mastodon_account_id, ScheduledAction.action_to_reverse)
+    existing = db.execute(
+        select(ScheduledAction.id, ScheduledAction.mastodon_account_id, ScheduledAction.action_to_reverse).where(
+            pair.in_(list(reversals))
+        )
+    ).all()
+    extend = [
+        {"row_id": row.id, "new_expires_at": reversals[(row.mastodon_account_id, row.action_to_reverse)]}
+        for row in existing
+    ]
+    if extend:
+        db.execute(
+            update(ScheduledAction)
+            .where(ScheduledAction.id == bindparam("row_id"))
+            .values(expires_at=func.greatest(ScheduledAction.expires_at, bindparam("new_expires_at"))),
+            extend,
+        )
+    scheduled = {(row.mastodon_account_id, row.action_to_reverse) for row in existing}
+    new = [
+        dict(mastodon_account_id=acct_id, action_to_reverse=action, expires_at=expires)
+        for (acct_id, action), expires in reversals.items()
+        if (acct_id, action) not in scheduled
+    ]
+    if new:
+        db.execute(insert(ScheduledAction), new)
+
+
+def _enforce_rule_actions(
+    enforcement_service: EnforcementService,
+    acct_id: str,
+    violated_rule_names: set[str],
+    rule_map: dict[str, Any],
+    rule_evidence_map: dict[str, dict[str, Any]],
+    performed: set[str] | None = None,
+    schedule_reversals: bool = False,
+) -> None:
+    """Apply the warn, silence and suspend actions of the violated rules, each at most once.
+
+    Action types in ``performed`` are skipped; each action applied is added to it.
+    With ``schedule_reversals``, the reversal of every timed silence or suspension
+    applied here is scheduled, also when a later action fails.
+    """
+    performed = set() if performed is None else performed
+    applied_before = set(performed)
+    try:
+        # A fixed order, so a deferred retry resumes with the same remaining actions.
+        for name in sorted(violated_rule_names):
+            rule = rule_map.get(name)
+            if not rule or rule.action_type not in ("warn", "silence", "suspend") or rule.action_type in performed:
+                continue
+            enforce = {
+                "warn": enforcement_service.warn_account,
+                "silence": enforcement_service.silence_account,
+                "suspend": enforcement_service.suspend_account,
+            }[rule.action_type]
+            enforce(
+                acct_id,
+                text=rule.action_warning_text,
+                warning_preset_id=rule.warning_preset_id,
+                rule_id=rule.id,
+                evidence=rule_evidence_map.get(name),
+            )
+            performed.add(rule.action_type)
+    finally:
+        applied = performed - applied_before
+        if schedule_reversals and applied:
+            now = datetime.utcnow()
+            reversals: dict[tuple[str, str], datetime] = {}
+            for action, duration in _timed_actions(violated_rule_names, rule_map):
+                if action in applied:
+                    expires = now + timedelta(seconds=duration)
+                    reversals[(acct_id, action)] = max(expires, reversals.get((acct_id, action), expires))
+            if reversals:
+                with SessionLocal() as db:
+                    _schedule_reversals(db, reversals)
+                    db.commit()
+
+
+def _timed_actions(violated_rule_names: set[str], rule_map: dict[str, Any]) -> list[tuple[str, int]]:
+    """Return the (action, duration) of the violated rules whose silence or suspension expires."""
+    timed = []
+    for name in violated_rule_names:
+        rule = rule_map.get(name)
+        if rule and rule.action_type in ("silence", "suspend") and rule.action_duration_seconds:
+            timed.append((rule.action_type, rule.action_duration_seconds))
+    return timed
+
+
+def _report_fields(acct_id: str, score: float, hits: list[tuple], ruleset_sha: str) -> tuple[list[str], str, str]:
+    """Return the status ids, comment and dedupe key of an automatic report."""
+    status_ids = [h[2].get("status_id") for h in hits if h[2].get("status_id")]
+    comment = f"[AUTO] score={score:.2f}; hits=" + ", ".join(h[0] for h in hits)
+    dedupe = make_dedupe_key(
+        acct_id,
+        status_ids,
+        settings.POLICY_VERSION,
+        ruleset_sha,
+        {"hit_count": len(hits)},
+    )
+    return status_ids, comment, dedupe
+
+
+def _submit_report(acct: dict, comment: str, status_ids: list[str], dedupe: str) -> None:
+    """Send a report stored under ``dedupe`` and record its Mastodon id."""
+    forward = settings.FORWARD_REMOTE_REPORTS if "@" in acct.get("acct", "") else False
+    result = _get_bot_client().create_report(
+        account_id=acct["id"],
+        comment=comment,
+        status_ids=status_ids,
+        category=settings.REPORT_CATEGORY_DEFAULT,
+        forward=forward,
+        rule_ids=None,
+    )
+    with SessionLocal() as db:
+        db.execute(
+            text("UPDATE reports SET mastodon_report_id = :rid WHERE dedupe_key = :dk"),
+            {"rid": result["id"], "dk": dedupe},
+        )
+        db.commit()
+
+
 @shared_task(
     name="app.tasks.jobs.analyze_and_maybe_report",
+    bind=True,
     autoretry_for=(Exception,),
     retry_backoff=2,
     retry_backoff_max=60,
     retry_jitter=True,
 )
-def analyze_and_maybe_report(payload: dict):
+@_defer_when_rate_limited
+@payload_store.resolved
+def analyze_and_maybe_report(
+    self, payload: dict, persisted: bool = False, enforced: list[str] = (), dedupe_key: str | None = None
+):
+    """Analyze one account and act on its violations.
+
+    Polled pages go to ``analyze_and_maybe_report_batch``. This task stays
+    registered for single accounts enqueued by name, such as messages still
+    queued from before the batch task existed.
+
+    A run deferred by the rate limiter is sent again with what it already did:
+    ``persisted`` once the analyses are written, the action types applied under
+    ``enforced``, and the ``dedupe_key`` of a stored report left to submit.
+    """
+    performed = set(enforced)
     try:
         if _should_pause():
             logging.warning("PANIC_STOP enabled; skipping analyze/report")
             return
         started = time.time()
+        dry_run = _dry_run()
 
         # Allow both raw admin object or normalized dict
         acct = payload.get("account") or payload.get("admin_obj", {}).get("account") or {}
@@ -271,9 +556,7 @@ def analyze_and_maybe_report(payload: dict):
         if cached_result:
             score = cached_result.get("score", 0)
             hits = [(h["rule"], h["weight"], h["evidence"]) for h in cached_result.get("rule_hits", [])]
-            for rk, _, _ in hits:
-                name = rk.split("/", 1)[1] if "/" in rk else rk
-                violated_rule_names.add(name)
+            violated_rule_names = {_rule_name(rk) for rk, _, _ in hits}
         else:
             statuses = admin_client.get_account_statuses(account_id=acct_id, limit=settings.MAX_STATUSES_TO_FETCH)
             violations = rule_service.evaluate_account(acct, statuses)
@@ -283,7 +566,7 @@ def analyze_and_maybe_report(payload: dict):
 
         rule_evidence_map: dict[str, dict[str, Any]] = {}
         for rk, _, ev in hits:
-            name = rk.split("/", 1)[1] if "/" in rk else rk
+            name = _rule_name(rk)
             if name not in rule_evidence_map:
                 rule_evidence_map[name] = ev
 
@@ -293,172 +576,233 @@ def analyze_and_maybe_report(payload: dict):
         if not hits:
             return
 
-        with SessionLocal() as db:
-            for rk, w, ev in hits:
-                db.execute(
-                    insert(Analysis).values(
-                        mastodon_account_id=acct_id,
-                        status_id=ev.get("status_id"),
-                        rule_key=rk,
-                        score=w,
-                        evidence=ev,
-                    )
-                )
-                analyses_flagged.labels(rule=rk).inc()
-            db.commit()
+        if not persisted:
+            with SessionLocal() as db:
+                _record_analyses(db, _analysis_rows(acct_id, hits))
+                db.commit()
+            persisted = True
 
         rules, config, ruleset_sha = rule_service.get_active_rules()
         rule_map = {r.name: r for r in rules}
 
-        def schedule(action: str, duration: int) -> None:
-            expires = datetime.utcnow() + timedelta(seconds=duration)
-            with SessionLocal() as db:
-                existing = (
-                    db.query(ScheduledAction)
-                    .filter_by(mastodon_account_id=acct_id, action_to_reverse=action)
-                    .one_or_none()
-                )
-                if existing:
-                    if expires > existing.expires_at:
-                        existing.expires_at = expires
-                else:
-                    db.add(
-                        ScheduledAction(
-                            mastodon_account_id=acct_id,
-                            action_to_reverse=action,
-                            expires_at=expires,
-                        )
-                    )
-                db.commit()
-
-        performed: set[str] = set()
-        for name in violated_rule_names:
-            rule = rule_map.get(name)
-            if not rule:
-                continue
-            evidence = rule_evidence_map.get(name)
-            action = rule.action_type
-            if action == "warn" and "warn" not in performed:
-                enforcement_service.warn_account(
-                    acct_id,
-                    text=rule.action_warning_text,
-                    warning_preset_id=rule.warning_preset_id,
-                    rule_id=rule.id,
-                    evidence=evidence,
-                )
-                performed.add("warn")
-            elif action == "silence":
-                if "silence" not in performed:
-                    enforcement_service.silence_account(
-                        acct_id,
-                        text=rule.action_warning_text,
-                        warning_preset_id=rule.warning_preset_id,
-                        rule_id=rule.id,
-                        evidence=evidence,
-                    )
-                    performed.add("silence")
-                if not settings.DRY_RUN and rule.action_duration_seconds:
-                    schedule("silence", rule.action_duration_seconds)
-            elif action == "suspend":
-                if "suspend" not in performed:
-                    enforcement_service.suspend_account(
-                        acct_id,
-                        text=rule.action_warning_text,
-                        warning_preset_id=rule.warning_preset_id,
-                        rule_id=rule.id,
-                        evidence=evidence,
-                    )
-                    performed.add("suspend")
-                if not settings.DRY_RUN and rule.action_duration_seconds:
-                    schedule("suspend", rule.action_duration_seconds)
+        # A stored report left to submit means enforcement already finished.
+        if not dedupe_key:
+            _enforce_rule_actions(
+                enforcement_service,
+                acct_id,
+                violated_rule_names,
+                rule_map,
+                rule_evidence_map,
+                performed,
+                schedule_reversals=not dry_run,
+            )
 
         if float(score) < float(config.get("report_threshold", 1.0)):
             return
 
-        # Track domain violation
-        domain = acct.get("acct", "").split("@")[-1] if "@" in acct.get("acct", "") else "local"
-        if domain != "local":
-            enhanced_scanner = EnhancedScanningSystem()
-            enhanced_scanner._track_domain_violation(domain)
-
+        domain = _account_domain(acct)
         # Prepare report
-        status_ids = [h[2].get("status_id") for h in hits if h[2].get("status_id")]
-        comment = f"[AUTO] score={score:.2f}; hits=" + ", ".join(h[0] for h in hits)
-        dedupe = make_dedupe_key(
-            acct_id,
-            status_ids,
-            settings.POLICY_VERSION,
-            ruleset_sha,
-            {"hit_count": len(hits)},
-        )
-
-        stmt = (
-            pg_insert(Report)
-            .values(
-                mastodon_account_id=acct_id,
-                status_id=status_ids[0] if status_ids else None,
-                mastodon_report_id=None,
-                dedupe_key=dedupe,
-                comment=comment,
-            )
-            .on_conflict_do_nothing(index_elements=["dedupe_key"])
-            .returning(Report.id)
-        )
-
-        with SessionLocal() as db:
-            inserted_id = db.execute(stmt).scalar_one_or_none()
-            db.commit()
-            if inserted_id is None:
-                return
-
-        if settings.DRY_RUN:
-            logging.info(
-                "DRY-RUN report acct=%s score=%.2f hits=%d",
-                acct.get("acct"),
-                score,
-                len(hits),
+        status_ids, comment, dedupe = _report_fields(acct_id, score, hits, ruleset_sha)
+
+        if not dedupe_key:
+            # Track domain violation
+            if domain != "local":
+                enhanced_scanner = EnhancedScanningSystem()
+                enhanced_scanner._track_domain_violation(domain)
+
+            stmt = (
+                pg_insert(Report)
+                .values(
+                    mastodon_account_id=acct_id,
+                    status_id=status_ids[0] if status_ids else None,
+                    mastodon_report_id=None,
+                    dedupe_key=dedupe,
+                    comment=comment,
+                )
+                .on_conflict_do_nothing(index_elements=["dedupe_key"])
+                .returning(Report.id)
             )
-            return
-
-        category = settings.REPORT_CATEGORY_DEFAULT
-        forward = settings.FORWARD_REMOTE_REPORTS if "@" in acct.get("acct", "") else False
-
-        bot = _get_bot_client()
-        result = bot.create_report(
-            account_id=acct_id,
-            comment=comment,
-            status_ids=status_ids,
-            category=category,
-            forward=forward,
-            rule_ids=None,
-        )
-        rep_id = result["id"]
 
-        with SessionLocal() as db:
-            from sqlalchemy import text
+            with SessionLocal() as db:
+                inserted_id = db.execute(stmt).scalar_one_or_none()
+                db.commit()
+                if inserted_id is None:
+                    return
 
-            db.execute(
-                text("UPDATE reports SET mastodon_report_id = :rid WHERE dedupe_key = :dk"),
-                {"rid": rep_id, "dk": dedupe},
-            )
-            db.commit()
+            if dry_run:
+                logging.info(
+                    "DRY-RUN report acct=%s score=%.2f hits=%d",
+                    acct.get("acct"),
+                    score,
+                    len(hits),
+                )
+                return
+            dedupe_key = dedupe
 
+        _submit_report(acct, comment, status_ids, dedupe_key)
         reports_submitted.labels(domain=domain).inc()
         report_latency.observe(max(0.0, time.time() - started))
 
+    except RateLimited as e:
+        e.resume = {"persisted": persisted, "enforced": sorted(performed), "dedupe_key": dedupe_key}
+        raise
     except Exception as e:
         logging.exception("analyze_and_maybe_report error: %s", e)
         raise
 
 
+@shared_task(
+    name="app.tasks.jobs.analyze_and_maybe_report_batch",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=2,
+    retry_backoff_max=60,
+    retry_jitter=True,
+)
+def analyze_and_maybe_report_batch(self, payloads: list[dict], persisted: bool = False):
+    """Analyze a page of polled accounts whose ``scan_result`` is already known.
+
+    Each payload is ``{"account": {"id", "acct"}, "scan_result": {"score",
+    "rule_hits"}}``. The analyses, report dedupe rows and domain violation
+    counts of the whole page are written with a few set-based statements in one
+    transaction; enforcement, the reversal of the timed actions it applied, and
+    report submission then run account by account. When the rate limiter stops
+    that second part, the remaining accounts are sent again with
+    ``persisted=True`` and the dedupe key of their new report, so the committed
+    writes are not repeated. The account that was limited also carries the
+    action types it already got under ``enforced``, so its enforcement resumes
+    where it stopped. Accounts that fail otherwise are retried the same way once
+    the rest of the page is done.
+    """
+    with rate_limit.nonblocking():
+        if _should_pause():
+            logging.warning("PANIC_STOP enabled; skipping batch analyze/report")
+            return
+        started = time.time()
+        dry_run = _dry_run()
+
+        rules, config, ruleset_sha = rule_service.get_active_rules()
+        rule_map = {r.name: r for r in rules}
+        threshold = float(config.get("report_threshold", 1.0))
+
+        flagged = []
+        for payload in payloads:
+            acct = payload.get("account") or {}
+            result = payload.get("scan_result") or {}
+            hits = [(h["rule"], h["weight"], h["evidence"]) for h in result.get("rule_hits", [])]
+            if acct.get("id") and hits:
+                flagged.append((payload, acct, hits, float(result.get("score", 0))))
+
+        if not persisted:
+            accounts_scanned.inc(len(payloads))
+            analysis_latency.observe(max(0.0, time.time() - started))
+            if not flagged:
+                return
+
+            analyses = []
+            reports: dict[str, dict[str, Any]] = {}
+            domains: Counter[str] = Counter()
+            for payload, acct, hits, score in flagged:
+                analyses.extend(_analysis_rows(acct["id"], hits))
+                if score < threshold:
+                    continue
+                if _account_domain(acct) != "local":
+                    domains[_account_domain(acct)] += 1
+                status_ids, comment, dedupe = _report_fields(acct["id"], score, hits, ruleset_sha)
+                reports[dedupe] = dict(
+                    mastodon_account_id=acct["id"],
+                    status_id=status_ids[0] if status_ids else None,
+                    mastodon_report_id=None,
+                    dedupe_key=dedupe,
+                    comment=comment,
+                )
+                payload["dedupe_key"] = dedupe
+
+            with SessionLocal() as db:
+                _record_analyses(db, analyses)
+                if domains:
+                    stmt = pg_insert(DomainAlert).values(
+                        [dict(domain=d, violation_count=n, last_violation_at=func.now()) for d, n in domains.items()]
+                    )
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["domain"],
+                        set_=dict(
+                            violation_count=DomainAlert.violation_count + stmt.excluded.violation_count,
+                            last_violation_at=func.now(),
+                        ),
+                    )
+                    db.execute(stmt)
+                inserted: set[str] = set()
+                if reports:
+                    stmt = (
+                        pg_insert(Report)
+                        .values(list(reports.values()))
+                        .on_conflict_do_nothing(index_elements=["dedupe_key"])
+                        .returning(Report.dedupe_key)
+                    )
+                    inserted = set(db.execute(stmt).scalars())
+                db.commit()
+
+            for payload, *_ in flagged:
+                # Only reports new to this batch are submitted.
+                if payload.get("dedupe_key") not in inserted or dry_run:
+                    payload.pop("dedupe_key", None)
+
+        enforcement_service = EnforcementService(mastodon_client=_get_admin_client())
+        failed: list[dict] = []
+        error: Exception | None = None
+        for i, (payload, acct, hits, score) in enumerate(flagged):
+            performed = set(payload.get("enforced", ()))
+            try:
+                violated_rule_names = {_rule_name(rk) for rk, _, _ in hits}
+                rule_evidence_map: dict[str, dict[str, Any]] = {}
+                for rk, _, ev in hits:
+                    rule_evidence_map.setdefault(_rule_name(rk), ev)
+                _enforce_rule_actions(
+                    enforcement_service,
+                    acct["id"],
+                    violated_rule_names,
+                    rule_map,
+                    rule_evidence_map,
+                    performed,
+                    schedule_reversals=not dry_run,
+                )
+
+                if score < threshold:
+                    continue
+                if dry_run:
+                    logging.info("DRY-RUN report acct=%s score=%.2f hits=%d", acct.get("acct"), score, len(hits))
+                    continue
+                dedupe = payload.get("dedupe_key")
+                if dedupe:
+                    status_ids, comment, _ = _report_fields(acct["id"], score, hits, ruleset_sha)
+                    _submit_report(acct, comment, status_ids, dedupe)
+                    reports_submitted.labels(domain=_account_domain(acct)).inc()
+                    report_latency.observe(max(0.0, time.time() - started))
+            except RateLimited as e:
+                # The limited account is sent again with the actions it already got, so none is repeated.
+                payload["enforced"] = sorted(performed)
+                _defer(self, e, (failed + [p for p, *_ in flagged[i:]],), {"persisted": True})
+            except Exception as e:
+                # The page's writes are committed, so only the failed accounts are retried, from where they stopped.
+                logging.exception("analyze_and_maybe_report_batch error for account %s: %s", acct["id"], e)
+                payload["enforced"] = sorted(performed)
+                failed.append(payload)
+                error = e
+        if error is not None:
+            _retry(self, error, (failed,), {"persisted": True})
+
+
 @shared_task(
     name="app.tasks.jobs.process_expired_actions",
+    bind=True,
     autoretry_for=(Exception,),
     retry_backoff=2,
     retry_backback_max=60,
     retry_jitter=True,
 )
-def process_expired_actions():
+@_defer_when_rate_limited
+def process_expired_actions(self):
     """Processes scheduled actions that have expired and reverses them."""
     logging.info("Running process_expired_actions task...")
 
@@ -483,6 +827,10 @@ def process_expired_actions():
                 logging.info(
                     f"Successfully reversed and deleted scheduled action for account {action.mastodon_account_id}"
                 )
+            except RateLimited:
+                # Keep this and the remaining actions queued for the rescheduled run.
+                session.rollback()
+                raise
             except Exception as e:
                 logging.error(f"Error reversing action for account {action.mastodon_account_id}: {e}")
                 session.rollback()  # Rollback in case of error to keep the action in the queue
@@ -490,14 +838,21 @@ def process_expired_actions():
 
 @shared_task(
     name="app.tasks.jobs.process_new_report",
+    bind=True,
     autoretry_for=(Exception,),
     retry_backoff=2,
     retry_backoff_max=60,
     retry_jitter=True,
 )
-def process_new_report(report_payload: dict):
-    """Processes a new report webhook payload."""
+@_defer_when_rate_limited
+@payload_store.resolved
+def process_new_report(self, report_payload: dict, enforced: list[str] = ()):
+    """Processes a new report webhook payload.
+
+    ``enforced`` names the rules whose actions a deferred run already applied.
+    """
     logging.info(f"Processing new report: {report_payload.get('id')}")
+    performed = set(enforced)
     try:
         if _should_pause():
             logging.warning("PANIC_STOP enabled; skipping new report processing")
@@ -530,6 +885,8 @@ def process_new_report(report_payload: dict):
                 )
                 statuses = [s for s in account_statuses if s.get("id") in status_ids]
                 break  # Assuming we only need to fetch once
+            except RateLimited:
+                raise
             except Exception as e:
                 logging.warning(f"Could not fetch statuses for report {report_data.get('id')}: {e}")
 
@@ -539,6 +896,8 @@ def process_new_report(report_payload: dict):
         if violations:
             logging.info(f"Report {report_data.get('id')} triggered {len(violations)} violations.")
             for violation in violations:
+                if violation.rule_name in performed:
+                    continue
                 logging.info(
                     f"  Violation: {violation.rule_name}, Score: {violation.score}, Action: {violation.action_type}"
                 )
@@ -552,7 +911,8 @@ def process_new_report(report_payload: dict):
                         "mastodon_report_id"
                     ):  # Assuming this field indicates if it's already reported
                         logging.info(
-                            f"Attempting to perform automated report for account {account_data['id']} due to rule {violation.rule_name}"
+                            f"Attempting to perform automated report for account {account_data['id']} "
+                            f"due to rule {violation.rule_name}"
                         )
                         enforcement_service.perform_account_action(
                             account_id=account_data["id"],
@@ -569,7 +929,8 @@ def process_new_report(report_payload: dict):
                     "domain_block",
                 ]:
                     logging.info(
-                        f"Attempting to perform automated action {violation.action_type} for account {account_data['id']} due to rule {violation.rule_name}"
+                        f"Attempting to perform automated action {violation.action_type} "
+                        f"for account {account_data['id']} due to rule {violation.rule_name}"
                     )
                     enforcement_service.perform_account_action(
                         account_id=account_data["id"],
@@ -579,24 +940,126 @@ def process_new_report(report_payload: dict):
                         warning_text=violation.action_warning_text,  # Pass warning text if applicable
                         warning_preset_id=violation.warning_preset_id,  # Pass warning preset if applicable
                     )
+                performed.add(violation.rule_name)
         else:
             logging.info(f"Report {report_data.get('id')} did not trigger any violations.")
 
+    except RateLimited as e:
+        e.resume = {"enforced": sorted(performed)}
+        raise
     except Exception as e:
         logging.exception(f"Error processing new report: {e}")
         raise
 
 
+def new_status_context(admin_client: MastoClient, account_data: dict, new_statuses: list[dict]):
+    """Return the (account, statuses) pair to evaluate for statuses an account just posted.
+
+    The new statuses come first, followed by the account's recent analyzable
+    history; ``recent_public_statuses`` lists the public ones.
+    """
+    history = admin_client.get_account_statuses(
+        account_id=account_data["id"],
+        limit=MAX_HISTORY_STATUSES,
+        exclude_reblogs=True,
+    )
+    history = [s for s in history if s.get("visibility") in ANALYZABLE_VISIBILITY_TYPES]
+    combined = []
+    seen = set()
+    for s in new_statuses:
+        if s.get("id") not in seen:
+            combined.append(s)
+            seen.add(s.get("id"))
+    for s in history:
+        s_id = s.get("id")
+        if s_id and s_id not in seen:
+            combined.append(s)
+            seen.add(s_id)
+    public_only = [s for s in combined if s.get("visibility") == "public"]
+    return {**account_data, "recent_public_statuses": public_only}, combined
+
+
+def act_on_status_violations(
+    enforcement_service: EnforcementService,
+    account_data: dict,
+    status_ids: list[str],
+    violations: list,
+    performed: set[str] | None = None,
+) -> None:
+    """Apply the actions of violations found in newly posted statuses.
+
+    Violations of rules named in ``performed`` are skipped; each rule acted on is added to it.
+    """
+    performed = set() if performed is None else performed
+    label = ", ".join(str(s_id) for s_id in status_ids)
+    if not violations:
+        logging.info(f"Status {label} did not trigger any violations.")
+        return
+
+    logging.info(f"Status {label} triggered {len(violations)} violations.")
+    for violation in violations:
+        if violation.rule_name in performed:
+            continue
+        # With coalesced bursts several new statuses are evaluated at once; keep the ones the rule matched.
+        matched_ids = [s_id for s_id in status_ids if s_id and s_id in violation.evidence.matched_status_ids]
+        logging.info(
+            f"  Violation: {violation.rule_name}, Score: {violation.score}, Action: {violation.action_type}, "
+            f"Statuses: {', '.join(matched_ids) or 'account-level'}"
+        )
+
+        # Decide on action based on the rule's action_type and trigger_threshold
+        if violation.action_type in [
+            "silence",
+            "suspend",
+            "disable",
+            "sensitive",
+            "domain_block",
+        ]:
+            logging.info(
+                f"Attempting to perform automated action {violation.action_type} "
+                f"for account {account_data['id']} due to rule {violation.rule_name}"
+            )
+            enforcement_service.perform_account_action(
+                account_id=account_data["id"],
+                action_type=violation.action_type,
+                comment=f"Automated action: {violation.rule_name} (Score: {violation.score})",
+                duration=violation.action_duration_seconds,  # Pass duration if applicable
+                warning_text=violation.action_warning_text,  # Pass warning text if applicable
+                warning_preset_id=violation.warning_preset_id,  # Pass warning preset if applicable
+            )
+        elif violation.action_type == "report":
+            # For status-triggered reports, create a new report
+            logging.info(
+                f"Attempting to create automated report for account {account_data['id']} "
+                f"due to rule {violation.rule_name}"
+            )
+            enforcement_service.perform_account_action(
+                account_id=account_data["id"],
+                action_type=violation.action_type,
+                comment=f"Automated report: {violation.rule_name} (Score: {violation.score})",
+                # Report the specific statuses
+                status_ids=matched_ids or [s_id for s_id in status_ids if s_id],
+            )
+        performed.add(violation.rule_name)
+
+
 @shared_task(
     name="app.tasks.jobs.process_new_status",
+    bind=True,
     autoretry_for=(Exception,),
     retry_backoff=2,
     retry_backoff_max=60,
     retry_jitter=True,
 )
-def process_new_status(status_payload: dict):
-    """Processes a new status webhook payload for high-speed analysis."""
+@_defer_when_rate_limited
+@payload_store.resolved
+def process_new_status(self, status_payload: dict, enforced: list[str] = ()):
+    """Processes a new status webhook payload for high-speed analysis.
+
+    ``enforced`` names the rules whose actions a deferred run already applied.
+    """
     logging.info(f"Processing new status: {status_payload.get('id')}")
+    performed = set(enforced)
     try:
         if _should_pause():
             logging.warning("PANIC_STOP enabled; skipping new status processing")
@@ -608,70 +1071,70 @@ def process_new_status(status_payload: dict):
             logging.warning("Status payload missing account ID, skipping processing.")
             return
 
-        admin_client = _get_admin_client()
-        history = admin_client.get_account_statuses(
-            account_id=account_data["id"],
-            limit=MAX_HISTORY_STATUSES,
-            exclude_reblogs=True,
-        )
-        history = [s for s in history if s.get("visibility") in ANALYZABLE_VISIBILITY_TYPES]
-        combined = [status_data]
-        seen = {status_data.get("id")}
-        for s in history:
-            s_id = s.get("id")
-            if s_id and s_id not in seen:
-                combined.append(s)
-                seen.add(s_id)
-        public_only = [s for s in combined if s.get("visibility") == "public"]
+        # A deferred run already past the burst buffer evaluates the status itself.
+        if settings.STATUS_COALESCE_WINDOW > 0 and not performed:
+            try:
+                if status_bursts.add(account_data["id"], status_data):
+                    flush_status_burst.apply_async(args=[account_data["id"]], countdown=settings.STATUS_COALESCE_WINDOW)
+                return
+            except redis.RedisError as e:
+                redis_degraded.inc()
+                logging.warning(f"Status coalescing unavailable, evaluating status directly: {e}")
 
-        enforcement_service = EnforcementService(mastodon_client=admin_client)
-        violations = rule_service.evaluate_account(
-            {**account_data, "recent_public_statuses": public_only},
-            account_data,
-            combined,
-            public_only,
-        )
+        _evaluate_new_statuses(account_data, [status_data], performed)
 
-        if violations:
-            logging.info(f"Status {status_data.get('id')} triggered {len(violations)} violations.")
-            for violation in violations:
-                logging.info(
-                    f"  Violation: {violation.rule_name}, Score: {violation.score}, Action: {violation.action_type}"
-                )
+    except RateLimited as e:
+        e.resume = {"enforced": sorted(performed)}
+        raise
+    except Exception as e:
+        logging.exception(f"Error processing new status: {e}")
+        raise
 
-                # Decide on action based on the rule's action_type and trigger_threshold
-                if violation.action_type in [
-                    "silence",
-                    "suspend",
-                    "disable",
-                    "sensitive",
-                    "domain_block",
-                ]:
-                    logging.info(
-                        f"Attempting to perform automated action {violation.action_type} for account {account_data['id']} due to rule {violation.rule_name}"
-                    )
-                    enforcement_service.perform_account_action(
-                        account_id=account_data["id"],
-                        action_type=violation.action_type,
-                        comment=f"Automated action: {violation.rule_name} (Score: {violation.score})",
-                        duration=violation.action_duration_seconds,  # Pass duration if applicable
-                        warning_text=violation.action_warning_text,  # Pass warning text if applicable
-                        warning_preset_id=violation.warning_preset_id,  # Pass warning preset if applicable
-                    )
-                elif violation.action_type == "report":
-                    # For status-triggered reports, create a new report
-                    logging.info(
-                        f"Attempting to create automated report for account {account_data['id']} due to rule {violation.rule_name}"
-                    )
-                    enforcement_service.perform_account_action(
-                        account_id=account_data["id"],
-                        action_type=violation.action_type,
-                        comment=f"Automated report: {violation.rule_name} (Score: {violation.score})",
-                        status_ids=[status_data.get("id")],  # Report the specific status
-                    )
-        else:
-            logging.info(f"Status {status_data.get('id')} did not trigger any violations.")
 
+def _evaluate_new_statuses(account_data: dict, new_statuses: list[dict], performed: set[str] | None = None) -> None:
+    """Evaluate statuses an account just posted together with its history, and act on violations."""
+    admin_client = _get_admin_client()
+    account, statuses = new_status_context(admin_client, account_data, new_statuses)
+    enforcement_service = EnforcementService(mastodon_client=admin_client)
+    violations = rule_service.evaluate_account(account, statuses)
+    act_on_status_violations(
+        enforcement_service, account_data, [s.get("id") for s in new_statuses], violations, performed
+    )
+
+
+@shared_task(
+    name="app.tasks.jobs.flush_status_burst",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=2,
+    retry_backoff_max=60,
+    retry_jitter=True,
+)
+@_defer_when_rate_limited
+def flush_status_burst(self, account_id: str, enforced: list[str] = ()):
+    """Evaluate the statuses an account posted within one coalescing window.
+
+    ``enforced`` names the rules whose actions a deferred run already applied.
+    """
+    if _should_pause():
+        logging.warning("PANIC_STOP enabled; leaving status burst of account %s buffered", account_id)
+        return
+
+    burst = status_bursts.take(account_id)
+    if not burst.due:
+        # The account is still posting; come back when the window closes or the delay cap is hit.
+        self.apply_async(args=[account_id], kwargs={"enforced": list(enforced)}, countdown=burst.wait)
+        return
+    if not burst.statuses:
+        return
+
+    status_burst_size.observe(len(burst.statuses))
+    performed = set(enforced)
+    try:
+        _evaluate_new_statuses(burst.statuses[-1].get("account", {}), burst.statuses, performed)
     except Exception as e:
-        logging.exception(f"Error processing new status: {e}")
+        # Retried or deferred with the same account id; the next run takes these statuses again.
+        status_bursts.restore(account_id, burst.statuses)
+        if isinstance(e, RateLimited):
+            e.resume = {"enforced": sorted(performed)}
         raise
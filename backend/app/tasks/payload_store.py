@@ -0,0 +1,87 @@
+"""Redis store that keeps large task payloads out of Celery messages.
+
+Webhook tasks used to carry whole Mastodon objects (statuses, accounts,
+reports with admin fields) in their Celery messages, and the broker keeps a
+copy of each message until it is acknowledged. With ``TASK_PAYLOAD_MIN_BYTES``
+set, ``stash`` stores any payload at least that large once, as zlib-compressed
+JSON under a key derived from its content, and the task message carries only
+``{"payload_ref": key}``. Tasks decorated with ``resolved`` load the payload
+back before they run. Re-enqueued tasks keep sending the reference, so
+deferrals and redeliveries do not copy the payload again.
+
+Stored payloads expire after ``TASK_PAYLOAD_TTL`` seconds, which must outlast
+the retries and rate-limit deferrals of the tasks that read them. When Redis
+is unreachable, ``stash`` sends the payload inline.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from functools import wraps
+
+import redis
+from app.config import get_settings
+from app.metrics import redis_degraded, task_payloads
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+rcli = redis.from_url(settings.REDIS_URL)
+
+REF_FIELD = "payload_ref"
+
+
+def _key(digest: str) -> str:
+    return f"task_payload:{digest}"
+
+
+def stash(payload: dict) -> dict:
+    """Return ``payload`` itself, or a reference to it stored in Redis when it is large."""
+    if settings.TASK_PAYLOAD_MIN_BYTES <= 0:
+        return payload
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    if len(body) < settings.TASK_PAYLOAD_MIN_BYTES:
+        task_payloads.labels(outcome="inline").inc()
+        return payload
+    key = _key(hashlib.sha256(body).hexdigest())
+    try:
+        # Identical payloads share a key; storing again only refreshes the TTL.
+        rcli.set(key, zlib.compress(body), ex=settings.TASK_PAYLOAD_TTL)
+    except redis.RedisError as e:
+        redis_degraded.inc()
+        logger.warning("Could not store task payload, sending it inline: %s", e)
+        task_payloads.labels(outcome="inline").inc()
+        return payload
+    task_payloads.labels(outcome="stored").inc()
+    return {REF_FIELD: key}
+
+
+def resolve(payload: dict) -> dict | None:
+    """Return the payload a reference points to, the payload itself if it is inline, or None if it expired."""
+    key = payload.get(REF_FIELD) if isinstance(payload, dict) else None
+    if not key:
+        return payload
+    body = rcli.get(key)
+    if body is None:
+        task_payloads.labels(outcome="missing").inc()
+        return None
+    return json.loads(zlib.decompress(body))
+
+
+def resolved(fn):
+    """Decorate a bound task whose first argument is a payload that may be a reference.
+
+    Goes below ``_defer_when_rate_limited`` so that a deferred task is sent
+    again with the reference, not the loaded payload. A Redis error propagates
+    so the task retries; a payload that has expired is logged and skipped.
+    """
+
+    @wraps(fn)
+    def wrapper(self, payload, *args, **kwargs):
+        loaded = resolve(payload)
+        if loaded is None:
+            logger.warning("%s skipped: stored payload %s has expired", self.name, payload[REF_FIELD])
+            return None
+        return fn(self, loaded, *args, **kwargs)
+
+    return wrapper
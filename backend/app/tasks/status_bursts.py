@@ -0,0 +1,119 @@
+"""Per-account buffer that coalesces bursts of ``status.created`` webhooks.
+
+Statuses an account posts within ``STATUS_COALESCE_WINDOW`` seconds of each
+other are collected in Redis and evaluated together, with one history fetch
+and one rule evaluation. A burst is due once the account has been quiet for
+the window, or ``STATUS_COALESCE_MAX_DELAY`` seconds after its first status,
+whichever comes first, so a steady stream of posts cannot postpone
+evaluation indefinitely.
+
+Coalescing is off unless ``STATUS_COALESCE_WINDOW`` is set above 0, since it
+delays the check of every status by at least the window.
+
+Both scripts are atomic, so a status arriving while a burst is taken either
+lands in that burst or starts the next one; it is never lost in between.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+
+import redis
+from app.config import get_settings
+
+settings = get_settings()
+rcli = redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+# Buffered statuses are dropped if no flush takes them for this long.
+BURST_TTL = 3600
+# A burst not flushed this long after its delay cap gets a new flush with its next status.
+OVERDUE_GRACE = 60.0
+
+# KEYS[1] status list, KEYS[2] burst hash; ARGV: now, ttl, status JSON, overdue after.
+# Returns 1 when the status started a new burst, or joined one whose flush is overdue
+# (its task was lost or gave up), so that the caller schedules a flush.
+_ADD = """
+redis.call('RPUSH', KEYS[1], ARGV[3])
+local now = tonumber(ARGV[1])
+local first = tonumber(redis.call('HGET', KEYS[2], 'first'))
+local schedule = 0
+if first == nil then
+  redis.call('HSET', KEYS[2], 'first', ARGV[1])
+  schedule = 1
+elseif now - first > tonumber(ARGV[4]) then
+  schedule = 1
+end
+redis.call('HSET', KEYS[2], 'last', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return schedule
+"""
+
+# KEYS[1] status list, KEYS[2] burst hash; ARGV: now, window, max delay.
+# Returns {due (0/1), wait seconds as a string, statuses}.
+_TAKE = """
+local b = redis.call('HMGET', KEYS[2], 'first', 'last')
+local first, last = tonumber(b[1]), tonumber(b[2])
+if first == nil then
+  return {1, '0', {}}
+end
+local now = tonumber(ARGV[1])
+local due = math.min(last + tonumber(ARGV[2]), first + tonumber(ARGV[3]))
+if now < due then
+  return {0, tostring(due - now), {}}
+end
+local statuses = redis.call('LRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1], KEYS[2])
+return {1, '0', statuses}
+"""
+
+# KEYS[1] status list, KEYS[2] burst hash; ARGV: now, ttl, then status JSON in order.
+# Puts the statuses of a failed flush back in front of anything that arrived meanwhile.
+_RESTORE = """
+for i = #ARGV, 3, -1 do
+  redis.call('LPUSH', KEYS[1], ARGV[i])
+end
+redis.call('HSETNX', KEYS[2], 'first', ARGV[1])
+redis.call('HSETNX', KEYS[2], 'last', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+_add_script = rcli.register_script(_ADD)
+_take_script = rcli.register_script(_TAKE)
+_restore_script = rcli.register_script(_RESTORE)
+
+
+@dataclass(frozen=True)
+class Burst:
+    """Result of ``take``: the statuses of a due burst, or how long until it is due."""
+
+    due: bool
+    wait: float = 0.0
+    statuses: list[dict] = field(default_factory=list)
+
+
+def _keys(account_id: str) -> list[str]:
+    return [f"status_burst:{account_id}:statuses", f"status_burst:{account_id}"]
+
+
+def add(account_id: str, status: dict) -> bool:
+    """Buffer a new status; return True when a flush of the account's burst must be scheduled."""
+    overdue_after = settings.STATUS_COALESCE_MAX_DELAY + OVERDUE_GRACE
+    return bool(_add_script(keys=_keys(account_id), args=[time.time(), BURST_TTL, json.dumps(status), overdue_after]))
+
+
+def take(account_id: str) -> Burst:
+    """Take the buffered statuses of ``account_id`` if its burst is due."""
+    due, wait, statuses = _take_script(
+        keys=_keys(account_id),
+        args=[time.time(), settings.STATUS_COALESCE_WINDOW, settings.STATUS_COALESCE_MAX_DELAY],
+    )
+    return Burst(due=bool(int(due)), wait=max(0.0, float(wait)), statuses=[json.loads(s) for s in statuses])
+
+
+def restore(account_id: str, statuses: list[dict]) -> None:
+    """Put back statuses taken by a flush that failed, ahead of newer ones."""
+    if statuses:
+        _restore_script(keys=_keys(account_id), args=[time.time(), BURST_TTL, *(json.dumps(s) for s in statuses)])
@@ -0,0 +1,235 @@
+"""Webhook ingestion through a Redis Stream, drained in batches by a consumer group.
+
+With ``WEBHOOK_INGEST_MODE=stream`` the webhook handler only verifies an event
+and appends it to ``STREAM``; no Celery task is created per event. Consumers
+(``python -m app.tasks.webhook_stream``, any number of them) read batches
+through the ``GROUP`` consumer group:
+
+- ``status.created`` events are grouped by account. Each account's new
+  statuses are combined with its recent history once, and all accounts of
+  the batch are evaluated in a single ``rule_service.evaluate_accounts`` call.
+- ``report.created`` events are rare and are handed to the
+  ``process_new_report`` task.
+
+Delivery is at least once: an entry is acknowledged only after it has been
+handled. Entries left pending by a failure or a crashed consumer are claimed
+again after ``CLAIM_IDLE_MS``; after ``WEBHOOK_STREAM_MAX_ATTEMPTS`` failures
+they are moved to ``DEAD_LETTER_STREAM`` with the last error. The rules a
+failed attempt already acted on are kept in ``ENFORCED`` and are not acted on
+again when the entry comes back.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+
+import redis
+from app.config import get_settings
+from app.mastodon_client import MastoClient
+from app.metrics import redis_degraded, webhook_stream_batch_size, webhook_stream_events
+from app.services.enforcement_service import EnforcementService
+from app.services.rule_service import rule_service
+from app.services.runtime_flags import runtime_flags
+from app.tasks import payload_store
+from app.tasks.jobs import act_on_status_violations, new_status_context, process_new_report
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+rcli = redis.from_url(settings.REDIS_URL)
+
+STREAM = "webhooks:events"
+GROUP = "webhook-consumers"
+DEAD_LETTER_STREAM = "webhooks:dead"
+# Failed attempts per pending entry id.
+FAILURES = "webhooks:failures"
+# JSON list of the rules already acted on, per pending entry id.
+ENFORCED = "webhooks:enforced"
+STREAM_EVENTS = ("status.created", "report.created")
+DEDUPE_TTL = 60
+BLOCK_MS = 5000
+CLAIM_IDLE_MS = 60_000
+
+
+def claim_event(event_type: str, event_id: str) -> bool:
+    """Return True the first time ``event_id`` is seen within ``DEDUPE_TTL`` seconds."""
+    return bool(rcli.set(f"webhook_dedupe:{event_type}:{event_id}", "1", nx=True, ex=DEDUPE_TTL))
+
+
+def append_event(event_type: str, body: bytes) -> str:
+    """Append a verified webhook body to the stream and return the entry id."""
+    entry_id = rcli.xadd(
+        STREAM,
+        {"type": event_type, "body": body, "received_at": f"{time.time():.3f}"},
+        maxlen=settings.WEBHOOK_STREAM_MAXLEN,
+        approximate=True,
+    )
+    return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+
+def ensure_group() -> None:
+    """Create the stream and its consumer group if they do not exist yet."""
+    try:
+        rcli.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _ack(entry_ids: list) -> None:
+    if not entry_ids:
+        return
+    with rcli.pipeline(transaction=False) as pipe:
+        pipe.xack(STREAM, GROUP, *entry_ids)
+        pipe.hdel(FAILURES, *entry_ids)
+        pipe.hdel(ENFORCED, *entry_ids)
+        pipe.execute()
+
+
+def _enforced(entry_ids: list) -> set[str]:
+    """Return the rules that earlier attempts at any of the entries already acted on."""
+    recorded = rcli.hmget(ENFORCED, entry_ids)
+    return {rule for value in recorded if value for rule in json.loads(value)}
+
+
+def _fail(entries: list[tuple], error: Exception) -> None:
+    """Record a failed attempt; dead-letter entries that used up their attempts."""
+    webhook_stream_events.labels(outcome="failed").inc(len(entries))
+    for entry_id, fields in entries:
+        attempts = rcli.hincrby(FAILURES, entry_id, 1)
+        if attempts < settings.WEBHOOK_STREAM_MAX_ATTEMPTS:
+            continue
+        logger.error("Dead-lettering webhook entry %s after %d attempts: %s", entry_id, attempts, error)
+        rcli.xadd(
+            DEAD_LETTER_STREAM,
+            {**fields, "source_id": entry_id, "attempts": attempts, "error": repr(error)[:1000]},
+            maxlen=settings.WEBHOOK_STREAM_MAXLEN,
+            approximate=True,
+        )
+        _ack([entry_id])
+        webhook_stream_events.labels(outcome="dead_lettered").inc()
+
+
+def _handle_statuses(by_account: dict[str, list[tuple]]) -> None:
+    """Evaluate the new statuses of every account in the batch together."""
+    admin_client = MastoClient(settings.ADMIN_TOKEN)
+    enforcement_service = EnforcementService(mastodon_client=admin_client)
+
+    ready = []
+    for entries in by_account.values():
+        statuses = [payload.get("status", {}) for _, _, payload in entries]
+        account_data = statuses[0].get("account", {})
+        try:
+            ready.append((entries, account_data, new_status_context(admin_client, account_data, statuses)))
+        except Exception as e:
+            logger.warning("Could not load history of account %s: %s", account_data.get("id"), e)
+            _fail([(entry_id, fields) for entry_id, fields, _ in entries], e)
+
+    if not ready:
+        return
+    try:
+        violations = rule_service.evaluate_accounts([context for _, _, context in ready])
+    except Exception as e:
+        logger.exception("Batch evaluation of %d accounts failed", len(ready))
+        _fail([(entry_id, fields) for entries, _, _ in ready for entry_id, fields, _ in entries], e)
+        return
+
+    for (entries, account_data, _), account_violations in zip(ready, violations, strict=True):
+        status_ids = [payload["status"].get("id") for _, _, payload in entries]
+        entry_ids = [entry_id for entry_id, _, _ in entries]
+        performed = _enforced(entry_ids)
+        try:
+            act_on_status_violations(enforcement_service, account_data, status_ids, account_violations, performed)
+        except Exception as e:
+            logger.exception("Acting on statuses of account %s failed", account_data.get("id"))
+            if performed:
+                rcli.hset(ENFORCED, mapping=dict.fromkeys(entry_ids, json.dumps(sorted(performed))))
+            _fail([(entry_id, fields) for entry_id, fields, _ in entries], e)
+            continue
+        _ack([entry_id for entry_id, _, _ in entries])
+        webhook_stream_events.labels(outcome="processed").inc(len(entries))
+
+
+def process_batch(entries: list[tuple]) -> None:
+    """Handle one batch of ``(entry_id, fields)`` stream entries."""
+    # XAUTOCLAIM returns entries trimmed from the stream with nil fields; ack them so they leave the PEL.
+    _ack([entry_id for entry_id, fields in entries if not fields])
+    entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+    if not entries:
+        return
+    webhook_stream_batch_size.observe(len(entries))
+
+    if runtime_flags.panic_stop():
+        logger.warning("PANIC_STOP enabled; dropping %d webhook events", len(entries))
+        _ack([entry_id for entry_id, _ in entries])
+        webhook_stream_events.labels(outcome="skipped").inc(len(entries))
+        return
+
+    statuses_by_account: dict[str, list[tuple]] = defaultdict(list)
+    reports = []
+    skipped = []
+    for entry_id, fields in entries:
+        event_type = fields.get(b"type", b"").decode()
+        try:
+            payload = json.loads(fields[b"body"])
+        except (KeyError, ValueError) as e:
+            _fail([(entry_id, fields)], e)
+            continue
+        account_id = payload.get("status", {}).get("account", {}).get("id")
+        if event_type == "status.created" and account_id:
+            statuses_by_account[account_id].append((entry_id, fields, payload))
+        elif event_type == "report.created":
+            reports.append((entry_id, fields, payload))
+        else:
+            skipped.append(entry_id)
+
+    _ack(skipped)
+    webhook_stream_events.labels(outcome="skipped").inc(len(skipped))
+
+    if statuses_by_account:
+        _handle_statuses(statuses_by_account)
+
+    for entry_id, fields, payload in reports:
+        try:
+            process_new_report.delay(payload_store.stash(payload))
+        except Exception as e:
+            _fail([(entry_id, fields)], e)
+            continue
+        _ack([entry_id])
+        webhook_stream_events.labels(outcome="processed").inc()
+
+
+def _decode_entries(entries: list) -> list[tuple]:
+    return [(entry_id.decode() if isinstance(entry_id, bytes) else entry_id, fields) for entry_id, fields in entries]
+
+
+def run(consumer: str | None = None) -> None:
+    """Consume the webhook stream until interrupted."""
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+    batch = settings.WEBHOOK_STREAM_BATCH_SIZE
+    ensure_group()
+    logger.info("Webhook stream consumer %s started", consumer)
+    while True:
+        try:
+            # Entries left pending by a failure or a dead consumer come back first.
+            _, claimed, *_ = rcli.xautoclaim(
+                STREAM, GROUP, consumer, min_idle_time=CLAIM_IDLE_MS, start_id="0-0", count=batch
+            )
+            if claimed:
+                process_batch(_decode_entries(claimed))
+                continue
+            for _, entries in rcli.xreadgroup(GROUP, consumer, {STREAM: ">"}, count=batch, block=BLOCK_MS) or []:
+                process_batch(_decode_entries(entries))
+        except redis.RedisError as e:
+            redis_degraded.inc()
+            logger.warning("Webhook stream consumer lost Redis: %s", e)
+            time.sleep(1.0)
+
+
+if __name__ == "__main__":
+    from app.logging_conf import setup_logging
+
+    setup_logging()
+    run()
@@ -0,0 +1,25 @@
+"""Add composite index for batched content scan freshness lookups
+
+Revision ID: 008_content_scan_freshness_index
+Revises: 007_drop_is_default_column, d8163352b057
+Create Date: 2025-03-01 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "008_content_scan_freshness_index"
+down_revision = ("007_drop_is_default_column", "d8163352b057")
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_content_scans_account_hash_rules",
+        "content_scans",
+        ["mastodon_account_id", "content_hash", "rules_version"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_content_scans_account_hash_rules", "content_scans")
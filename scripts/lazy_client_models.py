@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Rewrite the generated client's ``models/__init__.py`` to import models lazily.
+
+openapi-python-client emits a ``models/__init__.py`` that eagerly imports every
+model module (200+), and every endpoint module imports from that package, so
+touching one endpoint loads all models. This replaces the eager imports with a
+module ``__getattr__`` (PEP 562) that imports a model's module on first access.
+``from app.clients.mastodon.models import Status`` and
+``from app.clients.mastodon.models.status import Status`` keep working.
+
+Run after every client regeneration:
+
+    python scripts/lazy_client_models.py backend/app/clients/mastodon/models/__init__.py
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+TEMPLATE = '''"""Contains all the data models used in inputs/outputs
+
+Models are imported on first attribute access; see scripts/lazy_client_models.py.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+{type_imports}
+
+_MODULES = {{
+{modules}
+}}
+
+__all__ = (
+{names}
+)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}") from None
+    value = getattr(import_module(f".{{module}}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+'''
+
+
+def model_modules(source: str) -> dict[str, str]:
+    """Map each model name to its module from the relative imports of an ``__init__``."""
+    modules: dict[str, str] = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            for alias in node.names:
+                modules[alias.asname or alias.name] = node.module
+    return modules
+
+
+def render(modules: dict[str, str]) -> str:
+    """Render the lazy ``__init__`` for the given model-to-module mapping."""
+    return TEMPLATE.format(
+        type_imports="\n".join(f"    from .{module} import {name}" for name, module in modules.items()),
+        modules="\n".join(f'    "{name}": "{module}",' for name, module in modules.items()),
+        names="\n".join(f'    "{name}",' for name in modules),
+    )
+
+
+def main(path: str) -> None:
+    """Rewrite ``path`` in place; a no-op on an already lazy ``__init__``."""
+    init = Path(path)
+    source = init.read_text()
+    if "_MODULES = {" in source:
+        print(f"{init} is already lazy")
+        return
+    modules = model_modules(source)
+    if not modules:
+        sys.exit(f"No model imports found in {init}")
+    init.write_text(render(modules))
+    print(f"Rewrote {init} to load {len(modules)} models lazily")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "backend/app/clients/mastodon/models/__init__.py")
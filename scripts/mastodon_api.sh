@@ -105,6 +105,8 @@ from .client import AuthenticatedClient, Client
 __all__ = ("AuthenticatedClient", "Client")
 PY
 
+  python3 "$PROJECT_ROOT/scripts/lazy_client_models.py" "$CLIENT_DIR/models/__init__.py"
+
   [ -f "$PKG/py.typed" ] && cp "$PKG/py.typed" "$CLIENT_DIR/py.typed"
   rm -rf "$TMPDIR"
   ok "Client generated at: $CLIENT_DIR"
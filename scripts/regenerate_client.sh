@@ -102,6 +102,7 @@ regenerate_client() {
       exit 1
     fi
     
+    python3 "$PROJECT_ROOT/scripts/lazy_client_models.py" "$CLIENT_DIR/models/__init__.py"
     ok "Python client regenerated at: $CLIENT_DIR"
   else
     # Restore pyproject.toml even on failure
@@ -0,0 +1,79 @@
+"""Benchmark writing 10k analysis hits one INSERT per hit against one executemany.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings. The rows go to an
+in-memory SQLite copy of the ``analyses`` table, so the numbers show the
+per-statement overhead on the Python side; against PostgreSQL each saved
+statement is also a saved network round trip.
+"""
+
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+from app.models import Analysis
+from app.tasks import jobs
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+HITS = 10_000
+RULES = 25
+
+
+def _rows() -> list[dict]:
+    rng = random.Random(HITS)
+    return [
+        dict(
+            mastodon_account_id=str(100000 + i // 4),
+            status_id=str(110000000000000000 + i),
+            rule_key=f"keyword/rule_{rng.randrange(RULES)}",
+            score=round(rng.uniform(0.1, 2.0), 2),
+            evidence={"matched_terms": ["spam"], "matched_status_ids": [str(i)], "metrics": {}},
+        )
+        for i in range(HITS)
+    ]
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory table shaped like ``analyses``; SQLite only assigns INTEGER primary keys."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE analyses (id INTEGER PRIMARY KEY, mastodon_account_id TEXT NOT NULL, status_id TEXT, "
+                "rule_key TEXT NOT NULL, score NUMERIC NOT NULL, evidence JSON NOT NULL, "
+                "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _timed(db, write) -> float:
+    db.execute(text("DELETE FROM analyses"))
+    started = time.perf_counter()
+    write()
+    db.commit()
+    return time.perf_counter() - started
+
+
+def test_analysis_insert_benchmark(db):
+    """Both paths store every hit; per-row and executemany throughput are printed."""
+    rows = _rows()
+
+    def per_row():
+        for row in rows:
+            db.execute(insert(Analysis).values(**row))
+
+    with patch.object(jobs.analyses_flagged, "labels"):
+        per_row_time = _timed(db, per_row)
+        bulk_time = _timed(db, lambda: jobs._record_analyses(db, rows))
+
+    assert db.execute(text("SELECT count(*) FROM analyses")).scalar() == HITS
+    assert db.execute(text("SELECT count(DISTINCT rule_key) FROM analyses")).scalar() == RULES
+    print(
+        f"\n{HITS} analysis hits: per-row {HITS / per_row_time:9.0f} rows/s, "
+        f"executemany {HITS / bulk_time:9.0f} rows/s, speedup {per_row_time / bulk_time:5.1f}x"
+    )
@@ -0,0 +1,70 @@
+"""Cold-start import budget for the API and worker entry points.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+and the best of a few runs is compared to its budget. Run with
+``pytest tests/benchmarks -s`` to see the timings. Set
+``IMPORT_TIME_BUDGET_SCALE`` (e.g. ``2``) on slow machines.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[2] / "backend"
+RUNS = 3
+SCALE = float(os.environ.get("IMPORT_TIME_BUDGET_SCALE", "1"))
+
+# Milliseconds, cumulative import time of the module itself.
+BUDGETS_MS = {
+    "app.main": 2000,
+    "app.tasks.celery_app": 750,
+}
+
+# Only the models behind the few endpoints MastoClient uses should load.
+MAX_GENERATED_MODELS = 25
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _import_profile(module: str) -> tuple[float, set[str]]:
+    """Return the cumulative import time in ms of ``module`` and every module it loaded."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND), os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        pytest.skip(f"{module} does not import in this environment: {proc.stderr.strip().splitlines()[-1:]}")
+
+    cumulative_us = None
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        loaded.add(match.group(4))
+        if match.group(4) == module:
+            cumulative_us = int(match.group(2))
+    assert cumulative_us is not None, f"no importtime entry for {module}"
+    return cumulative_us / 1000, loaded
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS_MS))
+def test_cold_import_within_budget(module):
+    """Cold import stays under budget and does not pull in the whole generated client."""
+    profiles = [_import_profile(module) for _ in range(RUNS)]
+    best_ms = min(ms for ms, _ in profiles)
+    models = {name for name in profiles[0][1] if name.startswith("app.clients.mastodon.models.")}
+    budget_ms = BUDGETS_MS[module] * SCALE
+    print(f"\n{module}: cold import {best_ms:7.1f} ms (budget {budget_ms:.0f} ms), {len(models)} generated models")
+
+    assert len(models) <= MAX_GENERATED_MODELS, f"{module} eagerly loads {len(models)} generated models"
+    assert best_ms <= budget_ms, f"{module} cold import took {best_ms:.0f} ms, budget is {budget_ms:.0f} ms"
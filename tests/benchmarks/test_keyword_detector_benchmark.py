@@ -0,0 +1,90 @@
+"""Benchmark the shared keyword automaton against the per-rule keyword loop.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings.
+"""
+
+import random
+import string
+import time
+from unittest.mock import Mock
+
+import pytest
+from app.services.detectors.keyword_detector import KeywordDetector
+from app.services.detectors.prepared import prepare_account
+
+STATUSES_PER_ACCOUNT = 20
+ROUNDS = 3
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+
+def _make_rules(rng: random.Random, count: int) -> list[Mock]:
+    rules = []
+    for i in range(count):
+        rule = Mock()
+        rule.name = f"kw_{i}"
+        rule.weight = 1.0
+        rule.pattern = ",".join(_word(rng) for _ in range(rng.randint(2, 6)))
+        rules.append(rule)
+    return rules
+
+
+def _make_account(rng: random.Random, rules: list[Mock]) -> tuple[dict, list[dict]]:
+    planted = [t.strip() for rule in rng.sample(rules, min(3, len(rules))) for t in rule.pattern.split(",")[:1]]
+    statuses = []
+    for i in range(STATUSES_PER_ACCOUNT):
+        words = [_word(rng) for _ in range(60)]
+        if i % 5 == 0:
+            words.insert(rng.randint(0, len(words)), rng.choice(planted))
+        statuses.append({"id": str(i), "content": "<p>" + " ".join(words) + "</p>"})
+    return {"username": _word(rng), "display_name": " ".join(_word(rng) for _ in range(2))}, statuses
+
+
+def _per_rule(detector, rules, account_data, statuses, prepared):
+    return [v for rule in rules for v in detector.evaluate(rule, account_data, statuses, prepared=prepared)]
+
+
+def _shared_scan(detector, rules, matchers, index, account_data, statuses, prepared):
+    scan = detector.scan(index, account_data, statuses, prepared=prepared)
+    return [
+        v
+        for rule, matcher in zip(rules, matchers, strict=True)
+        for v in detector.evaluate(rule, account_data, statuses, matcher=matcher, scan=scan, prepared=prepared)
+    ]
+
+
+def _best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.parametrize("rule_count", [10, 100, 1000])
+def test_keyword_automaton_benchmark(rule_count):
+    """The automaton yields identical violations; timings are printed for comparison."""
+    rng = random.Random(rule_count)
+    detector = KeywordDetector()
+    rules = _make_rules(rng, rule_count)
+    account_data, statuses = _make_account(rng, rules)
+    matchers = [detector.compile(rule.pattern) for rule in rules]
+    index = detector.build_index(matchers)
+    # Both arms share one normalized account, so the timings compare only the matching.
+    prepared = prepare_account(account_data, statuses)
+
+    expected = _per_rule(detector, rules, account_data, statuses, prepared)
+    actual = _shared_scan(detector, rules, matchers, index, account_data, statuses, prepared)
+    assert [v.model_dump() for v in actual] == [v.model_dump() for v in expected]
+    assert expected, "benchmark corpus should produce at least one violation"
+
+    per_rule = _best_of(lambda: _per_rule(detector, rules, account_data, statuses, prepared))
+    shared = _best_of(lambda: _shared_scan(detector, rules, matchers, index, account_data, statuses, prepared))
+    print(
+        f"\nkeyword rules={rule_count:>5} statuses={STATUSES_PER_ACCOUNT}: "
+        f"per-rule {per_rule * 1000:8.2f} ms, automaton {shared * 1000:8.2f} ms, "
+        f"speedup {per_rule / shared:5.1f}x"
+    )
@@ -0,0 +1,163 @@
+"""Benchmark decoding a 40-status page as raw JSON against the generated model round-trip.
+
+Run with ``pytest tests/benchmarks -s`` to see the timings. The generated
+client is replaced by stubs in the test suite, so the model round-trip is only
+measured where the real package imports (it needs attrs >= 24.1).
+"""
+
+import json
+import random
+import string
+import sys
+import time
+
+import pytest
+from app import mastodon_client
+from app.mastodon_client import decode_json
+
+PAGE_SIZE = 40
+ROUNDS = 20
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+
+
+def _account(rng: random.Random, i: int) -> dict:
+    username = _word(rng)
+    return {
+        "id": str(100000 + i),
+        "username": username,
+        "acct": f"{username}@remote.example",
+        "display_name": f"{_word(rng)} {_word(rng)}",
+        "locked": False,
+        "bot": False,
+        "discoverable": True,
+        "group": False,
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "note": "<p>" + " ".join(_word(rng) for _ in range(20)) + "</p>",
+        "url": f"https://remote.example/@{username}",
+        "uri": f"https://remote.example/users/{username}",
+        "avatar": f"https://remote.example/avatars/{i}.png",
+        "avatar_static": f"https://remote.example/avatars/{i}.png",
+        "header": f"https://remote.example/headers/{i}.png",
+        "header_static": f"https://remote.example/headers/{i}.png",
+        "followers_count": rng.randint(0, 5000),
+        "following_count": rng.randint(0, 5000),
+        "statuses_count": rng.randint(0, 50000),
+        "last_status_at": "2024-06-01",
+        "emojis": [],
+        "fields": [{"name": _word(rng), "value": _word(rng), "verified_at": None} for _ in range(2)],
+    }
+
+
+def _status(rng: random.Random, account: dict, i: int) -> dict:
+    return {
+        "id": str(110000000000000000 + i),
+        "uri": f"https://remote.example/users/{account['username']}/statuses/{i}",
+        "url": f"https://remote.example/@{account['username']}/{i}",
+        "created_at": "2024-06-01T12:00:00.000Z",
+        "account": account,
+        "content": "<p>" + " ".join(_word(rng) for _ in range(40)) + "</p>",
+        "visibility": "public",
+        "sensitive": False,
+        "spoiler_text": "",
+        "media_attachments": [
+            {
+                "id": str(i * 10 + m),
+                "type": "image",
+                "url": f"https://remote.example/media/{i}/{m}.png",
+                "preview_url": f"https://remote.example/media/{i}/{m}_small.png",
+                "remote_url": None,
+                "description": " ".join(_word(rng) for _ in range(8)),
+                "blurhash": "UeKUpFxuo~R%0nW;WCnhF6RjaJt757oJodS$",
+                "meta": {"original": {"width": 640, "height": 480, "size": "640x480", "aspect": 1.33}},
+            }
+            for m in range(i % 3)
+        ],
+        "application": {"name": "Web", "website": None},
+        "mentions": [{"id": "1", "username": "alice", "url": "https://remote.example/@alice", "acct": "alice"}],
+        "tags": [{"name": _word(rng), "url": "https://remote.example/tags/x"} for _ in range(2)],
+        "emojis": [],
+        "reblogs_count": rng.randint(0, 50),
+        "favourites_count": rng.randint(0, 50),
+        "replies_count": rng.randint(0, 50),
+        "in_reply_to_id": None,
+        "in_reply_to_account_id": None,
+        "reblog": None,
+        "poll": None,
+        "card": None,
+        "language": "en",
+        "text": None,
+        "edited_at": None,
+    }
+
+
+def _page() -> bytes:
+    rng = random.Random(PAGE_SIZE)
+    account = _account(rng, 0)
+    return json.dumps([_status(rng, account, i) for i in range(PAGE_SIZE)]).encode()
+
+
+def _per_page(fn) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.fixture
+def status_model():
+    """Import the real generated ``Status`` model in place of the test suite's client stubs.
+
+    ``from_dict`` imports nested models lazily, so the real package stays loaded
+    until the test ends.
+    """
+    stubs = {name: module for name, module in sys.modules.items() if name.startswith("app.clients.mastodon")}
+    for name in stubs:
+        del sys.modules[name]
+    try:
+        from app.clients.mastodon.models.status import Status
+
+        yield Status
+    except (ImportError, TypeError) as e:  # TypeError: attrs too old for the generated field aliases
+        pytest.skip(f"generated Mastodon client is not importable here: {e}")
+    finally:
+        for name in [name for name in sys.modules if name.startswith("app.clients.mastodon")]:
+            del sys.modules[name]
+        sys.modules.update(stubs)
+
+
+def test_raw_decode_benchmark():
+    """The raw decode returns plain dicts; stdlib and fast-path timings are printed."""
+    body = _page()
+    statuses = decode_json(body)
+    assert len(statuses) == PAGE_SIZE
+    assert statuses == json.loads(body)
+
+    stdlib = _per_page(lambda: json.loads(body))
+    raw = _per_page(lambda: decode_json(body))
+    parser = "orjson" if mastodon_client.orjson is not None else "json"
+    print(
+        f"\n{PAGE_SIZE}-status page ({len(body) // 1024} KiB): json.loads {stdlib * 1e6:8.1f} us, "
+        f"decode_json[{parser}] {raw * 1e6:8.1f} us"
+    )
+
+
+def test_generated_model_round_trip_benchmark(status_model):
+    """Timing of the former Status.from_dict(...).to_dict() path next to the raw decode."""
+    body = _page()
+
+    def round_trip():
+        return [status_model.from_dict(s).to_dict() for s in json.loads(body)]
+
+    assert [s["id"] for s in round_trip()] == [s["id"] for s in decode_json(body)]
+
+    models = _per_page(round_trip)
+    raw = _per_page(lambda: decode_json(body))
+    print(
+        f"\n{PAGE_SIZE}-status page: generated models {models * 1e6:8.1f} us, raw {raw * 1e6:8.1f} us, "
+        f"speedup {models / raw:5.1f}x"
+    )
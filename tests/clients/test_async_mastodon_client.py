@@ -0,0 +1,102 @@
+"""Tests for the pooled async Mastodon client."""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+import httpx
+from app import http_pool
+from app.mastodon_client import AsyncMastoClient, MastoClient
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/api/v1/admin/accounts":
+        return httpx.Response(
+            200,
+            json=[{"id": "1"}],
+            headers={"Link": '<https://test.mastodon.social/api/v1/admin/accounts?max_id=42>; rel="next"'},
+        )
+    if request.url.path == "/api/v1/accounts/5":
+        return httpx.Response(200, json={"id": "5"})
+    if request.url.path.endswith("/statuses"):
+        return httpx.Response(200, json=[{"id": "9", "only_media": request.url.params["only_media"]}])
+    if request.url.path == "/api/v1/reports":
+        return httpx.Response(200, content=request.content)
+    return httpx.Response(404, json={"error": "Not found"})
+
+
+class TestHttpPool(unittest.TestCase):
+    """Test suite for the process-wide HTTP pool."""
+
+    def setUp(self):
+        """Route pooled requests to an in-memory transport."""
+        self.connections = []
+
+        def build():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+            self.connections.append(client)
+            return client
+
+        patches = [
+            patch("app.http_pool._build_client", side_effect=build),
+            patch("app.mastodon_client.throttle_if_needed"),
+            patch("app.mastodon_client.update_from_headers"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        http_pool.close()
+        self.addCleanup(http_pool.close)
+        self.client = AsyncMastoClient("token")
+
+    def test_requests_share_one_client(self):
+        """Calls from several threads reuse the same pooled client."""
+        results = []
+
+        def call():
+            results.append(http_pool.run(self.client.get_admin_accounts(limit=1)))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, [([{"id": "1"}], "42")] * 4)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_sync_client_reuses_pooled_client(self):
+        """MastoClient instances send their raw calls through the one pooled client."""
+        self.assertEqual(MastoClient("a").get_account("5"), {"id": "5"})
+        self.assertEqual(MastoClient("b").get_admin_accounts(limit=1), ([{"id": "1"}], "42"))
+        with self.assertRaises(httpx.HTTPStatusError):
+            MastoClient("a").get_account("6")
+        self.assertEqual(len(self.connections), 1)
+
+    def test_reset_builds_a_new_client(self):
+        """A forked child drops the inherited pool and builds its own on first use."""
+        first = http_pool.get_client()
+        http_pool.reset()
+        self.assertIsNot(http_pool.get_client(), first)
+
+    def test_methods_and_errors(self):
+        """Statuses, reports and error statuses behave like the sync client."""
+        statuses = http_pool.run(self.client.get_account_statuses("5", only_media=True))
+        self.assertEqual(statuses, [{"id": "9", "only_media": "true"}])
+
+        report = http_pool.run(self.client.create_report("5", "spam", status_ids=["9"], category="spam"))
+        self.assertEqual(report["status_ids"], ["9"])
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            http_pool.run(self.client.unsuspend_account("5"))
+
+    def test_close_is_idempotent(self):
+        """Closing twice, or without a pool, is harmless."""
+        http_pool.get_client()
+        http_pool.close()
+        http_pool.close()
+        self.assertTrue(self.connections[0].is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
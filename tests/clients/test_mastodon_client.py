@@ -4,10 +4,12 @@ import os
 import sys
 import types
 import unittest
-from unittest.mock import Mock, patch
+from functools import wraps
+from unittest.mock import AsyncMock, Mock, patch
 
-import httpx
 import app.mastodon_client as mastodon_client_module
+import httpx
+from app import http_pool
 
 mastodon_pkg = types.ModuleType("app.clients.mastodon")
 mastodon_pkg.__path__ = []
@@ -106,6 +108,18 @@ sys.modules.update(
 from app.mastodon_client import MastoClient
 
 
+def pooled_request(test):
+    """Patch the pooled HTTP client and pass its ``request`` mock to the test."""
+
+    @wraps(test)
+    def wrapper(self, *args):
+        request = AsyncMock()
+        with patch("app.http_pool.get_client", return_value=Mock(request=request)):
+            return test(self, *args, request)
+
+    return wrapper
+
+
 class TestMastoClient(unittest.TestCase):
     def setUp(self):
         with patch.dict(
@@ -118,12 +132,12 @@ class TestMastoClient(unittest.TestCase):
         ):
             self.client = MastoClient("test_token")
 
-    @patch("app.mastodon_client.httpx.request")
+    @pooled_request
     def test_get_admin_accounts_pagination(self, mock_request):
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.headers = {"Link": '<https://test.mastodon.social/api/v1/admin/accounts?max_id=456>; rel="next"'}
-        mock_response.json.return_value = [{"id": "123", "username": "test_user"}]
+        mock_response.content = b'[{"id": "123", "username": "test_user"}]'
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
 
@@ -132,12 +146,12 @@ class TestMastoClient(unittest.TestCase):
         self.assertEqual(accounts[0]["id"], "123")
         self.assertEqual(next_cursor, "456")
 
-    @patch("app.mastodon_client.httpx.request")
+    @pooled_request
     def test_get_admin_accounts_no_pagination(self, mock_request):
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.headers = {}
-        mock_response.json.return_value = [{"id": "123", "username": "test_user"}]
+        mock_response.content = b'[{"id": "123", "username": "test_user"}]'
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
 
@@ -145,6 +159,35 @@ class TestMastoClient(unittest.TestCase):
         self.assertEqual(len(accounts), 1)
         self.assertIsNone(next_cursor)
 
+    @pooled_request
+    def test_get_account_statuses_decodes_raw_json(self, mock_request):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = b'[{"id": "1", "account": {"id": "9"}, "media_attachments": []}]'
+        mock_request.return_value = mock_response
+
+        statuses = self.client.get_account_statuses("9", limit=40, only_media=True, since_id="100")
+
+        self.assertEqual(statuses, [{"id": "1", "account": {"id": "9"}, "media_attachments": []}])
+        args, kwargs = mock_request.call_args
+        self.assertEqual(args[0], "GET")
+        self.assertTrue(args[1].endswith("/api/v1/accounts/9/statuses"))
+        self.assertEqual(kwargs["params"]["limit"], 40)
+        self.assertEqual(kwargs["params"]["only_media"], "true")
+        self.assertEqual(kwargs["params"]["since_id"], "100")
+        self.assertNotIn("max_id", kwargs["params"])
+
+    @pooled_request
+    def test_get_account_decodes_raw_json(self, mock_request):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = b'{"id": "9", "acct": "someone@remote.example"}'
+        mock_request.return_value = mock_response
+
+        self.assertEqual(self.client.get_account("9"), {"id": "9", "acct": "someone@remote.example"})
+
     @patch("app.mastodon_client.create_report_sync")
     def test_create_report_with_category_mapping(self, mock_create_report):
         mock_report = Mock()
@@ -164,7 +207,7 @@ class TestMastoClient(unittest.TestCase):
         self.assertEqual(body.account_id, "test_account_123")
         self.assertEqual(body.comment, "Test report comment")
 
-    @patch("app.mastodon_client.httpx.request")
+    @pooled_request
     def test_error_handling(self, mock_request):
         mock_response = Mock()
         mock_response.status_code = 404
@@ -178,7 +221,7 @@ class TestMastoClient(unittest.TestCase):
         with self.assertRaises(httpx.HTTPStatusError):
             self.client.get_admin_accounts()
 
-    @patch("app.mastodon_client.httpx.request")
+    @pooled_request
     @patch("app.mastodon_client.AuthenticatedClient")
     def test_http_timeout_override(self, mock_client, mock_request):
         with patch.object(mastodon_client_module.settings, "HTTP_TIMEOUT", 10):
@@ -188,8 +231,10 @@ class TestMastoClient(unittest.TestCase):
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.headers = {}
-        mock_response.json.return_value = []
+        mock_response.content = b"[]"
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
+        with patch.object(mastodon_client_module.settings, "HTTP_TIMEOUT", 10):
+            self.assertEqual(http_pool._build_client().timeout, httpx.Timeout(10))
         test_client.get_admin_accounts()
-        self.assertEqual(mock_request.call_args.kwargs["timeout"], 10)
+        mock_request.assert_awaited_once()
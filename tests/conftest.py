@@ -91,6 +91,7 @@ class CreateReportBody:
         status_ids: List of status IDs related to the report.
         rule_ids: List of rule IDs related to the report.
     """
+
     def __init__(self, account_id, comment, category, forward, status_ids, rule_ids):
         self.account_id = account_id
         self.comment = comment
@@ -171,6 +172,7 @@ os.environ["ADMIN_TOKEN"] = "test_admin_token"
 os.environ["API_KEY"] = "test_api_key"
 os.environ["WEBHOOK_SECRET"] = "test_webhook_secret"
 os.environ["REDIS_URL"] = "redis://localhost:6379/15"  # Use test Redis DB
+os.environ["STATUS_CACHE_TTL"] = "0"  # Cached status pages would leak between tests
 
 from app.config import Settings
 from app.db import Base, get_db
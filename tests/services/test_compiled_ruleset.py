@@ -0,0 +1,109 @@
+"""Test cases for the compiled ruleset layer."""
+
+import re
+import unittest
+from unittest.mock import Mock, patch
+
+from app.services.compiled_ruleset import compile_ruleset
+from app.services.rule_service import RuleService
+
+
+def _rule(rule_id, detector_type, pattern, **overrides):
+    rule = Mock()
+    rule.id = rule_id
+    rule.name = f"rule_{rule_id}"
+    rule.detector_type = detector_type
+    rule.pattern = pattern
+    rule.boolean_operator = None
+    rule.secondary_pattern = None
+    rule.weight = 1.0
+    rule.trigger_threshold = 1.0
+    rule.action_type = "report"
+    rule.action_duration_seconds = None
+    rule.action_warning_text = None
+    rule.warning_preset_id = None
+    for key, value in overrides.items():
+        setattr(rule, key, value)
+    return rule
+
+
+class TestCompiledRuleset(unittest.TestCase):
+    """Test suite for compile_ruleset and RuleService integration."""
+
+    def setUp(self):
+        """Set up a rule service with a stubbed rule loader."""
+        self.rule_service = RuleService()
+        self.rules = [
+            _rule(1, "regex", r"crypto|nft"),
+            _rule(2, "keyword", "Casino, Pills"),
+            _rule(3, "regex", "spam", boolean_operator="AND", secondary_pattern="buy"),
+            _rule(4, "unknown", "whatever"),
+        ]
+        self.patcher = patch.object(
+            self.rule_service, "get_active_rules", return_value=(self.rules, {"report_threshold": 1.0}, "sha-1")
+        )
+        self.mock_get_active_rules = self.patcher.start()
+
+    def tearDown(self):
+        """Stop patches."""
+        self.patcher.stop()
+
+    def test_compile_builds_matchers_per_rule(self):
+        """Regex patterns are compiled and keyword terms pre-normalized."""
+        compiled = compile_ruleset(self.rules, "sha-1", self.rule_service.detectors)
+
+        self.assertEqual(set(compiled.rules), {1, 2, 3})
+        self.assertIsInstance(compiled.rules[1].primary, re.Pattern)
+        self.assertEqual(compiled.rules[2].primary.terms, (("Casino", "casino"), ("Pills", "pills")))
+        self.assertIsNone(compiled.rules[1].secondary)
+        self.assertTrue(compiled.rules[3].secondary.search("BUY now"))
+        self.assertEqual(set(compiled.indexes), {"keyword", "regex"})
+
+    def test_invalid_pattern_is_skipped(self):
+        """A rule with a broken regex does not prevent the others from compiling."""
+        rules = [_rule(1, "regex", "("), _rule(2, "regex", "ok")]
+        compiled = compile_ruleset(rules, "sha-x", self.rule_service.detectors)
+        self.assertEqual(set(compiled.rules), {2})
+
+    def test_compiled_ruleset_reused_until_sha_changes(self):
+        """The compiled ruleset is rebuilt only when the ruleset SHA changes."""
+        _, first = self.rule_service.get_compiled_ruleset()
+        _, second = self.rule_service.get_compiled_ruleset()
+        self.assertIs(first, second)
+
+        self.mock_get_active_rules.return_value = (self.rules, {}, "sha-2")
+        _, third = self.rule_service.get_compiled_ruleset()
+        self.assertIsNot(first, third)
+        self.assertEqual(third.ruleset_sha256, "sha-2")
+
+    def test_evaluate_account_uses_compiled_matchers(self):
+        """Evaluation results match the rules' patterns, including AND rules."""
+        account = {"username": "nft_king", "display_name": "Casino Fan"}
+        statuses = [{"id": "1", "content": "spam, buy now"}, {"id": "2", "content": "spam only"}]
+
+        violations = self.rule_service.evaluate_account(account, statuses)
+
+        names = sorted(v.rule_name for v in violations)
+        self.assertEqual(names, ["rule_1", "rule_2", "rule_3"])
+        and_violation = next(v for v in violations if v.rule_name == "rule_3")
+        self.assertEqual(and_violation.evidence.matched_status_ids, ["1", "2", "1"])
+
+    def test_evaluate_accounts_matches_per_account(self):
+        """A page evaluation returns the same violations as evaluating each account alone."""
+        page = [
+            ({"username": "nft_king"}, [{"id": "1", "content": "spam, buy now"}]),
+            ({"username": "quiet"}, []),
+            ({"display_name": "Pills"}, [{"id": "2", "content": "crypto"}]),
+        ]
+
+        batched = self.rule_service.evaluate_accounts(page)
+
+        self.assertEqual(len(batched), 3)
+        for violations, (account, statuses) in zip(batched, page, strict=True):
+            expected = self.rule_service.evaluate_account(account, statuses)
+            self.assertEqual([v.model_dump() for v in violations], [v.model_dump() for v in expected])
+        self.assertEqual(batched[1], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,9 +21,7 @@ class TestConfigService(unittest.TestCase):
         Base.metadata.create_all(engine)
         self.SessionLocal = sessionmaker(bind=engine)
         self.service = ConfigService()
-        self.patcher = patch(
-            "app.services.config_service.SessionLocal", self.SessionLocal
-        )
+        self.patcher = patch("app.services.config_service.SessionLocal", self.SessionLocal)
         self.patcher.start()
 
     def tearDown(self):
@@ -56,6 +54,16 @@ class TestConfigService(unittest.TestCase):
         self.assertEqual(value["default_action"], "suspend")
         self.assertEqual(value["defederation_threshold"], 5)
 
+    def test_get_configs_returns_only_set_keys(self):
+        """Read several keys in one call."""
+        self.service.set_flag("panic_stop", True, updated_by="tester")
+        self.service.set_threshold("report_threshold", 2.5, updated_by="tester")
+        values = self.service.get_configs(["panic_stop", "report_threshold", "dry_run"])
+        self.assertEqual(
+            values,
+            {"panic_stop": {"enabled": True}, "report_threshold": {"threshold": 2.5}},
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,21 @@
 """Test cases for detector modules."""
 
 import unittest
-from hashlib import sha256
-from unittest.mock import Mock
 from datetime import datetime, timedelta
+from hashlib import sha256
+from unittest.mock import Mock, patch
 
+from app.models import InteractionHistory
 from app.schemas import Violation
-from app.services.detectors.behavioral_detector import BehavioralDetector
+from app.services.detectors.aho_corasick import AhoCorasick
+from app.services.detectors.behavioral_detector import BehavioralDetector, BehaviorCounts
 from app.services.detectors.keyword_detector import KeywordDetector
 from app.services.detectors.media_detector import MediaDetector
+from app.services.detectors.prepared import PreparedStatus, prepare_account
 from app.services.detectors.regex_detector import RegexDetector
+from app.services.detectors.regex_set import RegexSet
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
 
 
 class TestRegexDetector(unittest.TestCase):
@@ -118,6 +124,44 @@ class TestRegexDetector(unittest.TestCase):
         self.assertEqual(len(violations), 2)
 
 
+class TestRegexSet(unittest.TestCase):
+    """Test suite for prefiltered regex scanning."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.detector = RegexDetector()
+
+    def test_matching_equals_individual_search(self):
+        """Every pattern found by the set is exactly one that searches successfully on its own."""
+        sources = [r"crypto|nft", r"^buy", r"now!$", r"(\w)\1{3}", r"(?P<x>free)", r"(?x) c a s i n o", r"\bpill"]
+        patterns = [self.detector.compile(source) for source in sources]
+        regex_set = RegexSet(patterns)
+        self.assertEqual(regex_set.unfiltered_count, 1)
+
+        texts = ["Buy NFT now!", "aaaa casino", "CASİNO", "free spins", "spill", "nothing here", ""]
+        for text in texts:
+            expected = {p for p in patterns if p.search(text)}
+            self.assertEqual(regex_set.matching(text), expected, text)
+
+    def test_scan_matches_per_rule_evaluation(self):
+        """Violations from one shared scan equal those of the per-rule loop."""
+        rules = []
+        for i, pattern in enumerate([r"crypto|bitcoin", r"buy now", r"casino", r"(spam)\1"]):
+            rule = Mock()
+            rule.pattern = pattern
+            rule.name = f"re_{i}"
+            rule.weight = 1.0
+            rules.append(rule)
+        matchers = [self.detector.compile(rule.pattern) for rule in rules]
+        statuses = [{"id": "1", "content": "BUY NOW at the casino"}, {"id": "2", "content": "spamspam"}]
+        scan = self.detector.scan(self.detector.build_index(matchers), {"username": "bitcoin_guy"}, statuses)
+
+        for rule, matcher in zip(rules, matchers, strict=True):
+            expected = self.detector.evaluate(rule, {"username": "bitcoin_guy"}, statuses)
+            actual = self.detector.evaluate(rule, {"username": "bitcoin_guy"}, statuses, matcher=matcher, scan=scan)
+            self.assertEqual([v.model_dump() for v in actual], [v.model_dump() for v in expected])
+
+
 class TestKeywordDetector(unittest.TestCase):
     """Test suite for KeywordDetector."""
 
@@ -193,12 +237,123 @@ class TestKeywordDetector(unittest.TestCase):
         self.assertEqual(len(violations), 0)
 
 
+class TestKeywordAutomaton(unittest.TestCase):
+    """Test suite for the shared keyword automaton."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.detector = KeywordDetector()
+
+    def test_aho_corasick_finds_overlapping_needles(self):
+        """All needles are found, including overlapping and empty ones."""
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("hers", 3), ("", 4), ("xyz", 5)])
+        self.assertEqual(automaton.search("ushers"), {1, 2, 3, 4})
+
+    def test_scan_matches_per_rule_evaluation(self):
+        """Violations from one shared scan equal those of the per-rule loop."""
+        patterns = ["casino,Pills", "free, spin", "pill", "casino", "nomatch,zzz"]
+        rules = []
+        for i, pattern in enumerate(patterns):
+            rule = Mock()
+            rule.pattern = pattern
+            rule.name = f"kw_{i}"
+            rule.weight = 1.0
+            rules.append(rule)
+        matchers = [self.detector.compile(rule.pattern) for rule in rules]
+        index = self.detector.build_index(matchers)
+
+        account_data = {"username": "casino_bot", "display_name": "Free Spins"}
+        statuses = [
+            {"id": "1", "content": "<p>Cheap PILLS at the casino</p>"},
+            {"id": "2", "content": "nothing to see"},
+            {"id": "3", "content": "free spin, free spin"},
+        ]
+        scan = self.detector.scan(index, account_data, statuses)
+
+        for rule, matcher in zip(rules, matchers, strict=True):
+            expected = self.detector.evaluate(rule, account_data, statuses)
+            actual = self.detector.evaluate(rule, account_data, statuses, matcher=matcher, scan=scan)
+            self.assertEqual([v.model_dump() for v in actual], [v.model_dump() for v in expected])
+
+
+class TestPreparedStatus(unittest.TestCase):
+    """Test suite for the shared status normalization."""
+
+    def test_from_status_normalizes_html(self):
+        """Markup is stripped once and every derived form comes from the visible text."""
+        status = {
+            "id": "7",
+            "content": '<p>Buy 2 <a href="https://spam.example/x?a=1&amp;b=2">Pills</a></p><p>NOW &amp; save</p>',
+            "created_at": "2024-01-02T03:04:05Z",
+            "media_attachments": [{"description": "Alt", "mime_type": "IMAGE/PNG", "url": "https://cdn/x.png"}],
+        }
+        prepared = PreparedStatus.from_status(status)
+
+        self.assertEqual(prepared.text, "Buy 2 Pills\nNOW & save")
+        self.assertEqual(prepared.lower, "buy 2 pills\nnow & save")
+        self.assertEqual(prepared.digitless, "buy  pills\nnow & save")
+        self.assertEqual(prepared.squashed, "buy 2 pills now & save")
+        self.assertEqual(prepared.urls, ())
+        self.assertEqual(prepared.created_at, datetime.fromisoformat("2024-01-02T03:04:05+00:00"))
+        self.assertEqual(prepared.attachments[0].mime_type, "image/png")
+        self.assertEqual(prepared.attachments[0].url_hash, sha256(b"https://cdn/x.png").hexdigest())
+        self.assertEqual(prepared.id, "7")
+
+    def test_urls_and_domains(self):
+        """Links in the visible text are extracted with their domains."""
+        prepared = PreparedStatus.from_status({"content": "see https://a.example/1 and http://b.example"})
+        self.assertEqual(prepared.urls, ("https://a.example/1", "http://b.example"))
+        self.assertEqual(prepared.domains, ("a.example", "b.example"))
+        self.assertIsNone(prepared.created_at)
+
+    def test_detectors_share_prepared_account(self):
+        """Passing a prepared account gives the same violations as letting each detector prepare its own."""
+        rule = Mock()
+        rule.pattern = "pills"
+        rule.name = "kw"
+        rule.weight = 1.0
+        account_data = {"acct": "seller@remote.example"}
+        statuses = [{"id": "1", "content": "<p>cheap <b>pills</b></p>"}, {"id": "2", "content": '<a class="pills">'}]
+        prepared = prepare_account(account_data, statuses)
+        self.assertEqual(prepared.username, "seller")
+
+        for detector in (KeywordDetector(), RegexDetector()):
+            expected = detector.evaluate(rule, account_data, statuses)
+            actual = detector.evaluate(rule, account_data, statuses, prepared=prepared)
+            self.assertEqual([v.model_dump() for v in actual], [v.model_dump() for v in expected])
+            self.assertEqual([v.evidence.matched_status_ids for v in actual], [["1"], ["2"]])
+
+    def test_rules_match_visible_text_and_raw_html(self):
+        """Keyword and regex rules hit link targets in the markup as well as unescaped visible text."""
+        status = {"id": "1", "content": '<p>Tom &amp; Jerry <a href="https://spam.example/win">here</a></p>'}
+        prepared = PreparedStatus.from_status(status)
+        self.assertEqual(prepared.texts, ("Tom & Jerry here", status["content"]))
+        self.assertEqual(PreparedStatus.from_status({"content": "plain"}).texts, ("plain",))
+
+        for pattern, detector in [
+            ("spam.example", KeywordDetector()),
+            ("tom & jerry", KeywordDetector()),
+            (r"href=\"https://spam\.example", RegexDetector()),
+            (r"tom & jerry here", RegexDetector()),
+        ]:
+            rule = Mock(pattern=pattern, weight=1.0)
+            rule.name = "r"
+            matchers = [detector.compile(pattern)]
+            scan = detector.scan(detector.build_index(matchers), {}, [status])
+            for kwargs in ({}, {"matcher": matchers[0], "scan": scan}):
+                violations = detector.evaluate(rule, {}, [status], **kwargs)
+                self.assertEqual([v.evidence.matched_status_ids for v in violations], [["1"]], pattern)
+
+
 class TestBehavioralDetector(unittest.TestCase):
     """Test suite for BehavioralDetector."""
 
     def setUp(self):
         """Set up test environment."""
         self.detector = BehavioralDetector()
+        collect = patch.object(self.detector, "collect", side_effect=lambda ids: dict.fromkeys(ids, BehaviorCounts()))
+        self.collect = collect.start()
+        self.addCleanup(collect.stop)
 
     def test_automation_disclosure_non_bot(self):
         """Flag non-bot accounts with templated posts."""
@@ -263,6 +418,73 @@ class TestBehavioralDetector(unittest.TestCase):
         self.assertIn("domain_distribution", violations[0].evidence.metrics)
 
 
+class TestBehavioralBatch(unittest.TestCase):
+    """Test suite for batched behavioral counts."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.detector = BehavioralDetector()
+
+    def _rule(self, pattern, threshold):
+        rule = Mock()
+        rule.pattern = pattern
+        rule.name = pattern
+        rule.weight = 1.0
+        rule.trigger_threshold = threshold
+        return rule
+
+    def test_page_is_loaded_with_one_collect(self):
+        """One collect call answers every counted rule for every account in the page."""
+        counts = {
+            "1": BehaviorCounts(posts_last_1h=5, posts_last_24h=30, unique_targets=2, recent_interactions_count=40),
+            "2": BehaviorCounts(),
+        }
+        index = self.detector.build_index(["rapid_posting", "daily_posting", "interaction_spam"])
+        accounts = [({"mastodon_account_id": "1"}, [], None), ({"mastodon_account_id": "2"}, [], None), ({}, [], None)]
+        with patch.object(self.detector, "collect", return_value=counts) as collect:
+            scans = self.detector.scan_many(index, accounts)
+        collect.assert_called_once_with(["1", "2"])
+        self.assertEqual(scans, [counts["1"], counts["2"], None])
+
+        rules = [self._rule("rapid_posting", 5), self._rule("daily_posting", 50), self._rule("interaction_spam", 2)]
+        with patch.object(self.detector, "collect") as collect:
+            names = [v.rule_name for r in rules for v in self.detector.evaluate(r, accounts[0][0], [], scan=scans[0])]
+        collect.assert_not_called()
+        self.assertEqual(names, ["rapid_posting", "interaction_spam"])
+
+    def test_status_only_behaviors_still_record_metrics(self):
+        """Indexes without counted behaviors still refresh each account's metrics once."""
+        index = self.detector.build_index(["link_spam", "automation_disclosure"])
+        counts = {"1": BehaviorCounts()}
+        with patch.object(self.detector, "collect", return_value=counts) as collect:
+            self.assertEqual(self.detector.scan_many(index, [({"mastodon_account_id": "1"}, [], None)]), [counts["1"]])
+        collect.assert_called_once_with(["1"])
+
+    def test_load_counts_groups_accounts(self):
+        """Windowed counts and recent unique targets come from one grouped query."""
+        engine = create_engine("sqlite://")
+        InteractionHistory.__table__.create(engine)
+        now = datetime.utcnow()
+        rows = [
+            ("1", "a", now - timedelta(minutes=5)),
+            ("1", "b", now - timedelta(minutes=30)),
+            ("1", "b", now - timedelta(hours=5)),
+            ("1", "c", now - timedelta(days=3)),
+            ("2", "a", now - timedelta(days=2)),
+        ]
+        with Session(engine) as session:
+            session.add_all(
+                InteractionHistory(id=i, source_account_id=src, target_account_id=dst, created_at=at)
+                for i, (src, dst, at) in enumerate(rows, start=1)
+            )
+            session.commit()
+            counts = self.detector._load_counts(session, ["1", "2", "3"])
+
+        self.assertEqual(counts["1"], BehaviorCounts(2, 3, 3, 4))
+        self.assertEqual(counts["2"], BehaviorCounts(0, 0, 1, 1))
+        self.assertEqual(counts["3"], BehaviorCounts())
+
+
 class TestMediaDetector(unittest.TestCase):
     """Test suite for MediaDetector."""
 
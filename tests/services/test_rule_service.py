@@ -3,7 +3,7 @@
 import os
 import tempfile
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -234,5 +234,92 @@ class TestRuleService(unittest.TestCase):
                 self.assertEqual(service._cache.ttl_seconds, 5)
 
 
+@patch("app.services.rule_service.runtime_flags", MagicMock(report_threshold=MagicMock(return_value=1.0)))
+@patch("app.services.rule_service.SessionLocal")
+@patch("app.services.rule_service.rcli")
+class TestRulesetVersion(unittest.TestCase):
+    """Rule caches follow the ruleset version published in Redis."""
+
+    def _service(self, mock_session):
+        session = mock_session.return_value.__enter__.return_value
+        session.query.return_value.filter.return_value.all.return_value = []
+        session.execute.return_value.scalar.return_value = None
+        return RuleService(cache_ttl_seconds=1)
+
+    def _loads(self, mock_session):
+        return mock_session.return_value.__enter__.return_value.query.call_count
+
+    def test_cache_is_kept_while_version_is_unchanged(self, mock_rcli, mock_session):
+        service = self._service(mock_session)
+        mock_rcli.get.return_value = "v1"
+        service.get_active_rules()
+
+        with patch("app.services.rule_service.time.monotonic", return_value=10**9), patch.object(
+            service._cache, "is_expired", return_value=True
+        ):
+            service.get_active_rules()
+
+        self.assertEqual(self._loads(mock_session), 1)
+
+    def test_new_version_reloads_rules(self, mock_rcli, mock_session):
+        service = self._service(mock_session)
+        mock_rcli.get.return_value = "v1"
+        service.get_active_rules()
+
+        mock_rcli.get.return_value = "v2"
+        with patch("app.services.rule_service.time.monotonic", return_value=10**9):
+            service.get_active_rules()
+
+        self.assertEqual(self._loads(mock_session), 2)
+        self.assertEqual(service._cache.version, "v2")
+
+    def test_version_is_checked_at_most_every_interval(self, mock_rcli, mock_session):
+        service = self._service(mock_session)
+        mock_rcli.get.return_value = "v1"
+        service.get_active_rules()
+        mock_rcli.get.reset_mock()
+
+        for _ in range(100):
+            service.get_active_rules()
+
+        mock_rcli.get.assert_not_called()
+
+    def test_rule_change_publishes_new_version(self, mock_rcli, mock_session):
+        service = self._service(mock_session)
+        mock_rcli.get.return_value = "old"
+        session = mock_session.return_value.__enter__.return_value
+        session.query.return_value.filter.return_value.first.return_value = MagicMock(name="rule")
+
+        service.update_rule(1, weight=2.0)
+
+        _, _, sha = service.get_active_rules()
+        mock_rcli.set.assert_called_with("rules:version", sha)
+        self.assertEqual(service._cache.version, sha)
+
+    def test_missing_version_is_seeded(self, mock_rcli, mock_session):
+        service = self._service(mock_session)
+        mock_rcli.get.return_value = None
+        mock_rcli.set.return_value = True
+
+        _, _, sha = service.get_active_rules()
+
+        mock_rcli.set.assert_called_once_with("rules:version", sha, nx=True)
+        self.assertEqual(service._cache.version, sha)
+
+    def test_without_redis_cache_falls_back_to_ttl(self, mock_rcli, mock_session):
+        import redis
+
+        service = self._service(mock_session)
+        mock_rcli.get.side_effect = redis.ConnectionError("down")
+        mock_rcli.set.side_effect = redis.ConnectionError("down")
+        service.get_active_rules()
+        self.assertIsNone(service._cache.version)
+
+        with patch.object(service._cache, "is_expired", return_value=True):
+            service.get_active_rules()
+
+        self.assertEqual(self._loads(mock_session), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for the in-memory runtime flags."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import redis
+from app.services import runtime_flags as rf
+from app.services.runtime_flags import RuntimeFlags
+
+
+@patch("app.services.runtime_flags.rcli")
+class TestRuntimeFlags(unittest.TestCase):
+    """Flags are served from memory and refreshed from Redis, with Redis mocked."""
+
+    def setUp(self):
+        self.service = MagicMock()
+        self.service.get_configs.return_value = {"panic_stop": {"enabled": True}}
+        self.flags = RuntimeFlags(self.service)
+        self.now = 100.0
+        clock = patch("app.services.runtime_flags.time.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def _hash(self, **values):
+        return {key: json.dumps(value) for key, value in values.items()}
+
+    def test_flags_are_read_once_per_interval(self, mock_rcli):
+        mock_rcli.hgetall.return_value = self._hash(
+            panic_stop={"enabled": False}, dry_run=None, report_threshold={"threshold": 2.5}, automod=None
+        )
+
+        for _ in range(50):
+            self.assertFalse(self.flags.panic_stop())
+            self.assertEqual(self.flags.report_threshold(), 2.5)
+
+        mock_rcli.hgetall.assert_called_once_with(rf.FLAGS_KEY)
+        self.service.get_configs.assert_not_called()
+
+    def test_pushed_change_is_seen_after_interval(self, mock_rcli):
+        mock_rcli.hgetall.return_value = self._hash(panic_stop={"enabled": False})
+        self.assertFalse(self.flags.panic_stop())
+
+        mock_rcli.hgetall.return_value = self._hash(panic_stop={"enabled": True})
+        self.now += rf.CHECK_INTERVAL
+        self.assertTrue(self.flags.panic_stop())
+
+    def test_push_writes_hash_and_refreshes_locally(self, mock_rcli):
+        mock_rcli.hgetall.return_value = self._hash(panic_stop={"enabled": False})
+        self.assertFalse(self.flags.panic_stop())
+
+        self.flags.push("panic_stop", {"enabled": True})
+        mock_rcli.hset.assert_called_once_with(rf.FLAGS_KEY, "panic_stop", json.dumps({"enabled": True}))
+
+        mock_rcli.hgetall.return_value = self._hash(panic_stop={"enabled": True})
+        self.assertTrue(self.flags.panic_stop())
+
+    def test_missing_hash_is_seeded_from_database(self, mock_rcli):
+        mock_rcli.hgetall.return_value = {}
+        pipe = mock_rcli.pipeline.return_value.__enter__.return_value
+
+        self.assertTrue(self.flags.panic_stop())
+
+        self.service.get_configs.assert_called_once_with(rf.FLAG_KEYS)
+        pipe.hsetnx.assert_any_call(rf.FLAGS_KEY, "panic_stop", json.dumps({"enabled": True}))
+        pipe.hsetnx.assert_any_call(rf.FLAGS_KEY, "report_threshold", "null")
+
+    def test_flags_missing_after_flush_are_seeded_around_pushed_value(self, mock_rcli):
+        self.service.get_configs.return_value = {
+            "panic_stop": {"enabled": True},
+            "report_threshold": {"threshold": 3.0},
+        }
+        mock_rcli.hgetall.return_value = self._hash(report_threshold={"threshold": 2.0})
+        pipe = mock_rcli.pipeline.return_value.__enter__.return_value
+
+        self.assertTrue(self.flags.panic_stop())
+        self.assertEqual(self.flags.report_threshold(), 2.0)
+
+        seeded = {c.args[1] for c in pipe.hsetnx.call_args_list}
+        self.assertEqual(seeded, {"panic_stop", "dry_run", "automod"})
+        pipe.hsetnx.assert_any_call(rf.FLAGS_KEY, "panic_stop", json.dumps({"enabled": True}))
+
+    def test_redis_outage_reads_database_at_most_every_fallback_ttl(self, mock_rcli):
+        mock_rcli.hgetall.side_effect = redis.ConnectionError("down")
+
+        self.assertTrue(self.flags.panic_stop())
+        self.now += rf.CHECK_INTERVAL
+        self.assertTrue(self.flags.panic_stop())
+        self.assertEqual(self.service.get_configs.call_count, 1)
+
+        self.now += rf.FALLBACK_TTL
+        self.flags.panic_stop()
+        self.assertEqual(self.service.get_configs.call_count, 2)
+
+    def test_environment_flags_take_precedence(self, mock_rcli):
+        mock_rcli.hgetall.return_value = self._hash(panic_stop={"enabled": False}, dry_run={"enabled": False})
+        with patch.multiple(rf.settings, PANIC_STOP=True, DRY_RUN=True):
+            self.assertTrue(self.flags.panic_stop())
+            self.assertTrue(self.flags.dry_run())
+
+    def test_defaults_without_stored_values(self, mock_rcli):
+        mock_rcli.hgetall.return_value = self._hash(panic_stop=None)
+        with patch.multiple(rf.settings, PANIC_STOP=False, DRY_RUN=False):
+            self.assertFalse(self.flags.panic_stop())
+            self.assertFalse(self.flags.dry_run())
+        self.assertEqual(self.flags.report_threshold(), rf.DEFAULT_REPORT_THRESHOLD)
+        self.assertEqual(self.flags.automod(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Tests for the task payload store."""
+
+import json
+import unittest
+import zlib
+from unittest.mock import MagicMock, patch
+
+import redis
+from app.tasks import payload_store
+
+STATUS = {"status": {"id": "1", "content": "<p>" + "spam " * 200 + "</p>", "account": {"id": "7", "acct": "a@b.c"}}}
+
+
+@patch.multiple(payload_store.settings, TASK_PAYLOAD_MIN_BYTES=256, TASK_PAYLOAD_TTL=86400)
+@patch("app.tasks.payload_store.rcli")
+class TestPayloadStore(unittest.TestCase):
+    """Stashing and resolving, with Redis mocked."""
+
+    def test_large_payload_is_stored_compressed_by_content_hash(self, mock_rcli):
+        ref = payload_store.stash(STATUS)
+
+        key, value = mock_rcli.set.call_args.args
+        self.assertEqual(ref, {"payload_ref": key})
+        self.assertTrue(key.startswith("task_payload:"))
+        self.assertEqual(mock_rcli.set.call_args.kwargs, {"ex": 86400})
+        self.assertLess(len(value), len(json.dumps(STATUS)) // 4)
+        self.assertEqual(payload_store.stash(json.loads(json.dumps(STATUS))), ref)
+
+    def test_small_payload_stays_inline(self, mock_rcli):
+        payload = {"report": {"id": "9"}}
+        self.assertIs(payload_store.stash(payload), payload)
+        mock_rcli.set.assert_not_called()
+
+    def test_redis_outage_sends_payload_inline(self, mock_rcli):
+        mock_rcli.set.side_effect = redis.ConnectionError("down")
+        self.assertIs(payload_store.stash(STATUS), STATUS)
+
+    def test_resolve_round_trip(self, mock_rcli):
+        ref = payload_store.stash(STATUS)
+        mock_rcli.get.return_value = mock_rcli.set.call_args.args[1]
+
+        self.assertEqual(payload_store.resolve(ref), STATUS)
+        mock_rcli.get.assert_called_once_with(ref["payload_ref"])
+
+    def test_inline_payload_resolves_to_itself(self, mock_rcli):
+        self.assertIs(payload_store.resolve(STATUS), STATUS)
+        mock_rcli.get.assert_not_called()
+
+    def test_resolved_task_gets_payload_and_skips_expired_ones(self, mock_rcli):
+        body = MagicMock(return_value="done")
+        task = payload_store.resolved(body)
+        mock_rcli.get.return_value = zlib.compress(json.dumps(STATUS).encode())
+
+        self.assertEqual(task(MagicMock(), {"payload_ref": "task_payload:x"}, 1), "done")
+        self.assertEqual(body.call_args.args[1:], (STATUS, 1))
+
+        mock_rcli.get.return_value = None
+        body.reset_mock()
+        self.assertIsNone(task(MagicMock(name="task"), {"payload_ref": "task_payload:x"}))
+        body.assert_not_called()
+
+
+@patch.object(payload_store.settings, "TASK_PAYLOAD_MIN_BYTES", 0)
+@patch("app.tasks.payload_store.rcli")
+class TestPayloadStoreDisabled(unittest.TestCase):
+    """TASK_PAYLOAD_MIN_BYTES=0 sends every payload inline."""
+
+    def test_disabled_store_leaves_redis_alone(self, mock_rcli):
+        self.assertIs(payload_store.stash(STATUS), STATUS)
+        mock_rcli.set.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
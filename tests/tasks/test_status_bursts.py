@@ -0,0 +1,81 @@
+"""Tests for the per-account status burst buffer."""
+
+import unittest
+import uuid
+from unittest.mock import patch
+
+import redis
+from app.tasks import status_bursts
+
+
+class TestStatusBurstScripts(unittest.TestCase):
+    """Runs the Lua scripts against the Redis at REDIS_URL; skipped when it is unreachable."""
+
+    def setUp(self):
+        try:
+            status_bursts.rcli.ping()
+        except redis.RedisError:
+            self.skipTest("Redis is not reachable")
+        self.account_id = f"test-{uuid.uuid4().hex}"
+        self.addCleanup(status_bursts.rcli.delete, *status_bursts._keys(self.account_id))
+        self.now = 1_700_000_000.0
+        clock = patch("app.tasks.status_bursts.time.time", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        settings = patch.multiple(status_bursts.settings, STATUS_COALESCE_WINDOW=5.0, STATUS_COALESCE_MAX_DELAY=30.0)
+        settings.start()
+        self.addCleanup(settings.stop)
+
+    def _add(self, status_id, at):
+        self.now = at
+        return status_bursts.add(self.account_id, {"id": status_id})
+
+    def test_only_first_status_schedules_flush(self):
+        self.assertTrue(self._add("s1", self.now))
+        self.assertFalse(self._add("s2", self.now + 1))
+
+    def test_burst_is_due_after_quiet_window(self):
+        start = self.now
+        self._add("s1", start)
+        self._add("s2", start + 3)
+
+        self.now = start + 5
+        self.assertEqual(status_bursts.take(self.account_id), status_bursts.Burst(due=False, wait=3.0))
+        self.now = start + 8
+        burst = status_bursts.take(self.account_id)
+        self.assertTrue(burst.due)
+        self.assertEqual([s["id"] for s in burst.statuses], ["s1", "s2"])
+        self.assertTrue(self._add("s3", start + 9))
+
+    def test_max_delay_caps_a_steady_stream(self):
+        start = self.now
+        for i in range(0, 31, 2):
+            self._add(f"s{i}", start + i)
+
+        self.now = start + 30
+        burst = status_bursts.take(self.account_id)
+        self.assertTrue(burst.due)
+        self.assertEqual(len(burst.statuses), 16)
+
+    def test_restore_keeps_order_ahead_of_newer_statuses(self):
+        start = self.now
+        self._add("s1", start)
+        self._add("s2", start)
+        self.now = start + 5
+        taken = status_bursts.take(self.account_id).statuses
+        self._add("s3", start + 6)
+
+        status_bursts.restore(self.account_id, taken)
+
+        self.now = start + 11
+        self.assertEqual([s["id"] for s in status_bursts.take(self.account_id).statuses], ["s1", "s2", "s3"])
+
+    def test_overdue_burst_schedules_another_flush(self):
+        start = self.now
+        self._add("s1", start)
+        overdue = start + 30 + status_bursts.OVERDUE_GRACE + 1
+        self.assertTrue(self._add("s2", overdue))
+
+
+if __name__ == "__main__":
+    unittest.main()
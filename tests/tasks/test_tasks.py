@@ -1,13 +1,18 @@
 """Tests for Celery task handlers."""
 
+import json
 import sys
+import threading
 import unittest
+import zlib
 from pathlib import Path
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import ANY, MagicMock, call, patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import app.tasks.jobs as jobs
+from app.rate_limit import RateLimited
+from app.scanning import ScanPlan
 from app.schemas import Violation
 from app.tasks.jobs import (
     CURSOR_NAME,
@@ -18,7 +23,10 @@ from app.tasks.jobs import (
     poll_admin_accounts_local,
     process_new_report,
     process_new_status,
+    record_queue_stats,
 )
+from celery.exceptions import Ignore, Retry
+from sqlalchemy.dialects import postgresql
 
 
 class TestCeleryTasks(unittest.TestCase):
@@ -122,6 +130,7 @@ class TestCeleryTasks(unittest.TestCase):
         # Should trigger analysis of the target account
         self.assertIsNotNone(result)
 
+    @patch.object(jobs.settings, "STATUS_COALESCE_WINDOW", 0)
     @patch("app.tasks.jobs.rule_service")
     @patch("app.tasks.jobs._get_admin_client")
     def test_process_new_status(self, mock_get_admin_client, mock_rule_service):
@@ -278,8 +287,8 @@ class TestCeleryTasks(unittest.TestCase):
         poll_admin_accounts_local()
         mock_poll.assert_called_once_with("local", CURSOR_NAME_LOCAL)
 
-    @patch("app.tasks.jobs.analyze_and_maybe_report")
-    @patch("app.tasks.jobs._persist_account")
+    @patch("app.tasks.jobs.analyze_and_maybe_report_batch")
+    @patch("app.tasks.jobs._persist_accounts")
     @patch("app.tasks.jobs.cursor_lag_pages")
     @patch("app.tasks.jobs.SessionLocal")
     @patch("app.tasks.jobs.EnhancedScanningSystem")
@@ -312,6 +321,518 @@ class TestCeleryTasks(unittest.TestCase):
         mock_metric.labels.assert_has_calls([call(cursor=CURSOR_NAME), call(cursor=CURSOR_NAME_LOCAL)])
         self.assertEqual(metric.set.call_count, 2)
 
+    @patch("app.tasks.jobs.analyze_and_maybe_report_batch")
+    @patch("app.tasks.jobs._persist_accounts")
+    @patch("app.tasks.jobs.cursor_lag_pages")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs.EnhancedScanningSystem")
+    def test_poll_accounts_scans_page_concurrently(
+        self, mock_scanner, mock_session, mock_metric, mock_persist, mock_analyze
+    ):
+        """A page is upserted once, its stale accounts are scanned in parallel, and the cursor moves after all of it."""
+        jobs.settings.MAX_PAGES_PER_POLL = 1
+        jobs.settings.SCAN_CONCURRENCY = 3
+        events = []
+        barrier = threading.Barrier(3, timeout=5)
+        hit = {"rule": "t/spam", "weight": 1.0, "evidence": {"status_id": "9"}}
+
+        def scan(account, session_id, account_pk, plan):
+            barrier.wait()  # only passes if all three scans run at the same time
+            events.append(("scan", account["id"], account_pk, plan.content_hash))
+            # "1" is a flagged account whose incremental scan found no new hits.
+            score = {"0": 0.0, "1": 2.0, "2": 1.0}[account["id"]]
+            return {"score": score, "rule_hits": [hit] if account["id"] == "2" else [], "status_count": 20}
+
+        db_session = MagicMock()
+        db_session.execute.side_effect = lambda *a, **k: events.append(("db",)) or MagicMock()
+        mock_session.return_value.__enter__.return_value = db_session
+        scanner = mock_scanner.return_value
+        scanner.start_scan_session.return_value = "s"
+        scanner.get_next_accounts_to_scan.return_value = ([{"account": {"id": str(i)}} for i in range(4)], "next")
+        scanner.accounts_needing_scan.return_value = {str(i): ScanPlan(f"h{i}") for i in range(3)}  # "3" is fresh
+        scanner.scan_account_efficiently.side_effect = scan
+        mock_persist.return_value = {"0": 10, "1": 11, "2": 12, "3": 13}
+
+        with patch("app.tasks.jobs._should_pause", return_value=False):
+            _poll_accounts("remote", CURSOR_NAME)
+
+        scans = sorted(e for e in events if e[0] == "scan")
+        self.assertEqual(scans, [("scan", "0", 10, "h0"), ("scan", "1", 11, "h1"), ("scan", "2", 12, "h2")])
+        scanner.accounts_needing_scan.assert_called_once_with([{"id": str(i)} for i in range(4)])
+        self.assertEqual(events[-1], ("db",))  # cursor upsert after the page
+        mock_persist.assert_called_once_with(scanner.get_next_accounts_to_scan.return_value[0])
+        mock_analyze.delay.assert_called_once_with(
+            [{"account": {"id": "2", "acct": ""}, "scan_result": {"score": 1.0, "rule_hits": [hit]}}]
+        )
+        scanner.complete_scan_session.assert_called_once_with("s")
+
+    def _batch_payload(self, acct_id, acct, score, rule="t/spam"):
+        evidence = {"status_id": f"s{acct_id}"}
+        return {
+            "account": {"id": acct_id, "acct": acct},
+            "scan_result": {"score": score, "rule_hits": [{"rule": rule, "weight": score, "evidence": evidence}]},
+        }
+
+    def _batch_rules(self, mock_rule_service):
+        rule = MagicMock(action_type="silence", action_duration_seconds=3600, action_warning_text=None)
+        rule.name = "spam"
+        mock_rule_service.get_active_rules.return_value = ([rule], {"report_threshold": 1.0}, "sha")
+
+    def test_record_analyses_inserts_once_and_counts_per_rule(self):
+        """Hits are written with one executemany and the flagged counter moves once per rule."""
+        from app.metrics import analyses_flagged
+
+        db = MagicMock()
+        hits = [("t/bulk_a", 1.0, {"status_id": "s1"}), ("t/bulk_a", 1.0, {}), ("t/bulk_b", 0.5, {})]
+        before = analyses_flagged.labels(rule="t/bulk_a")._value.get()
+
+        with patch.object(analyses_flagged, "labels", wraps=analyses_flagged.labels) as mock_labels:
+            jobs._record_analyses(db, jobs._analysis_rows("7", hits))
+
+        db.execute.assert_called_once()
+        stmt, rows = db.execute.call_args.args
+        self.assertIn("INSERT INTO analyses", str(stmt.compile(dialect=postgresql.dialect())))
+        self.assertEqual(
+            [(r["mastodon_account_id"], r["status_id"]) for r in rows], [("7", "s1"), ("7", None), ("7", None)]
+        )
+        self.assertEqual(sorted(c.kwargs["rule"] for c in mock_labels.call_args_list), ["t/bulk_a", "t/bulk_b"])
+        self.assertEqual(analyses_flagged.labels(rule="t/bulk_a")._value.get() - before, 2)
+
+    @patch("app.tasks.jobs.make_dedupe_key", side_effect=lambda acct_id, *a: f"dk-{acct_id}")
+    @patch("app.tasks.jobs._get_bot_client")
+    @patch("app.tasks.jobs._get_admin_client")
+    @patch("app.tasks.jobs.EnforcementService")
+    @patch("app.tasks.jobs.rule_service")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_analyze_batch_writes_page_in_one_transaction(
+        self, _, mock_session, mock_rule_service, mock_enforcement, mock_admin, mock_bot, mock_dedupe
+    ):
+        """A page's writes share one transaction; only reports new to the page are submitted."""
+        self._batch_rules(mock_rule_service)
+        db = mock_session.return_value.__enter__.return_value
+        db.execute.return_value.all.return_value = []
+        db.execute.return_value.scalars.return_value = ["dk-1"]
+        mock_bot.return_value.create_report.return_value = {"id": "r1"}
+        payloads = [
+            self._batch_payload("1", "spam@remote.example", 2.0),
+            self._batch_payload("2", "bulk@remote.example", 1.5),
+            self._batch_payload("3", "quiet", 0.5),
+        ]
+
+        with patch("app.tasks.jobs._dry_run", return_value=False):
+            jobs.analyze_and_maybe_report_batch(payloads)
+
+        first = mock_session.return_value.__enter__.call_args_list[0]
+        self.assertEqual(first, call())
+        sqls = [str(c.args[0].compile(dialect=postgresql.dialect())) for c in db.execute.call_args_list]
+        self.assertIn("INSERT INTO analyses", sqls[0])
+        self.assertEqual(len(db.execute.call_args_list[0].args[1]), 3)
+        self.assertIn("ON CONFLICT (domain) DO UPDATE", sqls[1])
+        domains = db.execute.call_args_list[1].args[0].compile(dialect=postgresql.dialect()).params
+        self.assertEqual((domains["domain_m0"], domains["violation_count_m0"]), ("remote.example", 2))
+        self.assertIn("ON CONFLICT (dedupe_key) DO NOTHING", sqls[2])
+        self.assertEqual(mock_enforcement.return_value.silence_account.call_count, 3)
+        # Each account's reversal is scheduled after its silence, outside the page transaction.
+        self.assertEqual(sum("INSERT INTO scheduled_actions" in sql for sql in sqls[3:]), 3)
+        mock_bot.return_value.create_report.assert_called_once()
+        self.assertEqual(mock_bot.return_value.create_report.call_args.kwargs["account_id"], "1")
+
+    @patch("app.tasks.jobs.make_dedupe_key", side_effect=lambda acct_id, *a: f"dk-{acct_id}")
+    @patch("app.tasks.jobs._get_bot_client")
+    @patch("app.tasks.jobs._get_admin_client")
+    @patch("app.tasks.jobs.EnforcementService")
+    @patch("app.tasks.jobs.rule_service")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_analyze_batch_defers_rest_of_page_without_rewriting(
+        self, _, mock_session, mock_rule_service, mock_enforcement, mock_admin, mock_bot, mock_dedupe
+    ):
+        """A rate-limited page is sent again from the limited account on, marked as already persisted."""
+        self._batch_rules(mock_rule_service)
+        db = mock_session.return_value.__enter__.return_value
+        db.execute.return_value.scalars.return_value = ["dk-1", "dk-2"]
+        mock_enforcement.return_value.silence_account.side_effect = [None, RateLimited("bucket", 30.0)]
+        payloads = [self._batch_payload("1", "a@x.example", 2.0), self._batch_payload("2", "b@x.example", 2.0)]
+        task = jobs.analyze_and_maybe_report_batch
+
+        task.push_request(id="task-1", called_directly=False)
+        try:
+            with (
+                patch("app.tasks.jobs._dry_run", return_value=False),
+                patch.object(task, "apply_async") as mock_apply,
+                self.assertRaises(Ignore),
+            ):
+                task.run(payloads)
+        finally:
+            task.pop_request()
+
+        (remaining,) = mock_apply.call_args.kwargs["args"]
+        self.assertEqual([p["account"]["id"] for p in remaining], ["2"])
+        self.assertEqual(remaining[0]["dedupe_key"], "dk-2")
+        self.assertEqual(mock_apply.call_args.kwargs["kwargs"], {"persisted": True})
+
+        db.reset_mock()
+        mock_enforcement.return_value.silence_account.side_effect = None
+        with patch("app.tasks.jobs._dry_run", return_value=False):
+            task(remaining, persisted=True)
+
+        # Only the reversal of the silence it got now, and the mastodon_report_id update.
+        sqls = [str(c.args[0]) for c in db.execute.call_args_list]
+        self.assertEqual(len(sqls), 3)
+        self.assertIn("FROM scheduled_actions", sqls[0])
+        self.assertIn("INSERT INTO scheduled_actions", sqls[1])
+        self.assertEqual(
+            db.execute.call_args.args[1], {"rid": mock_bot.return_value.create_report.return_value["id"], "dk": "dk-2"}
+        )
+
+    @patch("app.tasks.jobs._get_bot_client")
+    @patch("app.tasks.jobs._get_admin_client")
+    @patch("app.tasks.jobs.EnforcementService")
+    @patch("app.tasks.jobs.rule_service")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_analyze_batch_deferral_does_not_repeat_applied_actions(
+        self, _, mock_session, mock_rule_service, mock_enforcement, mock_admin, mock_bot
+    ):
+        """An account limited between two of its actions gets only the missing one when sent again."""
+        warn = MagicMock(action_type="warn", action_warning_text="stop")
+        warn.name = "abuse"
+        silence = MagicMock(action_type="silence", action_duration_seconds=None, action_warning_text=None)
+        silence.name = "spam"
+        mock_rule_service.get_active_rules.return_value = ([warn, silence], {"report_threshold": 9.0}, "sha")
+        enforcement = mock_enforcement.return_value
+        enforcement.silence_account.side_effect = [RateLimited("bucket", 30.0), None]
+        payload = self._batch_payload("1", "a@x.example", 2.0)
+        payload["scan_result"]["rule_hits"].append({"rule": "t/abuse", "weight": 1.0, "evidence": {}})
+        task = jobs.analyze_and_maybe_report_batch
+
+        task.push_request(id="task-1", called_directly=False)
+        try:
+            with (
+                patch("app.tasks.jobs._dry_run", return_value=False),
+                patch.object(task, "apply_async") as mock_apply,
+                self.assertRaises(Ignore),
+            ):
+                task.run([payload])
+        finally:
+            task.pop_request()
+
+        (remaining,) = mock_apply.call_args.kwargs["args"]
+        self.assertEqual(remaining[0]["enforced"], ["warn"])
+
+        with patch("app.tasks.jobs._dry_run", return_value=False):
+            task(remaining, persisted=True)
+
+        enforcement.warn_account.assert_called_once()
+        self.assertEqual(enforcement.silence_account.call_count, 2)
+
+    @patch("app.tasks.jobs.make_dedupe_key", side_effect=lambda acct_id, *a: f"dk-{acct_id}")
+    @patch("app.tasks.jobs._get_bot_client")
+    @patch("app.tasks.jobs._get_admin_client")
+    @patch("app.tasks.jobs.EnforcementService")
+    @patch("app.tasks.jobs.rule_service")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_analyze_batch_retries_only_failed_accounts(
+        self, _, mock_session, mock_rule_service, mock_enforcement, mock_admin, mock_bot, mock_dedupe
+    ):
+        """An account whose action fails is retried alone, without a reversal for the action it did not get."""
+        self._batch_rules(mock_rule_service)
+        db = mock_session.return_value.__enter__.return_value
+        db.execute.return_value.all.return_value = []
+        db.execute.return_value.scalars.return_value = ["dk-1", "dk-2"]
+        mock_enforcement.return_value.silence_account.side_effect = [RuntimeError("502 Bad Gateway"), None]
+        mock_bot.return_value.create_report.return_value = {"id": "r2"}
+        payloads = [self._batch_payload("1", "a@x.example", 2.0), self._batch_payload("2", "b@x.example", 2.0)]
+        task = jobs.analyze_and_maybe_report_batch
+
+        task.push_request(id="task-1", called_directly=False)
+        try:
+            with (
+                patch("app.tasks.jobs._dry_run", return_value=False),
+                patch.object(task, "retry", side_effect=Retry()) as mock_retry,
+                self.assertRaises(Retry),
+            ):
+                task.run(payloads)
+        finally:
+            task.pop_request()
+
+        (failed,) = mock_retry.call_args.kwargs["args"]
+        self.assertEqual([p["account"]["id"] for p in failed], ["1"])
+        self.assertEqual((failed[0]["enforced"], failed[0]["dedupe_key"]), ([], "dk-1"))
+        self.assertEqual(mock_retry.call_args.kwargs["kwargs"], {"persisted": True})
+        self.assertEqual(mock_bot.return_value.create_report.call_args.kwargs["account_id"], "2")
+        scheduled = [c.args[1] for c in db.execute.call_args_list if "INSERT INTO scheduled_actions" in str(c.args[0])]
+        self.assertEqual([[row["mastodon_account_id"] for row in rows] for rows in scheduled], [["2"]])
+
+    @patch("app.tasks.jobs.SessionLocal")
+    def test_persist_accounts_upserts_page_once(self, mock_session):
+        """A page is written with one multi-row upsert and one commit, returning ids."""
+        db = mock_session.return_value.__enter__.return_value
+        db.execute.return_value.all.return_value = [("1", 10), ("2", 11)]
+        page = [
+            {"account": {"id": "1", "acct": "alice"}},
+            {"account": {"id": "2", "acct": "bob@remote.example"}},
+            {"account": {"id": "2", "acct": "bob@remote.example"}},
+            {"account": {}},
+        ]
+
+        ids = jobs._persist_accounts(page)
+
+        self.assertEqual(ids, {"1": 10, "2": 11})
+        db.execute.assert_called_once()
+        db.commit.assert_called_once()
+        stmt = db.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (mastodon_account_id) DO UPDATE", sql)
+        self.assertIn("RETURNING", sql)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        self.assertEqual({params["domain_m0"], params["domain_m1"]}, {"local", "remote.example"})
+        self.assertNotIn("domain_m2", params)
+
+    @patch("app.tasks.jobs.SessionLocal")
+    def test_persist_accounts_empty_page(self, mock_session):
+        """Nothing is written for a page without accounts."""
+        self.assertEqual(jobs._persist_accounts([{"account": {}}]), {})
+        mock_session.assert_not_called()
+
+    @patch.object(jobs.settings, "STATUS_COALESCE_WINDOW", 5.0)
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    @patch("app.tasks.jobs.status_bursts")
+    def test_process_new_status_buffers_burst(self, mock_bursts, _):
+        """Only the first status of a burst schedules a flush; evaluation waits for it."""
+        mock_bursts.add.side_effect = [True, False]
+        payload = {"status": {"id": "s1", "account": {"id": "a1"}}}
+
+        with (
+            patch.object(jobs, "flush_status_burst") as mock_flush,
+            patch.object(jobs, "_evaluate_new_statuses") as mock_evaluate,
+        ):
+            process_new_status(payload)
+            process_new_status(payload)
+
+        mock_bursts.add.assert_called_with("a1", payload["status"])
+        mock_flush.apply_async.assert_called_once_with(args=["a1"], countdown=jobs.settings.STATUS_COALESCE_WINDOW)
+        mock_evaluate.assert_not_called()
+
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    @patch("app.tasks.jobs.status_bursts")
+    def test_flush_status_burst_evaluates_burst_once(self, mock_bursts, _):
+        """A due burst is evaluated with one history fetch and reports the statuses the rule matched."""
+        from app.schemas import Evidence
+        from app.tasks.status_bursts import Burst
+
+        account = {"id": "a1"}
+        statuses = [{"id": f"s{i}", "visibility": "public", "account": account} for i in range(3)]
+        mock_bursts.take.return_value = Burst(due=True, statuses=statuses)
+        violation = MagicMock(rule_name="spam", score=1.0, action_type="report")
+        violation.evidence = Evidence(matched_terms=["x"], matched_status_ids=["s1", "old"], metrics={})
+
+        with (
+            patch.object(jobs, "_get_admin_client") as mock_admin,
+            patch.object(jobs, "rule_service") as mock_rules,
+            patch.object(jobs, "EnforcementService") as mock_enforcement,
+        ):
+            mock_admin.return_value.get_account_statuses.return_value = [{"id": "old", "visibility": "public"}]
+            mock_rules.evaluate_account.return_value = [violation]
+            jobs.flush_status_burst("a1")
+
+        mock_admin.return_value.get_account_statuses.assert_called_once()
+        evaluated = mock_rules.evaluate_account.call_args.args[1]
+        self.assertEqual([s["id"] for s in evaluated], ["s0", "s1", "s2", "old"])
+        kwargs = mock_enforcement.return_value.perform_account_action.call_args.kwargs
+        self.assertEqual(kwargs["status_ids"], ["s1"])
+
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    @patch("app.tasks.jobs.status_bursts")
+    def test_flush_status_burst_waits_for_quiet_window(self, mock_bursts, _):
+        """A burst still receiving statuses is checked again when it becomes due."""
+        from app.tasks.status_bursts import Burst
+
+        mock_bursts.take.return_value = Burst(due=False, wait=3.5)
+        with (
+            patch.object(jobs.flush_status_burst, "apply_async") as mock_apply,
+            patch.object(jobs, "_evaluate_new_statuses") as mock_evaluate,
+        ):
+            jobs.flush_status_burst("a1")
+
+        mock_apply.assert_called_once_with(args=["a1"], kwargs={"enforced": []}, countdown=3.5)
+        mock_evaluate.assert_not_called()
+
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    @patch("app.tasks.jobs.status_bursts")
+    def test_flush_status_burst_restores_statuses_on_failure(self, mock_bursts, _):
+        """Statuses of a failed flush go back to the buffer for the retry."""
+        from app.tasks.status_bursts import Burst
+
+        statuses = [{"id": "s1", "account": {"id": "a1"}}]
+        mock_bursts.take.return_value = Burst(due=True, statuses=statuses)
+        with (
+            patch.object(jobs, "_evaluate_new_statuses", side_effect=RateLimited("bucket", 5.0)),
+            self.assertRaises(RateLimited),
+        ):
+            jobs.flush_status_burst("a1")
+
+        mock_bursts.restore.assert_called_once_with("a1", statuses)
+
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_deferred_status_does_not_repeat_applied_actions(self, _):
+        """A status limited between two violations is sent again with the rule already acted on."""
+        from app.schemas import Evidence
+
+        payload = {"status": {"id": "s1", "visibility": "public", "account": {"id": "a1"}}}
+        violations = [MagicMock(rule_name=name, score=1.0, action_type="silence") for name in ("abuse", "spam")]
+        for violation in violations:
+            violation.evidence = Evidence(matched_terms=[], matched_status_ids=["s1"], metrics={})
+
+        with (
+            patch.object(jobs.settings, "STATUS_COALESCE_WINDOW", 0),
+            patch.object(jobs, "_get_admin_client") as mock_admin,
+            patch.object(jobs, "rule_service") as mock_rules,
+            patch.object(jobs, "EnforcementService") as mock_enforcement,
+            patch.object(process_new_status, "apply_async") as mock_apply,
+        ):
+            mock_admin.return_value.get_account_statuses.return_value = []
+            mock_rules.evaluate_account.return_value = violations
+            perform = mock_enforcement.return_value.perform_account_action
+            perform.side_effect = [None, RateLimited("bucket", 30.0), None]
+            process_new_status.push_request(id="task-1", called_directly=False)
+            try:
+                with self.assertRaises(Ignore):
+                    process_new_status.run(payload)
+            finally:
+                process_new_status.pop_request()
+
+            self.assertEqual(mock_apply.call_args.kwargs["kwargs"], {"enforced": ["abuse"]})
+            process_new_status(payload, **mock_apply.call_args.kwargs["kwargs"])
+
+        self.assertEqual(perform.call_count, 3)
+        self.assertIn("spam", perform.call_args.kwargs["comment"])
+
+    @patch("app.tasks.jobs.make_dedupe_key", return_value="dk-1")
+    @patch("app.tasks.jobs._get_bot_client")
+    @patch("app.tasks.jobs._get_admin_client")
+    @patch("app.tasks.jobs.EnforcementService")
+    @patch("app.tasks.jobs.rule_service")
+    @patch("app.tasks.jobs.SessionLocal")
+    @patch("app.tasks.jobs._should_pause", return_value=False)
+    def test_deferred_report_submission_resumes_at_submission(
+        self, _, mock_session, mock_rule_service, mock_enforcement, mock_admin, mock_bot, mock_dedupe
+    ):
+        """An account limited while its report is sent gets only the report on the next run."""
+        self._batch_rules(mock_rule_service)
+        db = mock_session.return_value.__enter__.return_value
+        db.execute.return_value.all.return_value = []
+        db.execute.return_value.scalar_one_or_none.return_value = 1
+        mock_bot.return_value.create_report.side_effect = [RateLimited("bucket", 30.0), {"id": "r1"}]
+        payload = self._batch_payload("1", "local", 2.0)
+
+        analyze_and_maybe_report.push_request(id="task-1", called_directly=False)
+        try:
+            with (
+                patch("app.tasks.jobs._dry_run", return_value=False),
+                patch.object(analyze_and_maybe_report, "apply_async") as mock_apply,
+                self.assertRaises(Ignore),
+            ):
+                analyze_and_maybe_report.run(payload)
+        finally:
+            analyze_and_maybe_report.pop_request()
+
+        resume = mock_apply.call_args.kwargs["kwargs"]
+        self.assertEqual(resume, {"persisted": True, "enforced": ["silence"], "dedupe_key": "dk-1"})
+
+        db.reset_mock()
+        with patch("app.tasks.jobs._dry_run", return_value=False):
+            analyze_and_maybe_report(payload, **resume)
+
+        mock_enforcement.return_value.silence_account.assert_called_once()
+        self.assertEqual(db.execute.call_args_list, [call(ANY, {"rid": "r1", "dk": "dk-1"})])
+
+    @patch("app.tasks.jobs._should_pause", side_effect=RateLimited("bucket", 30.0))
+    def test_rate_limited_task_is_reenqueued(self, _):
+        """A worker run that hits the rate limiter sends the task again with a countdown."""
+        payload = {"account": {"id": "1"}}
+        analyze_and_maybe_report.push_request(id="task-1", called_directly=False)
+        try:
+            with patch.object(analyze_and_maybe_report, "apply_async") as mock_apply, self.assertRaises(Ignore):
+                analyze_and_maybe_report.run(payload)
+        finally:
+            analyze_and_maybe_report.pop_request()
+
+        mock_apply.assert_called_once()
+        self.assertEqual(mock_apply.call_args.kwargs["args"], (payload,))
+        self.assertGreaterEqual(mock_apply.call_args.kwargs["countdown"], 30.0)
+        self.assertLessEqual(mock_apply.call_args.kwargs["countdown"], 40.0)
+
+    @patch("app.tasks.payload_store.rcli")
+    @patch("app.tasks.jobs._should_pause", side_effect=RateLimited("bucket", 30.0))
+    def test_deferred_task_resends_payload_reference(self, _, mock_rcli):
+        """A task given a stored payload is deferred with the reference, not the loaded payload."""
+        ref = {"payload_ref": "task_payload:abc"}
+        mock_rcli.get.return_value = zlib.compress(json.dumps({"status": {"id": "1"}}).encode())
+        process_new_status.push_request(id="task-1", called_directly=False)
+        try:
+            with patch.object(process_new_status, "apply_async") as mock_apply, self.assertRaises(Ignore):
+                process_new_status.run(ref)
+        finally:
+            process_new_status.pop_request()
+
+        self.assertEqual(mock_apply.call_args.kwargs["args"], (ref,))
+
+    @patch("app.tasks.jobs._should_pause", side_effect=RateLimited("bucket", 30.0))
+    def test_rate_limited_direct_call_raises(self, _):
+        """Outside a worker the rate-limit signal reaches the caller."""
+        with patch.object(process_new_status, "apply_async") as mock_apply, self.assertRaises(RateLimited):
+            process_new_status({"status": {}})
+        mock_apply.assert_not_called()
+
+    @patch("app.tasks.jobs._should_pause")
+    def test_tasks_run_with_nonblocking_limiter(self, mock_pause):
+        """Task bodies run inside rate_limit.nonblocking()."""
+        from app import rate_limit
+
+        mock_pause.side_effect = lambda: rate_limit._nonblocking.get()
+        process_new_report({"report": {}})
+
+        mock_pause.assert_called_once()
+        self.assertFalse(rate_limit._nonblocking.get())
+
+    @patch("app.tasks.jobs.redis.from_url")
+    def test_record_queue_stats_reports_every_queue(self, mock_from_url):
+        """The backlog of each task queue is exported under its own label."""
+        from app.metrics import queue_backlog
+        from app.tasks.celery_app import TASK_QUEUES
+
+        pipe = mock_from_url.return_value.pipeline.return_value.__enter__.return_value
+        pipe.execute.return_value = [3, 0, 250, 1]
+
+        record_queue_stats()
+
+        self.assertEqual(pipe.llen.call_args_list, [call(q) for q in TASK_QUEUES])
+        self.assertEqual(
+            {q: queue_backlog.labels(queue=q)._value.get() for q in TASK_QUEUES},
+            dict(zip(TASK_QUEUES, [3.0, 0.0, 250.0, 1.0], strict=True)),
+        )
+
+    def test_tasks_are_routed_to_dedicated_queues(self):
+        """Webhook work never shares a queue with backfill or maintenance."""
+        from app.tasks.celery_app import celery_app
+
+        def queue_of(name):
+            return celery_app.amqp.router.route({}, name)["queue"].name
+
+        self.assertEqual(queue_of("app.tasks.jobs.process_new_status"), "realtime")
+        self.assertEqual(queue_of("app.tasks.jobs.process_new_report"), "realtime")
+        self.assertEqual(queue_of("app.tasks.jobs.flush_status_burst"), "realtime")
+        self.assertEqual(queue_of("app.tasks.jobs.analyze_and_maybe_report"), "analysis")
+        self.assertEqual(queue_of("app.tasks.jobs.analyze_and_maybe_report_batch"), "analysis")
+        self.assertEqual(queue_of("app.tasks.jobs.poll_admin_accounts"), "backfill")
+        self.assertEqual(queue_of("app.tasks.jobs.scan_federated_content"), "backfill")
+        self.assertEqual(queue_of("app.tasks.jobs.record_queue_stats"), "maintenance")
+        registered = {name for name in celery_app.tasks if name.startswith("app.tasks.jobs.")}
+        self.assertEqual(registered - set(celery_app.conf.task_routes), set())
+
 
 if __name__ == "__main__":
     unittest.main()
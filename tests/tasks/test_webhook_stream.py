@@ -0,0 +1,156 @@
+"""Tests for the webhook stream consumer."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import redis
+from app.tasks import webhook_stream
+
+
+def _entry(entry_id, event_type, payload):
+    return entry_id, {b"type": event_type.encode(), b"body": json.dumps(payload).encode()}
+
+
+def _status(status_id, account_id):
+    return {"status": {"id": status_id, "visibility": "public", "account": {"id": account_id}}}
+
+
+@patch("app.tasks.webhook_stream.runtime_flags.panic_stop", return_value=False)
+@patch("app.tasks.webhook_stream.EnforcementService")
+@patch("app.tasks.webhook_stream.MastoClient")
+@patch("app.tasks.webhook_stream.rcli")
+class TestProcessBatch(unittest.TestCase):
+    """Batch grouping, acking and dead-lettering, with Redis mocked."""
+
+    def _acked(self, mock_rcli):
+        pipe = mock_rcli.pipeline.return_value.__enter__.return_value
+        return [i for c in pipe.xack.call_args_list for i in c.args[2:]]
+
+    @patch("app.tasks.webhook_stream.rule_service")
+    def test_statuses_are_grouped_per_account_and_evaluated_once(self, mock_rules, mock_rcli, mock_admin, *_):
+        mock_admin.return_value.get_account_statuses.return_value = []
+        mock_rules.evaluate_accounts.return_value = [[], []]
+
+        webhook_stream.process_batch(
+            [
+                _entry("1-0", "status.created", _status("s1", "a1")),
+                _entry("2-0", "status.created", _status("s2", "a2")),
+                _entry("3-0", "status.created", _status("s3", "a1")),
+            ]
+        )
+
+        mock_rules.evaluate_accounts.assert_called_once()
+        (contexts,) = mock_rules.evaluate_accounts.call_args.args
+        self.assertEqual([[s["id"] for s in statuses] for _, statuses in contexts], [["s1", "s3"], ["s2"]])
+        self.assertEqual(mock_admin.return_value.get_account_statuses.call_count, 2)
+        self.assertEqual(sorted(self._acked(mock_rcli)), ["1-0", "2-0", "3-0"])
+
+    @patch("app.tasks.webhook_stream.rule_service")
+    def test_violations_are_acted_on_per_account(self, mock_rules, mock_rcli, mock_admin, mock_enforcement, _):
+        mock_admin.return_value.get_account_statuses.return_value = []
+        violation = MagicMock(rule_name="spam", score=1.0, action_type="report")
+        mock_rules.evaluate_accounts.return_value = [[violation]]
+
+        webhook_stream.process_batch(
+            [_entry("1-0", "status.created", _status("s1", "a1")), _entry("2-0", "status.created", _status("s2", "a1"))]
+        )
+
+        kwargs = mock_enforcement.return_value.perform_account_action.call_args.kwargs
+        self.assertEqual(kwargs["account_id"], "a1")
+        self.assertEqual(kwargs["status_ids"], ["s1", "s2"])
+
+    @patch("app.tasks.webhook_stream.rule_service")
+    def test_redelivered_entry_skips_rules_already_acted_on(
+        self, mock_rules, mock_rcli, mock_admin, mock_enforcement, _
+    ):
+        mock_admin.return_value.get_account_statuses.return_value = []
+        violations = [MagicMock(rule_name=name, score=1.0, action_type="silence") for name in ("abuse", "spam")]
+        mock_rules.evaluate_accounts.return_value = [violations]
+        perform = mock_enforcement.return_value.perform_account_action
+        perform.side_effect = [None, RuntimeError("502 Bad Gateway"), None]
+        mock_rcli.hmget.return_value = [None]
+        mock_rcli.hincrby.return_value = 1
+        entries = [_entry("1-0", "status.created", _status("s1", "a1"))]
+
+        webhook_stream.process_batch(entries)
+
+        mock_rcli.hset.assert_called_once_with(webhook_stream.ENFORCED, mapping={"1-0": '["abuse"]'})
+        self.assertEqual(self._acked(mock_rcli), [])
+
+        mock_rcli.hmget.return_value = [b'["abuse"]']
+        webhook_stream.process_batch(entries)
+
+        self.assertEqual(perform.call_count, 3)
+        self.assertIn("spam", perform.call_args.kwargs["comment"])
+        self.assertEqual(self._acked(mock_rcli), ["1-0"])
+
+    @patch("app.tasks.webhook_stream.process_new_report")
+    def test_reports_are_handed_to_celery(self, mock_report, mock_rcli, *_):
+        payload = {"report": {"id": "r1"}}
+        webhook_stream.process_batch([_entry("1-0", "report.created", payload), _entry("2-0", "account.created", {})])
+
+        mock_report.delay.assert_called_once_with(payload)
+        self.assertEqual(sorted(self._acked(mock_rcli)), ["1-0", "2-0"])
+
+    @patch("app.tasks.webhook_stream.rule_service")
+    def test_failed_batch_is_left_pending(self, mock_rules, mock_rcli, mock_admin, *_):
+        mock_admin.return_value.get_account_statuses.return_value = []
+        mock_rules.evaluate_accounts.side_effect = RuntimeError("db down")
+        mock_rcli.hincrby.return_value = 1
+
+        webhook_stream.process_batch([_entry("1-0", "status.created", _status("s1", "a1"))])
+
+        mock_rcli.hincrby.assert_called_once_with(webhook_stream.FAILURES, "1-0", 1)
+        self.assertEqual(self._acked(mock_rcli), [])
+        mock_rcli.xadd.assert_not_called()
+
+    def test_exhausted_entry_is_dead_lettered(self, mock_rcli, *_):
+        mock_rcli.hincrby.return_value = webhook_stream.settings.WEBHOOK_STREAM_MAX_ATTEMPTS
+        webhook_stream.process_batch([("1-0", {b"type": b"status.created", b"body": b"{not json"})])
+
+        stream, fields = mock_rcli.xadd.call_args.args
+        self.assertEqual(stream, webhook_stream.DEAD_LETTER_STREAM)
+        self.assertEqual(fields["source_id"], "1-0")
+        self.assertIn("JSONDecodeError", fields["error"])
+        self.assertEqual(self._acked(mock_rcli), ["1-0"])
+
+    def test_trimmed_entries_are_acked(self, mock_rcli, mock_admin, *_):
+        webhook_stream.process_batch([("1-0", None), ("2-0", {})])
+
+        mock_admin.assert_not_called()
+        self.assertEqual(self._acked(mock_rcli), ["1-0", "2-0"])
+
+    def test_panic_stop_acks_without_processing(self, mock_rcli, mock_admin, _, mock_pause):
+        mock_pause.return_value = True
+        webhook_stream.process_batch([_entry("1-0", "status.created", _status("s1", "a1"))])
+
+        mock_admin.assert_not_called()
+        self.assertEqual(self._acked(mock_rcli), ["1-0"])
+
+
+@patch("app.tasks.webhook_stream.rcli")
+class TestStreamHelpers(unittest.TestCase):
+    """Producer-side helpers used by the webhook handler."""
+
+    def test_claim_event_is_a_single_atomic_set(self, mock_rcli):
+        mock_rcli.set.side_effect = [True, None]
+        self.assertTrue(webhook_stream.claim_event("status.created", "42"))
+        self.assertFalse(webhook_stream.claim_event("status.created", "42"))
+        mock_rcli.set.assert_called_with("webhook_dedupe:status.created:42", "1", nx=True, ex=webhook_stream.DEDUPE_TTL)
+
+    def test_append_event_caps_stream_length(self, mock_rcli):
+        mock_rcli.xadd.return_value = b"1700000000000-0"
+        self.assertEqual(webhook_stream.append_event("status.created", b"{}"), "1700000000000-0")
+
+        kwargs = mock_rcli.xadd.call_args.kwargs
+        self.assertEqual(kwargs["maxlen"], webhook_stream.settings.WEBHOOK_STREAM_MAXLEN)
+        self.assertTrue(kwargs["approximate"])
+
+    def test_ensure_group_tolerates_existing_group(self, mock_rcli):
+        mock_rcli.xgroup_create.side_effect = redis.ResponseError("BUSYGROUP Consumer Group name already exists")
+        webhook_stream.ensure_group()
+
+
+if __name__ == "__main__":
+    unittest.main()
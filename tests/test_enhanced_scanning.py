@@ -11,7 +11,7 @@ import sys
 import unittest
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 # Set test environment before any imports
 os.environ.update(
@@ -31,6 +31,7 @@ os.environ.update(
 # Add the app directory to the path so we can import the app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.scanning import ScanPlan, _merge_scan_results
 from app.schemas import Violation
 
 
@@ -107,21 +108,58 @@ class TestEnhancedScanningSystem(unittest.TestCase):
         }
 
         # Mock recent scan exists with same content
-        mock_content_scan = MagicMock()
-        mock_content_scan.needs_rescan = False
-        self.mock_session.query.return_value.filter.return_value.first.return_value = mock_content_scan
+        content_hash = self.scanning_system._calculate_content_hash(account_data)
+        fresh_rows = self.mock_session.query.return_value.outerjoin.return_value.filter.return_value.all
+        fresh_rows.return_value = [("test_account_123", content_hash, {"score": 0.0}, "100")]
 
         # Should skip scanning
         should_scan = self.scanning_system.should_scan_account("test_account_123", account_data)
         self.assertFalse(should_scan)
 
         # Mock no recent scan exists
-        self.mock_session.query.return_value.filter.return_value.first.return_value = None
+        fresh_rows.return_value = []
 
         # Should perform scanning
         should_scan = self.scanning_system.should_scan_account("test_account_123", account_data)
         self.assertTrue(should_scan)
 
+    def test_accounts_needing_scan_batches_page(self):
+        """A page is checked with one query; changed accounts get full scans, fresh ones incremental scans"""
+        accounts = [
+            {"id": "1", "username": "fresh", "display_name": "Fresh", "note": ""},
+            {"id": "2", "username": "edited", "display_name": "Edited", "note": "new bio"},
+            {"id": "3", "username": "new", "display_name": "New", "note": ""},
+            {"id": "4", "username": "quiet", "display_name": "Quiet", "note": ""},
+            {"username": "no_id"},
+        ]
+        hashes = {a["id"]: self.scanning_system._calculate_content_hash(a) for a in accounts if "id" in a}
+        cached = {"score": 0.0, "rule_hits": [], "status_count": 5}
+        fresh_rows = self.mock_session.query.return_value.outerjoin.return_value.filter.return_value.all
+        fresh_rows.return_value = [
+            ("1", hashes["1"], cached, "110"),
+            ("2", "hash-of-old-profile", cached, "120"),
+            ("4", hashes["4"], cached, None),
+        ]
+
+        plans = self.scanning_system.accounts_needing_scan(accounts)
+
+        self.assertEqual(
+            plans,
+            {
+                "1": ScanPlan(hashes["1"], cached_result=cached, since_id="110"),
+                "2": ScanPlan(hashes["2"]),
+                "3": ScanPlan(hashes["3"]),
+            },
+        )
+        self.assertTrue(plans["1"].incremental)
+        self.assertFalse(plans["2"].incremental)
+        fresh_rows.assert_called_once()
+
+    def test_accounts_needing_scan_empty_page(self):
+        """An empty page does not touch the database"""
+        self.assertEqual(self.scanning_system.accounts_needing_scan([]), {})
+        self.mock_db.assert_not_called()
+
     def test_scan_session_management(self):
         """Test scan session creation and management"""
         # Test starting new session
@@ -449,16 +487,173 @@ class TestEnhancedScanningSystem(unittest.TestCase):
 
             with patch.object(self.scanning_system, "_track_domain_violation") as mock_track:
                 self.scanning_system.scan_account_efficiently(account_data, 1)
-                self.mock_client_instance.get_account_statuses.assert_any_call(
+                self.mock_client_instance.get_account_statuses.assert_called_once_with(
                     account_id="test_account_123", limit=self.scanning_system.settings.MAX_STATUSES_TO_FETCH
                 )
-                self.mock_client_instance.get_account_statuses.assert_any_call(
-                    account_id="test_account_123",
-                    limit=self.scanning_system.settings.MAX_STATUSES_TO_FETCH,
-                    only_media=True,
-                )
                 mock_track.assert_called_once_with("bad.example")
 
+    def test_incremental_scan_of_quiet_account(self):
+        """A quiet account costs one since_id request and no evaluation or writes"""
+        plan = ScanPlan("hash", cached_result={"score": 2.0, "rule_hits": []}, since_id="100")
+        self.mock_client_instance.get_account_statuses.return_value = []
+
+        result = self.scanning_system.scan_account_efficiently({"id": "42"}, 1, plan=plan)
+
+        self.assertIsNone(result)
+        self.mock_client_instance.get_account_statuses.assert_called_once_with(
+            account_id="42", limit=self.scanning_system.settings.MAX_STATUSES_TO_FETCH, since_id="100"
+        )
+        self.mock_rule_service.evaluate_account.assert_not_called()
+        self.mock_session.execute.assert_not_called()
+
+    def test_incremental_fetch_pages_back_to_since_id(self):
+        """New statuses beyond the first page are fetched with max_id until a page comes back short"""
+        pages = [[{"id": "110"}, {"id": "108"}], [{"id": "105"}, {"id": "103"}], [{"id": "101"}]]
+        self.mock_client_instance.get_account_statuses.side_effect = pages
+
+        with patch.object(self.scanning_system.settings, "MAX_STATUSES_TO_FETCH", 2):
+            statuses = self.scanning_system._fetch_statuses(self.mock_client_instance, "42", since_id="100")
+
+        self.assertEqual([s["id"] for s in statuses], ["110", "108", "105", "103", "101"])
+        self.mock_client_instance.get_account_statuses.assert_has_calls(
+            [
+                call(account_id="42", limit=2, since_id="100"),
+                call(account_id="42", limit=2, since_id="100", max_id="108"),
+                call(account_id="42", limit=2, since_id="100", max_id="103"),
+            ]
+        )
+
+    def test_incremental_scan_merges_new_statuses(self):
+        """Only new statuses are evaluated and merged into the cached result"""
+        cached_hit = {"rule": "t/spam", "weight": 2.0, "evidence": {"matched_status_ids": ["90"]}}
+        plan = ScanPlan(
+            "hash", cached_result={"score": 2.0, "rule_hits": [cached_hit], "status_count": 5}, since_id="100"
+        )
+        new_statuses = [{"id": "105", "content": "hello"}, {"id": "101", "content": "again"}]
+        self.mock_client_instance.get_account_statuses.return_value = new_statuses
+        self.mock_rule_service.evaluate_account.return_value = []
+
+        result = self.scanning_system.scan_account_efficiently({"id": "42"}, 1, account_pk=7, plan=plan)
+
+        self.mock_rule_service.evaluate_account.assert_called_once_with({"id": "42"}, new_statuses)
+        self.assertEqual(result["score"], 2.0)
+        self.assertEqual(result["rule_hits"], [])
+        self.assertEqual(result["status_count"], 7)
+        updates = {
+            call.args[0].table.name: call.args[0].compile().params for call in self.mock_session.execute.call_args_list
+        }
+        self.assertEqual(updates["accounts"], {"last_status_seen_id": "105", "id_1": 7})
+        self.assertEqual(updates["content_scans"]["scan_result"]["rule_hits"], [cached_hit])
+        self.assertNotIn("last_scanned_at", updates["content_scans"])
+
+    def test_incremental_scan_returns_only_unseen_hits(self):
+        """Hits already in the cached result are stored but not returned for analysis again"""
+        cached_hit = {"rule": "t/spam", "weight": 2.0, "evidence": {"matched_status_ids": ["90"]}}
+        plan = ScanPlan("hash", cached_result={"score": 2.0, "rule_hits": [cached_hit]}, since_id="100")
+        self.mock_client_instance.get_account_statuses.return_value = [{"id": "105", "content": "spam"}]
+        self.mock_rule_service.evaluate_account.return_value = [
+            MagicMock(rule_type="t", rule_name="spam", score=2.0, evidence={"matched_status_ids": ids})
+            for ids in (["90"], ["105"])
+        ]
+
+        result = self.scanning_system.scan_account_efficiently({"id": "42"}, 1, plan=plan)
+
+        self.assertEqual(result["score"], 4.0)
+        self.assertEqual([h["evidence"]["matched_status_ids"] for h in result["rule_hits"]], [["105"]])
+
+    def test_incremental_scan_evaluates_status_window_rules_over_latest_statuses(self):
+        """Automation and link spam rules see the latest statuses, not only the new ones"""
+        rule = MagicMock(detector_type="behavioral", pattern="link_spam")
+        self.mock_rule_service.get_active_rules.return_value = ([rule], {"report_threshold": 1.0}, "test_sha256")
+        plan = ScanPlan("hash", cached_result={"score": 0.0, "rule_hits": []}, since_id="100")
+        new_statuses = [{"id": "105"}]
+        latest = [{"id": "105"}, {"id": "100"}, {"id": "99"}]
+        self.mock_client_instance.get_account_statuses.side_effect = [new_statuses, latest]
+
+        result = self.scanning_system.scan_account_efficiently({"id": "42"}, 1, plan=plan)
+
+        limit = self.scanning_system.settings.MAX_STATUSES_TO_FETCH
+        self.mock_client_instance.get_account_statuses.assert_has_calls(
+            [call(account_id="42", limit=limit, since_id="100"), call(account_id="42", limit=limit)]
+        )
+        self.mock_rule_service.evaluate_account.assert_called_once_with({"id": "42"}, latest)
+        self.assertEqual(result["status_count"], 1)
+
+    def test_merge_scan_results(self):
+        """Status hits accumulate without duplicates; account-level hits are replaced"""
+        cached = {
+            "score": 3.5,
+            "hits": 3,
+            "status_count": 5,
+            "rule_hits": [
+                {"rule": "t/spam", "weight": 2.0, "evidence": {"matched_status_ids": ["90"]}},
+                {"rule": "t/name", "weight": 1.0, "evidence": {"matched_status_ids": []}},
+                {"rule": "t/rate", "weight": 0.5, "evidence": {"matched_status_ids": []}},
+            ],
+        }
+        new = {
+            "score": 5.5,
+            "hits": 3,
+            "status_count": 2,
+            "scanned_at": "now",
+            "rule_hits": [
+                {"rule": "t/spam", "weight": 2.0, "evidence": {"matched_status_ids": ["90"]}},
+                {"rule": "t/spam", "weight": 2.0, "evidence": {"matched_status_ids": ["105"]}},
+                {"rule": "t/rate", "weight": 1.5, "evidence": {"matched_status_ids": []}},
+            ],
+        }
+
+        merged = _merge_scan_results(cached, new)
+
+        self.assertEqual(
+            [(h["rule"], h["weight"]) for h in merged["rule_hits"]],
+            [("t/spam", 2.0), ("t/name", 1.0), ("t/spam", 2.0), ("t/rate", 1.5)],
+        )
+        self.assertEqual(merged["score"], 6.5)
+        self.assertEqual(merged["hits"], 4)
+        self.assertEqual(merged["status_count"], 7)
+        self.assertEqual(merged["scanned_at"], "now")
+
+    def _media_rule(self):
+        rule = MagicMock()
+        rule.detector_type = "media"
+        return rule
+
+    def test_fetch_statuses_skips_media_call_without_media_rules(self):
+        """Only one status request is made when no media rule is enabled"""
+        limit = self.scanning_system.settings.MAX_STATUSES_TO_FETCH
+        page = [{"id": str(i), "media_attachments": []} for i in range(limit)]
+        self.mock_client_instance.get_account_statuses.return_value = page
+
+        statuses = self.scanning_system._fetch_statuses(self.mock_client_instance, "42")
+
+        self.assertEqual(statuses, page)
+        self.mock_client_instance.get_account_statuses.assert_called_once_with(account_id="42", limit=limit)
+
+    def test_fetch_statuses_skips_media_call_for_short_timeline(self):
+        """A first page shorter than the limit already contains every media status"""
+        self.mock_rule_service.get_active_rules.return_value = ([self._media_rule()], {}, "sha")
+        self.mock_client_instance.get_account_statuses.return_value = [{"id": "1", "media_attachments": []}]
+
+        self.scanning_system._fetch_statuses(self.mock_client_instance, "42")
+
+        self.mock_client_instance.get_account_statuses.assert_called_once()
+
+    def test_fetch_statuses_merges_media_statuses(self):
+        """With a media rule and a full first page, older media statuses are merged without duplicates"""
+        limit = self.scanning_system.settings.MAX_STATUSES_TO_FETCH
+        self.mock_rule_service.get_active_rules.return_value = ([self._media_rule()], {}, "sha")
+        page = [{"id": str(i), "media_attachments": []} for i in range(limit)]
+        media = [{"id": "0", "media_attachments": [{}]}, {"id": "old", "media_attachments": [{}]}]
+        self.mock_client_instance.get_account_statuses.side_effect = lambda account_id, limit, only_media=False: (
+            list(media) if only_media else list(page)
+        )
+
+        statuses = self.scanning_system._fetch_statuses(self.mock_client_instance, "42")
+
+        self.assertEqual([s["id"] for s in statuses], [str(i) for i in range(limit)] + ["old"])
+        self.mock_client_instance.get_account_statuses.assert_any_call(account_id="42", limit=limit, only_media=True)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
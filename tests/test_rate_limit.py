@@ -0,0 +1,201 @@
+"""Tests for the shared Redis token bucket."""
+
+import time
+import unittest
+import uuid
+from unittest.mock import patch
+
+import redis
+from app import rate_limit
+from app.rate_limit import Permit, RateLimited
+
+
+class TestRateLimitHelpers(unittest.TestCase):
+    """Header parsing, script calls and sleeping, with the Lua scripts mocked."""
+
+    def test_parse_reset_accepts_iso_and_epoch(self):
+        self.assertEqual(rate_limit._parse_reset("2024-06-01T12:05:00.000Z"), 1717243500.0)
+        self.assertEqual(rate_limit._parse_reset("1717243500"), 1717243500.0)
+        self.assertIsNone(rate_limit._parse_reset("soon"))
+
+    @patch("app.rate_limit._seed_script")
+    def test_update_from_headers_seeds_bucket(self, mock_seed):
+        headers = {
+            "X-RateLimit-Limit": "300",
+            "X-RateLimit-Remaining": "42",
+            "X-RateLimit-Reset": "2024-06-01T12:05:00.000Z",
+        }
+        rate_limit.update_from_headers("k", headers)
+        mock_seed.assert_called_once_with(keys=["rl:k"], args=[300, 42, 1717243500.0, rate_limit.BUCKET_TTL])
+
+        mock_seed.reset_mock()
+        rate_limit.update_from_headers("k", {"X-RateLimit-Limit": "300"})
+        mock_seed.assert_not_called()
+
+    @patch("app.rate_limit._seed_script", side_effect=redis.ConnectionError("down"))
+    def test_update_from_headers_survives_redis_outage(self, _):
+        headers = {"X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "42", "X-RateLimit-Reset": "1717243500"}
+        rate_limit.update_from_headers("k", headers)
+
+    @patch("app.rate_limit._acquire_script", return_value=[1, "0.25"])
+    def test_acquire_parses_reply(self, mock_acquire):
+        self.assertEqual(rate_limit.acquire("k"), Permit(granted=True, wait=0.25))
+        self.assertEqual(mock_acquire.call_args.kwargs["keys"], ["rl:k"])
+
+    @patch("app.rate_limit._acquire_script", return_value=[1, "0"])
+    def test_acquire_sends_traffic_class_and_shares(self, mock_acquire):
+        with rate_limit.traffic_class(rate_limit.BACKFILL):
+            rate_limit.acquire("k")
+        rate_limit.acquire("k")
+
+        first, second = (c.kwargs["args"] for c in mock_acquire.call_args_list)
+        self.assertEqual(first[5], rate_limit.BACKFILL)
+        self.assertEqual(second[5], rate_limit.REALTIME)
+        shares = dict(zip(first[7::2], first[8::2], strict=True))
+        self.assertEqual(set(shares), set(rate_limit.TRAFFIC_CLASSES))
+        self.assertEqual(shares[rate_limit.REALTIME], rate_limit.settings.RATE_LIMIT_SHARE_REALTIME)
+
+    def test_unknown_traffic_class_is_rejected(self):
+        with self.assertRaises(ValueError), rate_limit.traffic_class("bulk"):
+            pass
+
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", side_effect=[Permit(False, 3.0), Permit(True, 1.5)])
+    def test_throttle_records_class_consumption_and_wait(self, _, mock_sleep):
+        permits = rate_limit.rate_limit_permits.labels(traffic_class=rate_limit.ENFORCEMENT)
+        waits = rate_limit.rate_limit_wait_seconds.labels(traffic_class=rate_limit.ENFORCEMENT)
+        before_permits, before_wait = permits._value.get(), waits._sum.get()
+
+        with rate_limit.traffic_class(rate_limit.ENFORCEMENT):
+            rate_limit.throttle_if_needed("k")
+
+        self.assertEqual(permits._value.get() - before_permits, 1)
+        self.assertEqual(waits._sum.get() - before_wait, 4.5)
+
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", side_effect=[Permit(False, 120.0), Permit(True, 90.0)])
+    def test_throttle_sleeps_until_granted_slot(self, _, mock_sleep):
+        rate_limit.throttle_if_needed("k")
+        # A spent window is re-checked at most every MAX_SLEEP; a reserved slot is waited for in full.
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [rate_limit.MAX_SLEEP, 90.0])
+
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", return_value=Permit(True, 0.0))
+    def test_throttle_does_not_sleep_with_budget(self, _, mock_sleep):
+        rate_limit.throttle_if_needed("k")
+        mock_sleep.assert_not_called()
+
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", side_effect=redis.ConnectionError("down"))
+    def test_throttle_fails_open_slowly(self, _, mock_sleep):
+        rate_limit.throttle_if_needed("k")
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch("app.rate_limit._release_script")
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", return_value=Permit(True, 45.0))
+    def test_nonblocking_raises_and_releases_reserved_permit(self, _, mock_sleep, mock_release):
+        with rate_limit.nonblocking(), self.assertRaises(RateLimited) as ctx:
+            rate_limit.throttle_if_needed("k")
+
+        self.assertEqual(ctx.exception.retry_after, 45.0)
+        mock_release.assert_called_once_with(keys=["rl:k"], args=[rate_limit.REALTIME])
+        mock_sleep.assert_not_called()
+
+    @patch("app.rate_limit._release_script")
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", return_value=Permit(False, 200.0))
+    def test_nonblocking_spent_window_releases_nothing(self, _, mock_sleep, mock_release):
+        with rate_limit.nonblocking(), self.assertRaises(RateLimited):
+            rate_limit.throttle_if_needed("k")
+
+        mock_release.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    @patch("app.rate_limit.time.sleep")
+    @patch("app.rate_limit.acquire", return_value=Permit(True, 0.5))
+    def test_nonblocking_sleeps_through_short_waits(self, _, mock_sleep):
+        with rate_limit.nonblocking():
+            rate_limit.throttle_if_needed("k")
+
+        mock_sleep.assert_called_once_with(0.5)
+
+
+class TestTokenBucketScripts(unittest.TestCase):
+    """Runs the Lua scripts against the Redis at REDIS_URL; skipped when it is unreachable."""
+
+    def setUp(self):
+        try:
+            rate_limit.rcli.ping()
+        except redis.RedisError:
+            self.skipTest("Redis is not reachable")
+        self.key = f"test:{uuid.uuid4().hex}"
+        self.addCleanup(rate_limit.rcli.delete, f"rl:{self.key}")
+
+    def _seed(self, limit, remaining, reset_in):
+        reset = time.time() + reset_in
+        rate_limit.update_from_headers(
+            self.key,
+            {"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset)},
+        )
+
+    def test_unseeded_bucket_grants(self):
+        self.assertEqual(rate_limit.acquire(self.key), Permit(True, 0.0))
+
+    def test_grants_exactly_the_remaining_budget(self):
+        self._seed(limit=300, remaining=5, reset_in=100)
+        permits = [rate_limit.acquire(self.key) for _ in range(6)]
+
+        self.assertEqual([p.granted for p in permits], [True] * (5 - rate_limit.RESERVE) + [False] * 2)
+        self.assertAlmostEqual(permits[-1].wait, 100, delta=2)
+
+    def test_reserved_permits_get_distinct_slots(self):
+        self._seed(limit=300, remaining=101, reset_in=100)
+        with patch.object(rate_limit.settings, "RATE_LIMIT_BURST", 1):
+            waits = [rate_limit.acquire(self.key).wait for _ in range(3)]
+
+        self.assertEqual(waits[0], 0.0)
+        self.assertLess(waits[1], waits[2])
+        self.assertAlmostEqual(waits[2], 2.0, delta=0.2)  # 100 permits over 100 s
+
+    def _take(self, traffic_class, n):
+        with rate_limit.traffic_class(traffic_class), patch.object(rate_limit.settings, "RATE_LIMIT_BURST", 1000):
+            return [rate_limit.acquire(self.key).granted for _ in range(n)]
+
+    def test_active_class_keeps_its_reserved_share(self):
+        self._seed(limit=100, remaining=100, reset_in=100)
+        with patch.multiple(
+            rate_limit.settings,
+            RATE_LIMIT_SHARE_REALTIME=0.4,
+            RATE_LIMIT_SHARE_ENFORCEMENT=0,
+            RATE_LIMIT_SHARE_BACKFILL=0,
+        ):
+            self.assertEqual(self._take(rate_limit.REALTIME, 1), [True])
+            backfill = self._take(rate_limit.BACKFILL, 100)
+            # 1 spare permit, 39 realtime permits held back while realtime is active.
+            self.assertEqual(sum(backfill), 100 - 1 - 1 - 39)
+            self.assertEqual(self._take(rate_limit.REALTIME, 39), [True] * 39)
+
+    def test_idle_class_share_is_borrowed(self):
+        self._seed(limit=100, remaining=100, reset_in=100)
+        with patch.multiple(
+            rate_limit.settings,
+            RATE_LIMIT_SHARE_REALTIME=0.4,
+            RATE_LIMIT_SHARE_ENFORCEMENT=0,
+            RATE_LIMIT_SHARE_BACKFILL=0,
+        ):
+            self.assertEqual(sum(self._take(rate_limit.BACKFILL, 100)), 99)
+
+    def test_seed_keeps_local_reservations_within_window(self):
+        self._seed(limit=300, remaining=50, reset_in=100)
+        reset = rate_limit.rcli.hget(f"rl:{self.key}", "reset")
+        rate_limit.acquire(self.key)
+        rate_limit.update_from_headers(
+            self.key, {"X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "50", "X-RateLimit-Reset": reset}
+        )
+
+        self.assertEqual(float(rate_limit.rcli.hget(f"rl:{self.key}", "remaining")), 49)
+
+
+if __name__ == "__main__":
+    unittest.main()
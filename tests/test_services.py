@@ -167,6 +167,23 @@ class TestEnforcementServiceLogging(unittest.TestCase):
             self.assertEqual(len(logs), 1)
             self.assertEqual(logs[0].triggered_by_rule_id, 1)
 
+    def test_actions_use_enforcement_share(self):
+        """Admin actions are charged to the enforcement traffic class of the rate limiter."""
+        from app import rate_limit
+        from app.services import enforcement_service
+
+        classes = []
+        self.client._make_request.side_effect = lambda *a, **k: (
+            classes.append(rate_limit._traffic_class.get()) or Mock(json=lambda: {"ok": True})
+        )
+        dry_run = patch.object(enforcement_service.runtime_flags, "dry_run", return_value=False)
+        with dry_run, patch.object(self.service, "_log_action"):
+            self.service.suspend_account("acct")
+            self.service.unsuspend_account("acct")
+
+        self.assertEqual(classes, [rate_limit.ENFORCEMENT, rate_limit.ENFORCEMENT])
+        self.assertEqual(rate_limit._traffic_class.get(), rate_limit.REALTIME)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+"""Tests for the shared account status cache."""
+
+import time
+import unittest
+import zlib
+from unittest.mock import MagicMock, patch
+
+import redis
+from app import status_cache
+
+
+@patch.object(status_cache.settings, "STATUS_CACHE_TTL", 30)
+@patch("app.status_cache._write_script")
+@patch("app.status_cache._unlock_script")
+@patch("app.status_cache.rcli")
+class TestStatusCache(unittest.TestCase):
+    """Hits, misses and single-flight, with Redis mocked."""
+
+    def _cached(self, body, age=0.0):
+        return f"{time.time() - age:.3f}|".encode() + zlib.compress(body)
+
+    def test_hit_skips_fetch(self, mock_rcli, *_):
+        mock_rcli.hget.return_value = self._cached(b"[1]")
+        fetch = MagicMock()
+
+        self.assertEqual(status_cache.get_or_fetch("7", "f", fetch), b"[1]")
+        fetch.assert_not_called()
+        mock_rcli.hget.assert_called_once_with("status_cache:7", "f")
+
+    def test_miss_fetches_stores_compressed_and_unlocks(self, mock_rcli, mock_unlock, mock_write):
+        mock_rcli.hget.return_value = None
+        mock_rcli.set.return_value = True
+        mock_rcli.get.return_value = b"4"
+
+        self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[2]"), b"[2]")
+
+        mock_rcli.get.assert_called_once_with("status_cache:7:gen")
+        self.assertEqual(mock_write.call_args.kwargs["keys"], ["status_cache:7", "status_cache:7:gen"])
+        generation, field, value, ttl = mock_write.call_args.kwargs["args"]
+        self.assertEqual((generation, field, ttl), (b"4", "f", 30))
+        self.assertEqual(zlib.decompress(value.partition(b"|")[2]), b"[2]")
+        self.assertEqual(mock_unlock.call_args.kwargs["keys"], ["status_cache:7:lock:f"])
+
+    def test_fetch_started_before_any_invalidation_expects_no_generation(self, mock_rcli, _, mock_write):
+        mock_rcli.hget.return_value = None
+        mock_rcli.set.return_value = True
+        mock_rcli.get.return_value = None
+
+        status_cache.get_or_fetch("7", "f", lambda: b"[2]")
+
+        self.assertEqual(mock_write.call_args.kwargs["args"][0], b"")
+
+    def test_unreadable_entry_is_a_miss(self, mock_rcli, *_):
+        mock_rcli.set.return_value = True
+        for value in (b"garbage", f"{time.time():.3f}|not zlib".encode()):
+            mock_rcli.hget.return_value = value
+            self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[7]"), b"[7]")
+
+    def test_expired_entry_is_refetched(self, mock_rcli, *_):
+        mock_rcli.hget.return_value = self._cached(b"[old]", age=31)
+        mock_rcli.set.return_value = True
+
+        self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[new]"), b"[new]")
+
+    @patch("app.status_cache.time.sleep")
+    def test_concurrent_miss_waits_for_the_fetching_worker(self, _, mock_rcli, mock_unlock, mock_write):
+        mock_rcli.hget.side_effect = [None, None, self._cached(b"[3]")]
+        mock_rcli.set.return_value = None
+        fetch = MagicMock()
+
+        self.assertEqual(status_cache.get_or_fetch("7", "f", fetch), b"[3]")
+        fetch.assert_not_called()
+        mock_unlock.assert_not_called()
+        mock_write.assert_not_called()
+
+    @patch("app.status_cache.FLIGHT_WAIT", 0)
+    def test_abandoned_flight_falls_back_to_fetch(self, mock_rcli, mock_unlock, _):
+        mock_rcli.hget.return_value = None
+        mock_rcli.set.return_value = None
+
+        self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[4]"), b"[4]")
+        mock_unlock.assert_not_called()
+
+    def test_redis_outage_fetches_directly(self, mock_rcli, *_):
+        mock_rcli.hget.side_effect = redis.ConnectionError("down")
+        self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[5]"), b"[5]")
+
+    def test_invalidate_drops_pages_and_bumps_generation(self, mock_rcli, *_):
+        pipe = mock_rcli.pipeline.return_value.__enter__.return_value
+        status_cache.invalidate("7")
+
+        pipe.delete.assert_called_once_with("status_cache:7")
+        pipe.incr.assert_called_once_with("status_cache:7:gen")
+        pipe.expire.assert_called_once_with("status_cache:7:gen", status_cache.GENERATION_TTL)
+
+    def test_signature_separates_tokens_and_queries(self, *_):
+        a = status_cache.signature("bucket-a", [("limit", 20)])
+        self.assertEqual(a, status_cache.signature("bucket-a", [("limit", 20)]))
+        self.assertNotEqual(a, status_cache.signature("bucket-b", [("limit", 20)]))
+        self.assertNotEqual(a, status_cache.signature("bucket-a", [("limit", 40)]))
+
+
+@patch.object(status_cache.settings, "STATUS_CACHE_TTL", 0)
+@patch("app.status_cache.rcli")
+class TestStatusCacheDisabled(unittest.TestCase):
+    """STATUS_CACHE_TTL=0 leaves Redis alone."""
+
+    def test_disabled_cache_always_fetches(self, mock_rcli):
+        self.assertEqual(status_cache.get_or_fetch("7", "f", lambda: b"[6]"), b"[6]")
+        mock_rcli.hget.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()